@@ -0,0 +1,315 @@
+"""
+Logging setup shared by the FastAPI apps.
+
+``configure_logging(settings)`` replaces ``logging.basicConfig``: it installs
+one root handler writing text or JSON lines to stdout. By default the root
+handler only puts records on a queue and a listener thread formats and
+writes them, so slow output never blocks the event loop. Filters on the
+root handler run before a record is queued:
+
+- per-logger sampling drops a share of a logger's records below WARNING,
+  e.g. to keep 1% of per-row logs of a bulk job;
+- the trace and span IDs of the current OpenTelemetry span are added to
+  each record, so logs can be joined with traces.
+
+The module only depends on the standard library (OpenTelemetry is used when
+installed) and reads ``LOG_*`` attributes from the settings it is given, so
+any app can use it with its own settings object. Apps without one get the
+``LOG_*`` environment variables through ``LoggingSettings``.
+
+Usage example:
+    from app.core.config import settings
+    from libs.py.logging_config.models.logging_config import configure_logging
+
+    configure_logging(settings)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import IO, Any
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover - OpenTelemetry is optional
+    trace = None
+
+TEXT_FORMAT = logging.BASIC_FORMAT
+
+# Handlers ``logging.basicConfig`` installs; configure replaces them
+_BASIC_HANDLER_TYPES = (logging.StreamHandler, logging.FileHandler)
+
+# Attributes every record has; any other attribute was passed in ``extra``
+_RECORD_ATTRIBUTES = set(
+    logging.LogRecord("", logging.INFO, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "trace_id", "span_id"}
+
+
+def parse_overrides(value: str) -> dict[str, str]:
+    """
+    Parse comma-separated ``name=value`` pairs.
+
+    Args:
+        value: Pairs such as ``"sqlalchemy.engine=WARNING,app.access=INFO"``.
+
+    Returns:
+        Mapping of name to value.
+
+    Raises:
+        ValueError: If a pair has no ``=``.
+    """
+    overrides = {}
+    for pair in value.split(","):
+        if not pair.strip():
+            continue
+        name, separator, setting = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Expected name=value, got {pair!r}")
+        overrides[name.strip()] = setting.strip()
+    return overrides
+
+
+class LoggingSettings:
+    """
+    ``LOG_*`` settings read from the environment.
+
+    Used by apps that have no settings object of their own; the defaults
+    match the ``Settings`` of the awesome and template apps.
+    """
+
+    def __init__(self):
+        """Read the settings from the environment."""
+        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+        self.LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+        self.LOG_QUEUE_ENABLED = (
+            os.getenv("LOG_QUEUE_ENABLED", "True").lower() == "true"
+        )
+        self.LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+        self.LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record.
+
+        The object has the time, level, logger and message, the trace and
+        span IDs when the record has them, any ``extra`` attributes and the
+        formatted exception.
+        """
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+            entry["span_id"] = record.span_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a share of the records below WARNING of selected loggers.
+
+    A rate applies to the named logger and its children; the most specific
+    name wins. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        """
+        Initialize the filter.
+
+        Args:
+            rates: Mapping of logger name to the fraction of records kept.
+        """
+        super().__init__()
+        self.rates = rates
+        self._rate_by_logger: dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        """Get the sampling rate of a logger."""
+        rate = self._rate_by_logger.get(name)
+        if rate is None:
+            rate = 1.0
+            prefix = name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._rate_by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether a record is kept."""
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds the IDs of the current OpenTelemetry span to records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Set ``trace_id`` and ``span_id`` when a span is recording."""
+        if trace is not None:
+            context = trace.get_current_span().get_span_context()
+            if context.is_valid:
+                record.trace_id = format(context.trace_id, "032x")
+                record.span_id = format(context.span_id, "016x")
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records with their message merged but not yet formatted."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make a record safe to hand to another thread.
+
+        Unlike ``QueueHandler.prepare``, the record is not formatted here;
+        that is left to the listener's handler.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LoggingPipeline:
+    """
+    Root handler, filters and listener thread installed by ``configure``.
+
+    Attributes:
+        handler: Handler installed on the root logger, or None.
+    """
+
+    def __init__(self):
+        """Initialize an unconfigured pipeline."""
+        self.handler: logging.Handler | None = None
+        self._listener: logging.handlers.QueueListener | None = None
+        self._registered_exit = False
+
+    @property
+    def queued(self) -> bool:
+        """Whether records are written by the listener thread."""
+        return self._listener is not None
+
+    def configure(
+        self,
+        level: str | int = logging.INFO,
+        json_format: bool = False,
+        use_queue: bool = True,
+        levels: dict[str, str] | None = None,
+        sample_rates: dict[str, float] | None = None,
+        stream: IO[str] | None = None,
+    ) -> None:
+        """
+        Install the root handler, replacing one installed earlier.
+
+        Stream and file handlers already on the root logger, e.g. from
+        ``logging.basicConfig``, are removed so records are not written twice.
+
+        Args:
+            level: Level of the root logger.
+            json_format: Write JSON lines instead of text.
+            use_queue: Write records from a listener thread.
+            levels: Mapping of logger name to level.
+            sample_rates: Mapping of logger name to the fraction of its
+                records below WARNING that are kept.
+            stream: Stream written to; defaults to stdout.
+        """
+        self.shutdown()
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(
+            JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+        )
+
+        if use_queue:
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            self.handler = _QueueHandler(log_queue)
+            self._listener = logging.handlers.QueueListener(
+                log_queue, output, respect_handler_level=True
+            )
+            self._listener.start()
+            if not self._registered_exit:
+                # Write what is still queued when the process exits
+                atexit.register(self.shutdown)
+                self._registered_exit = True
+        else:
+            self.handler = output
+        if sample_rates:
+            self.handler.addFilter(SamplingFilter(sample_rates))
+        self.handler.addFilter(TraceContextFilter())
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if type(handler) in _BASIC_HANDLER_TYPES:
+                root.removeHandler(handler)
+                handler.close()
+        root.addHandler(self.handler)
+        root.setLevel(level)
+        for name, logger_level in (levels or {}).items():
+            logging.getLogger(name).setLevel(logger_level.upper())
+
+    def shutdown(self) -> None:
+        """Write the queued records and remove the root handler."""
+        if self.handler is not None:
+            logging.getLogger().removeHandler(self.handler)
+            self.handler = None
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+# Create a singleton instance for global use
+logging_pipeline = LoggingPipeline()
+
+
+def configure_logging(settings: Any | None = None) -> None:
+    """
+    Configure logging from settings.
+
+    Args:
+        settings: Object with ``LOG_LEVEL``, ``LOG_FORMAT`` ("text" or
+            "json"), ``LOG_QUEUE_ENABLED``, ``LOG_LEVELS`` and
+            ``LOG_SAMPLE_RATES``; the last two are ``name=value`` pairs.
+            Defaults to ``LoggingSettings()``.
+
+    Raises:
+        ValueError: If an override is malformed.
+    """
+    if settings is None:
+        settings = LoggingSettings()
+    sample_rates = parse_overrides(settings.LOG_SAMPLE_RATES)
+    logging_pipeline.configure(
+        level=settings.LOG_LEVEL.upper(),
+        json_format=settings.LOG_FORMAT.lower() == "json",
+        use_queue=settings.LOG_QUEUE_ENABLED,
+        levels=parse_overrides(settings.LOG_LEVELS),
+        sample_rates={name: float(rate) for name, rate in sample_rates.items()},
+    )
@@ -0,0 +1,164 @@
+import io
+import json
+import logging
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from libs.py.logging_config.models.logging_config import (
+    JsonFormatter,
+    LoggingPipeline,
+    LoggingSettings,
+    SamplingFilter,
+    configure_logging,
+    logging_pipeline,
+    parse_overrides,
+)
+
+
+def _lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def _record(name: str, level: int) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 0, "row", (), None)
+
+
+class TestParseOverrides(unittest.TestCase):
+    def test_pairs(self):
+        self.assertEqual(parse_overrides(""), {})
+        self.assertEqual(
+            parse_overrides("sqlalchemy.engine=WARNING, app = DEBUG"),
+            {"sqlalchemy.engine": "WARNING", "app": "DEBUG"},
+        )
+
+    def test_pair_without_value_is_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_overrides("sqlalchemy.engine")
+
+
+class TestSamplingFilter(unittest.TestCase):
+    def test_sampling_keeps_warnings(self):
+        sampling = SamplingFilter({"tests.rows": 0.0, "tests.rows.kept": 1.0})
+
+        self.assertFalse(sampling.filter(_record("tests.rows", logging.INFO)))
+        self.assertFalse(sampling.filter(_record("tests.rows.child", logging.DEBUG)))
+        self.assertTrue(sampling.filter(_record("tests.rows.child", logging.WARNING)))
+        self.assertTrue(sampling.filter(_record("tests.rows.kept", logging.INFO)))
+        self.assertTrue(sampling.filter(_record("tests.other", logging.INFO)))
+
+
+class TestJsonFormatter(unittest.TestCase):
+    def test_unknown_types_are_written_as_strings(self):
+        record = _record("tests", logging.INFO)
+        record.payload = {1, 2}
+
+        self.assertEqual(
+            json.loads(JsonFormatter().format(record))["payload"], "{1, 2}"
+        )
+
+
+class TestLoggingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.level = self.root.level
+        self.pipeline = LoggingPipeline()
+
+    def tearDown(self):
+        self.pipeline.shutdown()
+        self.root.setLevel(self.level)
+
+    def test_json_lines_are_written_by_the_listener(self):
+        stream = io.StringIO()
+        self.pipeline.configure(json_format=True, stream=stream)
+        self.assertTrue(self.pipeline.queued)
+
+        logger = logging.getLogger("tests.logging.json")
+        logger.info("Created %s items", 3, extra={"user_id": 42})
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("Failed")
+        self.pipeline.shutdown()
+
+        created, failed = _lines(stream)
+        self.assertEqual(created["message"], "Created 3 items")
+        self.assertEqual(created["logger"], "tests.logging.json")
+        self.assertEqual(created["level"], "INFO")
+        self.assertEqual(created["user_id"], 42)
+        self.assertNotIn("trace_id", created)
+        self.assertEqual(failed["level"], "ERROR")
+        self.assertIn("RuntimeError: boom", failed["exception"])
+
+    def test_trace_ids_are_added_to_records(self):
+        try:
+            from opentelemetry.sdk.trace import TracerProvider
+        except ImportError:
+            self.skipTest("OpenTelemetry is not installed")
+
+        stream = io.StringIO()
+        self.pipeline.configure(json_format=True, use_queue=False, stream=stream)
+        tracer = TracerProvider().get_tracer(__name__)
+
+        with tracer.start_as_current_span("request") as span:
+            logging.getLogger("tests.logging.trace").warning("In a span")
+
+        (line,) = _lines(stream)
+        context = span.get_span_context()
+        self.assertEqual(line["trace_id"], format(context.trace_id, "032x"))
+        self.assertEqual(line["span_id"], format(context.span_id, "016x"))
+
+    def test_basic_config_handlers_are_replaced(self):
+        earlier = logging.StreamHandler(io.StringIO())
+        self.root.addHandler(earlier)
+        self.addCleanup(self.root.removeHandler, earlier)
+
+        stream = io.StringIO()
+        self.pipeline.configure(use_queue=False, stream=stream)
+        logging.getLogger("tests.logging.basic").warning("written")
+
+        self.assertNotIn(earlier, self.root.handlers)
+        self.assertEqual(earlier.stream.getvalue(), "")
+        self.assertEqual(stream.getvalue().count("written"), 1)
+
+
+class TestConfigureLogging(unittest.TestCase):
+    def setUp(self):
+        root = logging.getLogger()
+        self.addCleanup(root.setLevel, root.level)
+        self.addCleanup(logging_pipeline.shutdown)
+
+    def test_levels_and_sampling_come_from_settings(self):
+        settings = SimpleNamespace(
+            LOG_LEVEL="info",
+            LOG_FORMAT="json",
+            LOG_QUEUE_ENABLED=False,
+            LOG_LEVELS="tests.logging.quiet=error",
+            LOG_SAMPLE_RATES="tests.logging.sampled=0",
+        )
+        quiet = logging.getLogger("tests.logging.quiet")
+        self.addCleanup(quiet.setLevel, logging.NOTSET)
+
+        configure_logging(settings)
+        stream = io.StringIO()
+        logging_pipeline.handler.setStream(stream)
+
+        quiet.warning("dropped by level")
+        logging.getLogger("tests.logging.sampled").info("dropped by sampling")
+        logging.getLogger("tests.logging.sampled").error("kept")
+
+        self.assertEqual([line["message"] for line in _lines(stream)], ["kept"])
+
+    def test_settings_default_to_the_environment(self):
+        with patch.dict(
+            "os.environ", {"LOG_FORMAT": "json", "LOG_QUEUE_ENABLED": "false"}
+        ):
+            configure_logging()
+
+        self.assertFalse(logging_pipeline.queued)
+        self.assertIsInstance(logging_pipeline.handler.formatter, JsonFormatter)
+        self.assertEqual(LoggingSettings().LOG_LEVEL, "INFO")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Serving cached responses with ETag revalidation.
+
+Read endpoints of models with a ``cache_namespace`` look their response up
+in ``response_cache`` and only query the database on a miss. Every response
+carries an ETag; a request whose ``If-None-Match`` matches it gets an empty
+304, whether the body came from the cache or was just built.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.api.pagination import NEXT_CURSOR_HEADER, fetch_page, fetch_page_async
+from app.core.response_cache import CachedResponse, response_cache
+from app.crud.base import CRUDBase
+from app.crud.pagination import Page
+
+# Clients may keep the body but must revalidate it before each use
+CACHE_CONTROL = "private, no-cache"
+
+
+def _object_entry(
+    crud_obj: CRUDBase, schema: type[BaseModel], obj: Any
+) -> CachedResponse:
+    """Serialize a row, remembering its owner for permission checks on hits."""
+    body = schema.model_validate(obj).model_dump_json().encode()
+    return CachedResponse(body, owner_id=crud_obj._owner_of(obj))
+
+
+def _page_entry(schema: type[BaseModel], page: Page[Any]) -> CachedResponse:
+    """Serialize a page of rows to a JSON array, remembering the next cursor."""
+    rows = [schema.model_validate(row).model_dump_json().encode() for row in page.items]
+    return CachedResponse(b"[" + b",".join(rows) + b"]", next_cursor=page.next_cursor)
+
+
+def cached_object(
+    crud_obj: CRUDBase, schema: type[BaseModel], id: Any, load: Callable[[], Any]
+) -> CachedResponse | None:
+    """
+    Get the cached response for a row, loading and caching it on a miss.
+
+    The caller still has to check ``owner_id`` against the current user.
+
+    Args:
+        crud_obj: CRUD object of the model.
+        schema: Response schema of the endpoint.
+        id: ID of the row.
+        load: Function returning the row, or None if it does not exist.
+
+    Returns:
+        Cache entry, or None if the row does not exist.
+    """
+    # Read before loading: a write committed meanwhile retires this key
+    key = response_cache.object_key(crud_obj.cache_namespace, id)
+    entry = response_cache.get(key)
+    if entry is None:
+        obj = load()
+        if obj is None:
+            return None
+        entry = response_cache.put(key, _object_entry(crud_obj, schema, obj))
+    return entry
+
+
+async def cached_object_async(
+    crud_obj: CRUDBase,
+    schema: type[BaseModel],
+    id: Any,
+    load: Callable[[], Awaitable[Any]],
+) -> CachedResponse | None:
+    """
+    Get the cached response for a row, loading it asynchronously on a miss.
+
+    Args:
+        crud_obj: CRUD object of the model.
+        schema: Response schema of the endpoint.
+        id: ID of the row.
+        load: Coroutine function returning the row, or None.
+
+    Returns:
+        Cache entry, or None if the row does not exist.
+    """
+    # Read before loading: a write committed meanwhile retires this key
+    key = response_cache.object_key(crud_obj.cache_namespace, id)
+    entry = response_cache.get(key)
+    if entry is None:
+        obj = await load()
+        if obj is None:
+            return None
+        entry = response_cache.put(key, _object_entry(crud_obj, schema, obj))
+    return entry
+
+
+def cached_page(
+    crud_obj: CRUDBase,
+    schema: type[BaseModel],
+    *,
+    owner_id: int | None,
+    cursor: str | None,
+    limit: int,
+    fetch: Callable[[], Page[Any]],
+) -> CachedResponse:
+    """
+    Get the cached response for a keyset page, fetching it on a miss.
+
+    Args:
+        crud_obj: CRUD object of the model.
+        schema: Response schema of one row.
+        owner_id: Owner the page is filtered to, or None for all rows.
+        cursor: Cursor of the page.
+        limit: Page size.
+        fetch: Function returning the page.
+
+    Returns:
+        Cache entry.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    key = response_cache.page_key(
+        crud_obj.cache_namespace, owner_id=owner_id, cursor=cursor, limit=limit
+    )
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = response_cache.put(key, _page_entry(schema, fetch_page(fetch)))
+    return entry
+
+
+async def cached_page_async(
+    crud_obj: CRUDBase,
+    schema: type[BaseModel],
+    *,
+    owner_id: int | None,
+    cursor: str | None,
+    limit: int,
+    fetch: Callable[[], Awaitable[Page[Any]]],
+) -> CachedResponse:
+    """
+    Get the cached response for a keyset page, fetching it asynchronously.
+
+    Args:
+        crud_obj: CRUD object of the model.
+        schema: Response schema of one row.
+        owner_id: Owner the page is filtered to, or None for all rows.
+        cursor: Cursor of the page.
+        limit: Page size.
+        fetch: Coroutine function returning the page.
+
+    Returns:
+        Cache entry.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    key = response_cache.page_key(
+        crud_obj.cache_namespace, owner_id=owner_id, cursor=cursor, limit=limit
+    )
+    entry = response_cache.get(key)
+    if entry is None:
+        page = await fetch_page_async(fetch)
+        entry = response_cache.put(key, _page_entry(schema, page))
+    return entry
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against an ETag.
+
+    Args:
+        if_none_match: Header value, a list of ETags or ``*``.
+        etag: Current ETag, including quotes.
+
+    Returns:
+        Whether the client's copy is current. Weak ETags match, as
+        ``If-None-Match`` uses the weak comparison.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """
+    Build the response for a cache entry.
+
+    Args:
+        request: Current request, for ``If-None-Match``.
+        entry: Cache entry.
+
+    Returns:
+        A 304 without body if the client's copy is current, otherwise the
+        JSON body with its ETag.
+    """
+    headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+    if entry.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = entry.next_cursor
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
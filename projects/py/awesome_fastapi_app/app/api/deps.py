@@ -2,43 +2,199 @@
 Dependencies for FastAPI dependency injection.
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app import crud, models, schemas
+from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.response_cache import response_cache
+from app.core.token_cache import UserSnapshot, token_cache
+from app.db.session import SessionLocal, get_async_sessionmaker, use_primary
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
 
+# Requests with these methods may read from a replica
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
 
-def get_db() -> Generator:
+
+def get_db(request: Request) -> Generator:
     """
     Get a database session.
 
+    Read-only requests send their SELECTs to a read replica when replicas are
+    configured; all other requests use the primary.
+
+    Args:
+        request: Current request.
+
     Yields:
         Database session.
     """
     try:
         db = SessionLocal()
+        if request.method not in READ_ONLY_METHODS:
+            use_primary(db)
         yield db
     finally:
         db.close()
 
 
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session.
+
+    Used by endpoints served with ``DB_MODE=async``. Routed like ``get_db``.
+
+    Args:
+        request: Current request.
+
+    Yields:
+        Async database session.
+    """
+    async with get_async_sessionmaker()() as db:
+        if request.method not in READ_ONLY_METHODS:
+            use_primary(db)
+        yield db
+
+
+def get_primary_db(db: Session = Depends(get_db)) -> Session:
+    """
+    Get the request's database session, routed to the primary.
+
+    For read endpoints that must not see replication lag, e.g. reading back
+    something the client has just written.
+
+    Args:
+        db: Database session of the request.
+
+    Returns:
+        The same session, with every statement sent to the primary.
+    """
+    use_primary(db)
+    return db
+
+
+async def get_primary_async_db(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncSession:
+    """
+    Get the request's async database session, routed to the primary.
+
+    Args:
+        db: Async database session of the request.
+
+    Returns:
+        The same session, with every statement sent to the primary.
+    """
+    use_primary(db)
+    return db
+
+
+def get_cache_fill_db(db: Session = Depends(get_db)) -> Session:
+    """
+    Get the session of an endpoint that fills the response cache.
+
+    While the response cache is enabled, the session reads from the primary:
+    a cached row stays until its TTL or next write, so a replica that has not
+    caught up with a write must not be the source. Hits run no query, so this
+    only moves cache misses to the primary.
+
+    Args:
+        db: Database session of the request.
+
+    Returns:
+        The same session.
+    """
+    if response_cache.enabled:
+        use_primary(db)
+    return db
+
+
+async def get_cache_fill_async_db(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncSession:
+    """
+    Get the async session of an endpoint that fills the response cache.
+
+    Args:
+        db: Async database session of the request.
+
+    Returns:
+        The same session, reading from the primary while the cache is enabled.
+    """
+    if response_cache.enabled:
+        use_primary(db)
+    return db
+
+
+def _detached_user(snapshot: UserSnapshot) -> models.User:
+    """Build a detached User instance from a cached snapshot."""
+    user = models.User(**snapshot.values)
+    make_transient_to_detached(user)
+    return user
+
+
+def _user_from_snapshot(db: Session, snapshot: UserSnapshot) -> models.User:
+    """
+    Attach a cached user snapshot to the session without querying.
+
+    The snapshot is turned into a detached User instance and merged with
+    ``load=False``, so it behaves like a loaded row (updates, relationship
+    loading) while skipping the SELECT.
+
+    Args:
+        db: Database session.
+        snapshot: Cached user snapshot.
+
+    Returns:
+        User instance bound to the session.
+    """
+    return db.merge(_detached_user(snapshot), load=False)
+
+
+def _token_payload(token: str) -> schemas.TokenPayload:
+    """
+    Verify a token and parse its claims.
+
+    Args:
+        token: JWT token.
+
+    Returns:
+        Token claims.
+
+    Raises:
+        HTTPException: If the token is invalid.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Could not validate credentials",
+    )
+    payload = security.decode_token(token)
+    if payload is None:
+        raise credentials_exception
+    try:
+        return schemas.TokenPayload(**payload)
+    except ValidationError:
+        raise credentials_exception
+
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> models.User:
     """
     Get the current user from the token.
 
+    Tokens that were already verified are served from the token cache,
+    which skips both the signature check and the user lookup.
+
     Args:
         db: Database session.
         token: JWT token.
@@ -49,19 +205,47 @@ def get_current_user(
     Raises:
         HTTPException: If the token is invalid or the user doesn't exist.
     """
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = schemas.TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
+    snapshot = token_cache.get(token)
+    if snapshot is not None:
+        return _user_from_snapshot(db, snapshot)
+
+    token_data = _token_payload(token)
     user = crud.user.get(db, id=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    token_cache.put(token, user, token_expires_at=token_data.exp)
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    """
+    Get the current user from the token on the async session.
+
+    Used by endpoints served with ``DB_MODE=async``, so that authentication
+    does not open a sync session in the threadpool. Uses the token cache like
+    ``get_current_user``.
+
+    Args:
+        db: Async database session.
+        token: JWT token.
+
+    Returns:
+        Current user.
+
+    Raises:
+        HTTPException: If the token is invalid or the user doesn't exist.
+    """
+    snapshot = token_cache.get(token)
+    if snapshot is not None:
+        return await db.merge(_detached_user(snapshot), load=False)
+
+    token_data = _token_payload(token)
+    user = await crud.user.get_async(db, id=token_data.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    token_cache.put(token, user, token_expires_at=token_data.exp)
     return user
 
 
@@ -85,6 +269,26 @@ def get_current_active_user(
     return current_user
 
 
+async def get_current_active_user_async(
+    current_user: models.User = Depends(get_current_user_async),
+) -> models.User:
+    """
+    Get the current active user on the async session.
+
+    Args:
+        current_user: Current user.
+
+    Returns:
+        Current active user.
+
+    Raises:
+        HTTPException: If the user is inactive.
+    """
+    if not crud.user.is_active(current_user):
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
 def get_current_active_superuser(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
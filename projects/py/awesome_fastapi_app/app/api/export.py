@@ -0,0 +1,161 @@
+"""
+Streaming exports of whole tables.
+
+Rows are read with ``yield_per``, which uses a server-side cursor on
+PostgreSQL, and are selected as plain column tuples rather than ORM objects,
+so neither the database driver nor the session holds more than one batch.
+Each batch is encoded as NDJSON or CSV and sent as soon as it is ready;
+clients that accept gzip get the stream compressed on the fly.
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the column types the JSON encoder does not know."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+
+def _encode_ndjson(fields: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """Encode rows as one JSON object per line."""
+    lines = [
+        json.dumps(dict(zip(fields, row)), default=_json_default, separators=(",", ":"))
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _encode_csv(rows: Iterable[Sequence[Any]]) -> bytes:
+    """Encode rows as CSV lines."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def export_rows(
+    db: Session,
+    statement: Select,
+    fields: Sequence[str],
+    export_format: ExportFormat,
+    batch_size: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Run a query and encode its rows batch by batch.
+
+    Args:
+        db: Database session, kept open until the iterator is exhausted.
+        statement: SELECT of the exported columns, in ``fields`` order.
+        fields: Names of the exported columns.
+        export_format: ``ndjson`` or ``csv`` (with a header line).
+        batch_size: Rows fetched and encoded at a time; defaults to
+            ``settings.EXPORT_BATCH_SIZE``.
+
+    Yields:
+        Encoded chunks, one per batch.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    if export_format == "csv":
+        yield _encode_csv([fields])
+    result = db.execute(statement.execution_options(yield_per=batch_size))
+    try:
+        for rows in result.partitions():
+            if export_format == "csv":
+                yield _encode_csv(rows)
+            else:
+                yield _encode_ndjson(fields, rows)
+    finally:
+        # Release the server-side cursor if the client disconnects early
+        result.close()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks into a single gzip stream.
+
+    Args:
+        chunks: Uncompressed chunks.
+        level: zlib compression level.
+
+    Yields:
+        Compressed chunks.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(request: Request) -> bool:
+    """
+    Check whether the client accepts a gzip-encoded response.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        Whether ``Accept-Encoding`` lists gzip without ``q=0``.
+    """
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+def export_response(
+    request: Request,
+    db: Session,
+    statement: Select,
+    fields: Sequence[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Stream the rows of a query as a file download.
+
+    Args:
+        request: Current request, for ``Accept-Encoding``.
+        db: Database session.
+        statement: SELECT of the exported columns, in ``fields`` order.
+        fields: Names of the exported columns.
+        export_format: ``ndjson`` or ``csv``.
+        filename: Download name without extension.
+
+    Returns:
+        Streaming response.
+    """
+    chunks = export_rows(db, statement, fields, export_format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{export_format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(request):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        chunks, media_type=MEDIA_TYPES[export_format], headers=headers
+    )
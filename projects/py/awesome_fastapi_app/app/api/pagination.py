@@ -0,0 +1,131 @@
+"""
+Keyset pagination support for list endpoints.
+
+List endpoints keep returning a plain JSON array. When more rows follow, the
+cursor for the next page is sent in the ``X-Next-Cursor`` response header and
+passed back as the ``cursor`` query parameter. ``skip`` based offset paging
+remains available for existing clients.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from fastapi import HTTPException, Response
+
+from app.crud.pagination import InvalidCursor, Page
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Largest ``limit`` a list endpoint accepts
+MAX_PAGE_SIZE = 1000
+
+
+def use_keyset(skip: int, cursor: str | None) -> bool:
+    """
+    Decide whether a list request should use keyset pagination.
+
+    Requests without an offset are served with keyset pagination, which
+    returns the same first page as offset paging, ordered by ID.
+
+    Args:
+        skip: Offset requested by the client.
+        cursor: Cursor requested by the client.
+
+    Returns:
+        True for keyset pagination, False for offset paging.
+
+    Raises:
+        HTTPException: If both an offset and a cursor were given.
+    """
+    if cursor is not None and skip:
+        raise HTTPException(
+            status_code=400, detail="Use either skip or cursor, not both"
+        )
+    return not skip
+
+
+def keyset_page(response: Response, fetch: Callable[[], Page[T]]) -> list[T]:
+    """
+    Fetch a page and expose its next cursor on the response.
+
+    Args:
+        response: Response whose headers receive the next cursor.
+        fetch: Function returning the page.
+
+    Returns:
+        The rows on the page.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    return _page_items(response, fetch_page(fetch))
+
+
+async def keyset_page_async(
+    response: Response, fetch: Callable[[], Awaitable[Page[T]]]
+) -> list[T]:
+    """
+    Fetch a page asynchronously and expose its next cursor on the response.
+
+    Args:
+        response: Response whose headers receive the next cursor.
+        fetch: Coroutine function returning the page.
+
+    Returns:
+        The rows on the page.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    return _page_items(response, await fetch_page_async(fetch))
+
+
+def fetch_page(fetch: Callable[[], Page[T]]) -> Page[T]:
+    """
+    Fetch a page, rejecting invalid cursors with a 400.
+
+    Args:
+        fetch: Function returning the page.
+
+    Returns:
+        The page.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    try:
+        return fetch()
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=400, detail="Invalid pagination cursor"
+        ) from None
+
+
+async def fetch_page_async(fetch: Callable[[], Awaitable[Page[T]]]) -> Page[T]:
+    """
+    Fetch a page asynchronously, rejecting invalid cursors with a 400.
+
+    Args:
+        fetch: Coroutine function returning the page.
+
+    Returns:
+        The page.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    try:
+        return await fetch()
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=400, detail="Invalid pagination cursor"
+        ) from None
+
+
+def _page_items(response: Response, page: Page[T]) -> list[T]:
+    """Set the next cursor header for a page and return its rows."""
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
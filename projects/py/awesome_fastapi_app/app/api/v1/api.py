@@ -8,6 +8,7 @@ from app.api.v1.endpoints import (
     items,
     key_management,
     login,
+    metrics,
     notes,
     rate_limited,
     seed,
@@ -23,6 +24,7 @@ api_router.include_router(notes.router, prefix="/notes", tags=["notes"])
 api_router.include_router(
     key_management.router, prefix="/key-management", tags=["key-management"]
 )
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(
     rate_limited.router, prefix="/rate-limited", tags=["rate-limited"]
 )
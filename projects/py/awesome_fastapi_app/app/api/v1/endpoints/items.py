@@ -2,37 +2,81 @@
 Items endpoints for item management.
 """
 
+import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.caching import (
+    cached_object,
+    cached_object_async,
+    cached_page,
+    cached_page_async,
+    cached_response,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import MAX_PAGE_SIZE, use_keyset
+from app.core.config import settings
+from app.crud.pagination import Page
 from app.pubsub.publisher import pubsub_publisher
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
-@router.get("/", response_model=list[schemas.Item])
 def read_items(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: Session = Depends(deps.get_cache_fill_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve items.
 
+    Without ``skip`` items are paged by ID and the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header. These pages are cached and
+    carry an ETag.
+
     Args:
+        request: Request, for ``If-None-Match``.
         db: Database session.
         skip: Number of items to skip.
         limit: Maximum number of items to return.
+        cursor: Cursor from the previous page.
         current_user: Current user.
 
     Returns:
         List of items.
     """
+    if use_keyset(skip, cursor):
+        owner_id = None if crud.user.is_superuser(current_user) else current_user.id
+
+        def fetch() -> Page[models.Item]:
+            if owner_id is None:
+                return crud.item.get_page(db, cursor=cursor, limit=limit)
+            return crud.item.get_page_by_owner(
+                db, owner_id=owner_id, cursor=cursor, limit=limit
+            )
+
+        entry = cached_page(
+            crud.item,
+            schemas.Item,
+            owner_id=owner_id,
+            cursor=cursor,
+            limit=limit,
+            fetch=fetch,
+        )
+        return cached_response(request, entry)
+
     if crud.user.is_superuser(current_user):
         items = crud.item.get_multi(db, skip=skip, limit=limit)
     else:
@@ -42,6 +86,96 @@ def read_items(
     return items
 
 
+async def read_items_async(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_cache_fill_async_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Retrieve items on the event loop, for ``DB_MODE=async``.
+
+    Args:
+        request: Request, for ``If-None-Match``.
+        db: Async database session.
+        skip: Number of items to skip.
+        limit: Maximum number of items to return.
+        cursor: Cursor from the previous page.
+        current_user: Current user.
+
+    Returns:
+        List of items.
+    """
+    if use_keyset(skip, cursor):
+        owner_id = None if crud.user.is_superuser(current_user) else current_user.id
+
+        async def fetch() -> Page[models.Item]:
+            if owner_id is None:
+                return await crud.item.get_page_async(db, cursor=cursor, limit=limit)
+            return await crud.item.get_page_by_owner_async(
+                db, owner_id=owner_id, cursor=cursor, limit=limit
+            )
+
+        entry = await cached_page_async(
+            crud.item,
+            schemas.Item,
+            owner_id=owner_id,
+            cursor=cursor,
+            limit=limit,
+            fetch=fetch,
+        )
+        return cached_response(request, entry)
+
+    if crud.user.is_superuser(current_user):
+        return await crud.item.get_multi_async(db, skip=skip, limit=limit)
+    return await crud.item.get_multi_by_owner_async(
+        db, owner_id=current_user.id, skip=skip, limit=limit
+    )
+
+
+router.add_api_route(
+    "/",
+    read_items_async if settings.DB_MODE == "async" else read_items,
+    methods=["GET"],
+    response_model=list[schemas.Item],
+    name="read_items",
+)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_items(
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Export items as NDJSON or CSV.
+
+    Rows are streamed in batches as they are read, so memory use does not
+    grow with the number of items. Gzip is applied when the client sends
+    ``Accept-Encoding: gzip``.
+
+    Args:
+        request: Request, for ``Accept-Encoding``.
+        db: Database session.
+        export_format: ``ndjson`` or ``csv``.
+        current_user: Current user.
+
+    Returns:
+        Streaming response with the user's items, or all items for superusers.
+    """
+    fields = list(schemas.Item.model_fields)
+    statement = select(*(getattr(models.Item, field) for field in fields)).order_by(
+        models.Item.id
+    )
+    if not crud.user.is_superuser(current_user):
+        statement = statement.where(models.Item.owner_id == current_user.id)
+    return export_response(request, db, statement, fields, export_format, "items")
+
+
 @router.post("/", response_model=schemas.Item)
 def create_item(
     *,
@@ -61,23 +195,59 @@ def create_item(
         Created item.
     """
     item = crud.item.create_with_owner(db=db, obj_in=item_in, owner_id=current_user.id)
+    _publish_item_created(item.id, current_user.id)
+    return item
 
-    # Publish message to PubSub
+
+@router.post("/bulk", response_model=schemas.BulkCreated)
+def create_items_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    items_in: list[schemas.ItemCreate],
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create several items in one transaction.
+
+    Args:
+        db: Database session.
+        items_in: Item data.
+        current_user: Current user.
+
+    Returns:
+        IDs of the created items, in request order.
+    """
+    if len(items_in) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BULK_CREATE_MAX_ITEMS} items per request",
+        )
+    ids = crud.item.create_many_with_owner(
+        db=db, objs_in=items_in, owner_id=current_user.id
+    )
+    for item_id in ids:
+        _publish_item_created(item_id, current_user.id)
+    return {"ids": ids}
+
+
+def _publish_item_created(item_id: int, owner_id: int) -> None:
+    """Queue an item_created message to PubSub without waiting for the result."""
+    if crud.item.events_enabled:
+        # The event was written to the outbox with the item
+        return
     try:
-        pubsub_publisher.publish_message(
-            "example",
+        pubsub_publisher.publish_nowait(
+            settings.PUBSUB_TOPIC_ITEM_EVENTS,
             {
                 "action": "item_created",
-                "item_id": item.id,
-                "owner_id": current_user.id,
+                "item_id": item_id,
+                "owner_id": owner_id,
             },
-            {"user_id": str(current_user.id)},
+            {"user_id": str(owner_id)},
         )
     except Exception as e:
         # Log error but don't fail the request
-        print(f"Error publishing message: {e}")
-
-    return item
+        logger.error(f"Error publishing message: {e}")
 
 
 @router.put("/{id}", response_model=schemas.Item)
@@ -109,17 +279,20 @@ def update_item(
     return item
 
 
-@router.get("/{id}", response_model=schemas.Item)
 def read_item(
     *,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: Session = Depends(deps.get_cache_fill_db),
     id: int,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get item by ID.
 
+    The response is cached and carries an ETag.
+
     Args:
+        request: Request, for ``If-None-Match``.
         db: Database session.
         id: Item ID.
         current_user: Current user.
@@ -127,12 +300,52 @@ def read_item(
     Returns:
         Item.
     """
-    item = crud.item.get(db=db, id=id)
-    if not item:
+    entry = cached_object(
+        crud.item, schemas.Item, id, lambda: crud.item.get(db=db, id=id)
+    )
+    if entry is None:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not crud.user.is_superuser(current_user) and (item.owner_id != current_user.id):
+    if not crud.user.is_superuser(current_user) and (entry.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return item
+    return cached_response(request, entry)
+
+
+async def read_item_async(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_cache_fill_async_db),
+    id: int,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Get item by ID on the event loop, for ``DB_MODE=async``.
+
+    Args:
+        request: Request, for ``If-None-Match``.
+        db: Async database session.
+        id: Item ID.
+        current_user: Current user.
+
+    Returns:
+        Item.
+    """
+    entry = await cached_object_async(
+        crud.item, schemas.Item, id, lambda: crud.item.get_async(db, id)
+    )
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    if not crud.user.is_superuser(current_user) and (entry.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return cached_response(request, entry)
+
+
+router.add_api_route(
+    "/{id}",
+    read_item_async if settings.DB_MODE == "async" else read_item,
+    methods=["GET"],
+    response_model=schemas.Item,
+    name="read_item",
+)
 
 
 @router.delete("/{id}", response_model=schemas.Item)
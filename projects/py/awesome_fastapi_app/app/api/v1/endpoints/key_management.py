@@ -10,6 +10,7 @@ from pydantic import BaseModel
 
 from app.api import deps
 from app.core.secret_rotation import secret_manager
+from app.core.token_cache import token_cache
 
 router = APIRouter()
 
@@ -23,6 +24,20 @@ class KeyStatusResponse(BaseModel):
     current_time: str
 
 
+class TokenCacheStatsResponse(BaseModel):
+    """Response model for token cache statistics."""
+
+    enabled: bool
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+
+
 class KeyRotationResponse(BaseModel):
     """Response model for key rotation."""
 
@@ -48,6 +63,18 @@ def get_key_status(current_user=Depends(deps.get_current_active_superuser)) -> A
     }
 
 
+@router.get("/token-cache", response_model=TokenCacheStatsResponse)
+def get_token_cache_stats(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get hit/miss counters of the verified-token cache.
+
+    Only accessible to superusers.
+    """
+    return token_cache.stats()
+
+
 @router.post("/rotate-jwt-key", response_model=KeyRotationResponse)
 def rotate_jwt_key(current_user=Depends(deps.get_current_active_superuser)) -> Any:
     """
@@ -18,12 +18,15 @@ router = APIRouter()
 
 
 @router.post("/login/access-token", response_model=schemas.Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
 
+    Password verification runs on the dedicated hashing pool; when that pool
+    is saturated the request fails fast with 429.
+
     Args:
         db: Database session.
         form_data: OAuth2 password request form.
@@ -31,7 +34,7 @@ def login_access_token(
     Returns:
         Access token.
     """
-    user = crud.user.authenticate(
+    user = await crud.user.authenticate_async(
         db, email=form_data.username, password=form_data.password
     )
     if not user:
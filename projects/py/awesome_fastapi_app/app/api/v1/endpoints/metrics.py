@@ -0,0 +1,136 @@
+"""
+Runtime metrics endpoints for capacity planning.
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.hashing_pool import password_hash_pool
+from app.core.response_cache import response_cache
+from app.core.startup import startup_profile
+from app.db.pool_metrics import pool_stats
+from app.db.session import db_engines
+from app.pubsub.publisher import pubsub_publisher
+from app.pubsub.subscriber import pubsub_subscriber
+from app.services.outbox_relay import outbox_relay
+
+router = APIRouter()
+
+
+@router.get("/password-hashing", response_model=dict[str, Any])
+def get_password_hashing_metrics(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get queue depth and throughput of the password hashing pool.
+
+    Only accessible to superusers.
+    """
+    return password_hash_pool.stats()
+
+
+@router.get("/response-cache", response_model=dict[str, Any])
+def get_response_cache_metrics(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get hit ratio and size of the item and note response cache.
+
+    Only accessible to superusers.
+    """
+    return response_cache.stats()
+
+
+@router.get("/pubsub", response_model=dict[str, Any])
+def get_pubsub_metrics(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get outbox depth, outcomes and latency of Pub/Sub publishing.
+
+    Only accessible to superusers.
+    """
+    return pubsub_publisher.stats()
+
+
+@router.get("/pubsub/subscriptions", response_model=dict[str, Any])
+def get_pubsub_subscription_metrics(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get throughput, lag and outcomes of each Pub/Sub subscription.
+
+    Only accessible to superusers.
+    """
+    return pubsub_subscriber.stats()
+
+
+@router.get("/outbox", response_model=dict[str, Any])
+def get_outbox_metrics(
+    db: Session = Depends(deps.get_db),
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get the backlog and relay counters of the transactional outbox.
+
+    Only accessible to superusers.
+    """
+    return {
+        **outbox_relay.stats(),
+        "backlog": outbox_relay.backlog(db),
+        "oldest_age_seconds": outbox_relay.oldest_age(db),
+    }
+
+
+@router.get("/db-pool", response_model=dict[str, Any])
+def get_db_pool_metrics(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get connection pool usage and checkout latency for each database engine.
+
+    Only accessible to superusers.
+    """
+    engines = {
+        "sync": db_engines.engine if db_engines.engine_created else None,
+        "async": db_engines.async_engine,
+    }
+    for kind, replicas in (
+        ("sync", db_engines.replicas if db_engines.engine_created else None),
+        ("async", db_engines.async_replicas),
+    ):
+        for index, engine in enumerate(replicas.engines if replicas else []):
+            engines[f"{kind}_replica_{index}"] = engine
+    return {
+        name: pool_stats(engine.pool)
+        for name, engine in engines.items()
+        if engine is not None
+    }
+
+
+@router.get("/db-replicas", response_model=dict[str, Any])
+def get_db_replica_health(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get which read replicas are currently used and which are skipped as down.
+
+    Only accessible to superusers.
+    """
+    replicas = db_engines.replicas if db_engines.engine_created else None
+    return {"replicas": replicas.status() if replicas else []}
+
+
+@router.get("/startup", response_model=dict[str, Any])
+def get_startup_metrics(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get how long each startup phase took and the time to ready.
+
+    Only accessible to superusers.
+    """
+    return startup_profile.report()
@@ -4,25 +4,65 @@ Notes API endpoints.
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.caching import (
+    cached_object,
+    cached_object_async,
+    cached_page,
+    cached_page_async,
+    cached_response,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import MAX_PAGE_SIZE, use_keyset
+from app.core.config import settings
+from app.crud.pagination import Page
+from app.models.note import Note
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[schemas.Note])
 def read_notes(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: Session = Depends(deps.get_cache_fill_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve notes.
+
+    Without ``skip`` notes are paged by ID and the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header. These pages are cached and
+    carry an ETag.
     """
+    if use_keyset(skip, cursor):
+        owner_id = None if crud.user.is_superuser(current_user) else current_user.id
+
+        def fetch() -> Page[Note]:
+            if owner_id is None:
+                return crud.note.get_page(db, cursor=cursor, limit=limit)
+            return crud.note.get_page_by_owner(
+                db, owner_id=owner_id, cursor=cursor, limit=limit
+            )
+
+        entry = cached_page(
+            crud.note,
+            schemas.Note,
+            owner_id=owner_id,
+            cursor=cursor,
+            limit=limit,
+            fetch=fetch,
+        )
+        return cached_response(request, entry)
+
     if crud.user.is_superuser(current_user):
         notes = crud.note.get_multi(db, skip=skip, limit=limit)
     else:
@@ -32,6 +72,72 @@ def read_notes(
     return notes
 
 
+async def read_notes_async(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_cache_fill_async_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Retrieve notes on the event loop, for ``DB_MODE=async``.
+    """
+    if use_keyset(skip, cursor):
+        owner_id = None if crud.user.is_superuser(current_user) else current_user.id
+
+        async def fetch() -> Page[Note]:
+            if owner_id is None:
+                return await crud.note.get_page_async(db, cursor=cursor, limit=limit)
+            return await crud.note.get_page_by_owner_async(
+                db, owner_id=owner_id, cursor=cursor, limit=limit
+            )
+
+        entry = await cached_page_async(
+            crud.note,
+            schemas.Note,
+            owner_id=owner_id,
+            cursor=cursor,
+            limit=limit,
+            fetch=fetch,
+        )
+        return cached_response(request, entry)
+
+    if crud.user.is_superuser(current_user):
+        return await crud.note.get_multi_async(db, skip=skip, limit=limit)
+    return await crud.note.get_multi_by_owner_async(
+        db, owner_id=current_user.id, skip=skip, limit=limit
+    )
+
+
+router.add_api_route(
+    "/",
+    read_notes_async if settings.DB_MODE == "async" else read_notes,
+    methods=["GET"],
+    response_model=list[schemas.Note],
+    name="read_notes",
+)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_notes(
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Export notes as NDJSON or CSV, streamed in batches.
+
+    Gzip is applied when the client sends ``Accept-Encoding: gzip``.
+    """
+    fields = list(schemas.Note.model_fields)
+    statement = select(*(getattr(Note, field) for field in fields)).order_by(Note.id)
+    if not crud.user.is_superuser(current_user):
+        statement = statement.where(Note.user_id == current_user.id)
+    return export_response(request, db, statement, fields, export_format, "notes")
+
+
 @router.post("/", response_model=schemas.Note)
 def create_note(
     *,
@@ -46,22 +152,74 @@ def create_note(
     return note
 
 
-@router.get("/{id}", response_model=schemas.Note)
-def read_note(
+@router.post("/bulk", response_model=schemas.BulkCreated)
+def create_notes_bulk(
     *,
     db: Session = Depends(deps.get_db),
+    notes_in: list[schemas.NoteCreate],
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create several notes in one transaction.
+    """
+    if len(notes_in) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BULK_CREATE_MAX_ITEMS} notes per request",
+        )
+    ids = crud.note.create_many_with_owner(
+        db=db, objs_in=notes_in, owner_id=current_user.id
+    )
+    return {"ids": ids}
+
+
+def read_note(
+    *,
+    request: Request,
+    db: Session = Depends(deps.get_cache_fill_db),
     id: int,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Get note by ID.
+    Get note by ID. The response is cached and carries an ETag.
     """
-    note = crud.note.get(db=db, id=id)
-    if not note:
+    entry = cached_object(
+        crud.note, schemas.Note, id, lambda: crud.note.get(db=db, id=id)
+    )
+    if entry is None:
         raise HTTPException(status_code=404, detail="Note not found")
-    if not crud.user.is_superuser(current_user) and (note.user_id != current_user.id):
+    if not crud.user.is_superuser(current_user) and (entry.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return note
+    return cached_response(request, entry)
+
+
+async def read_note_async(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_cache_fill_async_db),
+    id: int,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Get note by ID on the event loop, for ``DB_MODE=async``.
+    """
+    entry = await cached_object_async(
+        crud.note, schemas.Note, id, lambda: crud.note.get_async(db, id)
+    )
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Note not found")
+    if not crud.user.is_superuser(current_user) and (entry.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return cached_response(request, entry)
+
+
+router.add_api_route(
+    "/{id}",
+    read_note_async if settings.DB_MODE == "async" else read_note,
+    methods=["GET"],
+    response_model=schemas.Note,
+    name="read_note",
+)
 
 
 @router.put("/{id}", response_model=schemas.Note)
@@ -2,15 +2,20 @@
 API endpoints for seeding the database with test data.
 """
 
-import json
-from typing import Any
+import shutil
+import tempfile
+from typing import Any, BinaryIO
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app import models
 from app.api import deps
-from app.utils.seed_data import create_seed_data, process_seed_file
+from app.core.config import settings
+from app.services.seed_jobs import seed_jobs
+from app.utils.seed_data import SeedIngestion, create_seed_data
 
 router = APIRouter()
 
@@ -75,19 +80,41 @@ async def seed_from_file(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
     file: UploadFile = File(...),
-) -> dict[str, Any]:
+    chunk_size: int
+    | None = Query(
+        None, ge=1, le=10000, description="Entries inserted per transaction"
+    ),
+    background: bool
+    | None = Query(
+        None, description="Ingest in a background job (default: by file size)"
+    ),
+) -> Any:
     """
     Seed the database with data from an uploaded JSON file.
 
     This endpoint allows you to upload a JSON file containing predefined items and notes.
     All created data will be owned by the authenticated user.
 
+    The file is parsed incrementally and its entries are inserted in chunks,
+    one transaction per chunk. If the file turns out to be invalid part way
+    through, the chunks inserted before the error are kept.
+
+    Files larger than ``SEED_UPLOAD_BACKGROUND_BYTES`` (or any file, with
+    ``background=true``) are ingested by a background job: the response is a
+    202 with the job's ID, and its progress is available at
+    ``GET /seed/jobs/{job_id}``.
+
     ## Permissions
     * Requires superuser privileges
 
     ## Request Body
     * **file**: A JSON file containing items and notes to create
 
+    ## Parameters
+    * **chunk_size**: Entries inserted per transaction
+      (default: ``SEED_UPLOAD_CHUNK_SIZE``)
+    * **background**: Force or prevent a background job
+
     ## File Format
     The uploaded JSON file should have the following structure:
     ```json
@@ -113,6 +140,11 @@ async def seed_from_file(
     * **notes_created**: Total number of notes created
     * **items**: List of created items with their IDs and titles
     * **notes**: List of created notes with their IDs and titles
+    * **items_skipped**, **notes_skipped**: Entries without a title or with
+      invalid fields
+    * **items_failed**, **notes_failed**: Entries of chunks that failed to insert
+    * **chunks**, **errors**, **bytes_read**, **duration_seconds**,
+      **rows_per_second**: Details of the ingestion
 
     ## Example Response
     ```json
@@ -126,7 +158,25 @@ async def seed_from_file(
       "notes": [
         {"id": 4, "title": "Custom Note 1"},
         {"id": 5, "title": "Custom Note 2"}
-      ]
+      ],
+      "items_skipped": 0,
+      "notes_skipped": 0,
+      "items_failed": 0,
+      "notes_failed": 0,
+      "chunks": 2,
+      "errors": [],
+      "bytes_read": 214,
+      "duration_seconds": 0.012,
+      "rows_per_second": 333
+    }
+    ```
+
+    ## Example Background Response
+    ```json
+    {
+      "job_id": "0b7c6f3e9a8d4c2b9e1f5a7d3c6b8e2f",
+      "status": "queued",
+      "status_url": "/api/v1/seed/jobs/0b7c6f3e9a8d4c2b9e1f5a7d3c6b8e2f"
     }
     ```
     """
@@ -137,16 +187,28 @@ async def seed_from_file(
             detail="Only JSON files are supported",
         )
 
-    try:
-        # Read and parse the file
-        contents = await file.read()
-        seed_data = json.loads(contents)
-
-        # Process the seed data
-        result = process_seed_file(db=db, user_id=current_user.id, seed_data=seed_data)
+    if background is None:
+        background = (file.size or 0) > settings.SEED_UPLOAD_BACKGROUND_BYTES
+    if background:
+        # The upload is closed with the request, so the job gets its own copy
+        path = await run_in_threadpool(_spool, file.file)
+        job = seed_jobs.submit(
+            path, file.filename, current_user.id, chunk_size=chunk_size
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": f"{settings.API_V1_STR}/seed/jobs/{job.id}",
+            },
+        )
 
-        return result
-    except json.JSONDecodeError:
+    ingestion = SeedIngestion(db, current_user.id, chunk_size=chunk_size)
+    try:
+        # Parsing and inserting block, so keep them off the event loop
+        return await run_in_threadpool(ingestion.run, file.file)
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid JSON format in the uploaded file",
@@ -161,3 +223,36 @@ async def seed_from_file(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing seed data: {str(e)}",
         )
+
+
+@router.get("/jobs/{job_id}", response_model=dict[str, Any])
+def read_seed_job(
+    job_id: str,
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> dict[str, Any]:
+    """
+    Get the status and progress of a background seed job.
+
+    ## Permissions
+    * Requires superuser privileges
+
+    ## Returns
+    * **status**: ``queued``, ``running``, ``succeeded`` or ``failed``
+    * **progress**: Summary of the ingestion so far, in the format returned by
+      ``POST /seed/upload``, without the lists of created rows
+    * **error**: Why the job failed
+    """
+    job = seed_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Seed job not found")
+    return job.to_dict()
+
+
+def _spool(source: BinaryIO) -> str:
+    """Copy an upload to a temporary file and return its path."""
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(
+        prefix="seed-", suffix=".json", delete=False
+    ) as target:
+        shutil.copyfileobj(source, target)
+    return target.name
@@ -4,36 +4,48 @@ Users endpoints for user management.
 
 from typing import Any
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from fastapi.encoders import jsonable_encoder
 from pydantic import EmailStr
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.pagination import MAX_PAGE_SIZE, keyset_page, use_keyset
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users.
 
+    Without ``skip`` users are paged by ID and the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header.
+
     Args:
+        response: Response, used to set the next cursor header.
         db: Database session.
         skip: Number of users to skip.
         limit: Maximum number of users to return.
+        cursor: Cursor from the previous page.
         current_user: Current user.
 
     Returns:
         List of users.
     """
+    if use_keyset(skip, cursor):
+        return keyset_page(
+            response, lambda: crud.user.get_page(db, cursor=cursor, limit=limit)
+        )
     users = crud.user.get_multi(db, skip=skip, limit=limit)
     return users
 
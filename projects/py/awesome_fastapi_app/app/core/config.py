@@ -33,6 +33,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+
+def _optional_int(name: str) -> int | None:
+    """Read an integer environment variable, or None if it is not set."""
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
 # TODO: Get config from configmap if environment does not exist
 class Settings(BaseSettings):
     """Application settings."""
@@ -52,9 +59,75 @@ class Settings(BaseSettings):
     )
     SECRET_KEY_LIFETIME_DAYS: int = int(os.getenv("SECRET_KEY_LIFETIME_DAYS", "30"))
     SECRET_KEY_TRANSITION_DAYS: int = int(os.getenv("SECRET_KEY_TRANSITION_DAYS", "1"))
+    # How often workers look for keys rotated by their peers
+    SECRET_STORE_POLL_INTERVAL_SECONDS: int = int(
+        os.getenv("SECRET_STORE_POLL_INTERVAL_SECONDS", "5")
+    )
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
 
+    # Password hashing policy. New hashes use PASSWORD_HASH_SCHEME (argon2,
+    # scrypt or bcrypt); hashes of other schemes are upgraded on login. Cost
+    # parameters default to the profile for ENVIRONMENT (see
+    # app.core.password_policy) and can be overridden individually.
+    PASSWORD_HASH_SCHEME: str = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+    PASSWORD_HASH_BCRYPT_ROUNDS: int | None = _optional_int(
+        "PASSWORD_HASH_BCRYPT_ROUNDS"
+    )
+    PASSWORD_HASH_ARGON2_TIME_COST: int | None = _optional_int(
+        "PASSWORD_HASH_ARGON2_TIME_COST"
+    )
+    PASSWORD_HASH_ARGON2_MEMORY_COST: int | None = _optional_int(
+        "PASSWORD_HASH_ARGON2_MEMORY_COST"
+    )
+    PASSWORD_HASH_ARGON2_PARALLELISM: int | None = _optional_int(
+        "PASSWORD_HASH_ARGON2_PARALLELISM"
+    )
+    PASSWORD_HASH_SCRYPT_ROUNDS: int | None = _optional_int(
+        "PASSWORD_HASH_SCRYPT_ROUNDS"
+    )
+
+    # Dedicated worker pool for password hashing
+    PASSWORD_HASH_POOL_SIZE: int = int(os.getenv("PASSWORD_HASH_POOL_SIZE", "4"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+    # Verified-token cache used by deps.get_current_user
+    TOKEN_CACHE_ENABLED: bool = (
+        os.getenv("TOKEN_CACHE_ENABLED", "True").lower() == "true"
+    )
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+
+    # Cache of item and note responses; "memory" (per process) or "redis".
+    # On by default only with redis: with the memory backend, a replica or
+    # worker keeps serving what it cached after another one handled a write
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+    RESPONSE_CACHE_ENABLED: bool = (
+        os.getenv(
+            "RESPONSE_CACHE_ENABLED", str(RESPONSE_CACHE_BACKEND == "redis")
+        ).lower()
+        == "true"
+    )
+    RESPONSE_CACHE_MAX_SIZE: int = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "10000"))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv(
+        "RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0"
+    )
+
+    # Bulk CRUD operations
+    CRUD_BULK_CHUNK_SIZE: int = int(os.getenv("CRUD_BULK_CHUNK_SIZE", "500"))
+    BULK_CREATE_MAX_ITEMS: int = int(os.getenv("BULK_CREATE_MAX_ITEMS", "1000"))
+    # Rows fetched and encoded at a time by the streaming export endpoints
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Seed file uploads; larger files are ingested by a background job
+    SEED_UPLOAD_CHUNK_SIZE: int = int(os.getenv("SEED_UPLOAD_CHUNK_SIZE", "1000"))
+    SEED_UPLOAD_BACKGROUND_BYTES: int = int(
+        os.getenv("SEED_UPLOAD_BACKGROUND_BYTES", str(5 * 1024 * 1024))
+    )
+    SEED_JOB_WORKERS: int = int(os.getenv("SEED_JOB_WORKERS", "1"))
+    SEED_JOB_HISTORY: int = int(os.getenv("SEED_JOB_HISTORY", "100"))
+
     # CORS settings
     BACKEND_CORS_ORIGINS: list[AnyHttpUrl] = []
 
@@ -93,6 +166,32 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "app")
     SQLALCHEMY_DATABASE_URI: PostgresDsn | None = None
+    # "sync" serves migrated endpoints from the threadpool with Session;
+    # "async" serves them from the event loop with AsyncSession (asyncpg)
+    DB_MODE: str = os.getenv("DB_MODE", "sync").lower()
+
+    # Connection pool, per engine and per process
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: int = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    # Server-side limit for each statement, 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    # Connecting through PgBouncer in transaction pooling mode
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "False").lower() == "true"
+    # Log every SQL statement (noisy, for local debugging only)
+    DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
+    # Connections opened at startup, before the app reports ready
+    DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", "2"))
+    # Fail startup instead of logging a warning when the warm-up fails
+    DB_WARMUP_REQUIRED: bool = (
+        os.getenv("DB_WARMUP_REQUIRED", "False").lower() == "true"
+    )
+    # Comma-separated URLs of read replicas; reads use the primary if empty
+    DB_REPLICA_URLS: str = os.getenv("DB_REPLICA_URLS", "")
+    # How long a replica that failed to connect is skipped before a retry
+    DB_REPLICA_RETRY_SECONDS: int = int(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
 
     # Define validator based on Pydantic version
     if IS_PYDANTIC_V2:
@@ -234,6 +333,15 @@ class Settings(BaseSettings):
     # Google Cloud PubSub settings
     GCP_PROJECT_ID: str = os.getenv("GCP_PROJECT_ID", "")
     PUBSUB_EMULATOR_HOST: str | None = os.getenv("PUBSUB_EMULATOR_HOST")
+    # "grpc" for Google Cloud or the emulator, "fake" for the in-process broker
+    PUBSUB_TRANSPORT: str = os.getenv("PUBSUB_TRANSPORT", "grpc")
+    # Create topics and subscriptions at startup instead of on first use
+    PUBSUB_PROVISION_ON_STARTUP: bool = (
+        os.getenv("PUBSUB_PROVISION_ON_STARTUP", "True").lower() == "true"
+    )
+    PUBSUB_PROVISION_TIMEOUT_SECONDS: float = float(
+        os.getenv("PUBSUB_PROVISION_TIMEOUT_SECONDS", "10")
+    )
 
     # Topic and subscription names
     PUBSUB_TOPIC_EXAMPLE: str = os.getenv("PUBSUB_TOPIC_EXAMPLE", "example-topic")
@@ -241,6 +349,80 @@ class Settings(BaseSettings):
         "PUBSUB_SUBSCRIPTION_EXAMPLE", "example-subscription"
     )
 
+    # Client-side batching of published messages
+    PUBSUB_BATCH_MAX_MESSAGES: int = int(os.getenv("PUBSUB_BATCH_MAX_MESSAGES", "100"))
+    PUBSUB_BATCH_MAX_BYTES: int = int(os.getenv("PUBSUB_BATCH_MAX_BYTES", "1000000"))
+    PUBSUB_BATCH_MAX_LATENCY_SECONDS: float = float(
+        os.getenv("PUBSUB_BATCH_MAX_LATENCY_SECONDS", "0.05")
+    )
+    # Messages awaiting a publish result; beyond this new messages are dropped
+    PUBSUB_OUTBOX_MAX_MESSAGES: int = int(
+        os.getenv("PUBSUB_OUTBOX_MAX_MESSAGES", "10000")
+    )
+    PUBSUB_OUTBOX_MAX_BYTES: int = int(
+        os.getenv("PUBSUB_OUTBOX_MAX_BYTES", str(10 * 1024 * 1024))
+    )
+    PUBSUB_PUBLISH_TIMEOUT_SECONDS: float = float(
+        os.getenv("PUBSUB_PUBLISH_TIMEOUT_SECONDS", "30")
+    )
+    # Time allowed for outstanding messages to be sent on shutdown
+    PUBSUB_FLUSH_TIMEOUT_SECONDS: float = float(
+        os.getenv("PUBSUB_FLUSH_TIMEOUT_SECONDS", "10")
+    )
+    # Publish messages with the same ordering key in order
+    PUBSUB_ENABLE_MESSAGE_ORDERING: bool = (
+        os.getenv("PUBSUB_ENABLE_MESSAGE_ORDERING", "True").lower() == "true"
+    )
+    PUBSUB_TOPIC_ITEM_EVENTS: str = os.getenv("PUBSUB_TOPIC_ITEM_EVENTS", "example")
+    # Codec of published payloads, by content type (see app/pubsub/codecs.py)
+    PUBSUB_CONTENT_TYPE: str = os.getenv("PUBSUB_CONTENT_TYPE", "application/json")
+    PUBSUB_ITEM_EVENTS_CONTENT_TYPE: str = os.getenv(
+        "PUBSUB_ITEM_EVENTS_CONTENT_TYPE",
+        os.getenv("PUBSUB_CONTENT_TYPE", "application/json"),
+    )
+
+    # Transactional outbox for item events, relayed to Pub/Sub by a worker;
+    # enabled by default when Pub/Sub is configured
+    OUTBOX_ENABLED: bool = (
+        os.getenv("OUTBOX_ENABLED", str(bool(os.getenv("GCP_PROJECT_ID")))).lower()
+        == "true"
+    )
+    OUTBOX_RELAY_BATCH_SIZE: int = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", "100"))
+    OUTBOX_RELAY_POLL_SECONDS: float = float(
+        os.getenv("OUTBOX_RELAY_POLL_SECONDS", "1")
+    )
+    OUTBOX_RETRY_BASE_SECONDS: float = float(
+        os.getenv("OUTBOX_RETRY_BASE_SECONDS", "1")
+    )
+    OUTBOX_RETRY_MAX_SECONDS: float = float(
+        os.getenv("OUTBOX_RETRY_MAX_SECONDS", "300")
+    )
+
+    # Subscriber flow control: messages leased but not yet acked
+    PUBSUB_SUBSCRIBER_MAX_MESSAGES: int = int(
+        os.getenv("PUBSUB_SUBSCRIBER_MAX_MESSAGES", "1000")
+    )
+    PUBSUB_SUBSCRIBER_MAX_BYTES: int = int(
+        os.getenv("PUBSUB_SUBSCRIBER_MAX_BYTES", str(100 * 1024 * 1024))
+    )
+    PUBSUB_SUBSCRIBER_MAX_LEASE_SECONDS: int = int(
+        os.getenv("PUBSUB_SUBSCRIBER_MAX_LEASE_SECONDS", "3600")
+    )
+    # Subscriber batching, worker threads and dead-lettering
+    PUBSUB_SUBSCRIBER_WORKERS: int = int(os.getenv("PUBSUB_SUBSCRIBER_WORKERS", "4"))
+    PUBSUB_SUBSCRIBER_BATCH_SIZE: int = int(
+        os.getenv("PUBSUB_SUBSCRIBER_BATCH_SIZE", "100")
+    )
+    PUBSUB_SUBSCRIBER_BATCH_MAX_WAIT_SECONDS: float = float(
+        os.getenv("PUBSUB_SUBSCRIBER_BATCH_MAX_WAIT_SECONDS", "0.1")
+    )
+    PUBSUB_SUBSCRIBER_MAX_DELIVERY_ATTEMPTS: int = int(
+        os.getenv("PUBSUB_SUBSCRIBER_MAX_DELIVERY_ATTEMPTS", "5")
+    )
+    PUBSUB_DEAD_LETTER_TOPIC_SUFFIX: str = os.getenv(
+        "PUBSUB_DEAD_LETTER_TOPIC_SUFFIX", "-dead-letter"
+    )
+
     # Authentication
     FIRST_SUPERUSER: EmailStr = os.getenv("FIRST_SUPERUSER", "admin@example.com")
     FIRST_SUPERUSER_PASSWORD: str = os.getenv("FIRST_SUPERUSER_PASSWORD", "admin")
@@ -251,10 +433,64 @@ class Settings(BaseSettings):
     # Environment name
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
 
+    # Logging; LOG_FORMAT is "text" or "json". Records are written by a
+    # background thread unless LOG_QUEUE_ENABLED is false
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    LOG_QUEUE_ENABLED: bool = os.getenv("LOG_QUEUE_ENABLED", "True").lower() == "true"
+    # Per-logger levels, e.g. "sqlalchemy.engine=WARNING,app.access=INFO"
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    # Share of each logger's records below WARNING that is kept,
+    # e.g. "app.utils.seed_data=0.01"
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+
+    # Access log of HTTP requests; server errors bypass sampling and the cap
+    REQUEST_LOG_ENABLED: bool = (
+        os.getenv("REQUEST_LOG_ENABLED", "True").lower() == "true"
+    )
+    REQUEST_LOG_SAMPLE_RATE: float = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+    # Records per second and process, 0 for no limit
+    REQUEST_LOG_MAX_PER_SECOND: int = int(
+        os.getenv("REQUEST_LOG_MAX_PER_SECOND", "100")
+    )
+
     # OpenTelemetry settings
     ENABLE_TELEMETRY: bool = os.getenv("ENABLE_TELEMETRY", "True").lower() == "true"
     OTLP_EXPORTER_ENDPOINT: str | None = os.getenv("OTLP_EXPORTER_ENDPOINT")
     OTLP_SERVICE_NAME: str | None = os.getenv("OTLP_SERVICE_NAME")
+    # Share of new traces recorded; child spans follow their parent
+    OTEL_TRACES_SAMPLE_RATE: float = float(os.getenv("OTEL_TRACES_SAMPLE_RATE", "1.0"))
+    # Export only slow or failed traces, plus a share of the others
+    OTEL_TAIL_SAMPLING_ENABLED: bool = (
+        os.getenv("OTEL_TAIL_SAMPLING_ENABLED", "False").lower() == "true"
+    )
+    OTEL_TAIL_SAMPLING_LATENCY_MS: float = float(
+        os.getenv("OTEL_TAIL_SAMPLING_LATENCY_MS", "500")
+    )
+    OTEL_TAIL_SAMPLING_KEEP_RATE: float = float(
+        os.getenv("OTEL_TAIL_SAMPLING_KEEP_RATE", "0.05")
+    )
+    # Batching of exported spans; spans beyond the queue size are dropped
+    OTEL_BSP_MAX_QUEUE_SIZE: int = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "2048"))
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE: int = int(
+        os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512")
+    )
+    OTEL_BSP_SCHEDULE_DELAY_MS: int = int(
+        os.getenv("OTEL_BSP_SCHEDULE_DELAY_MS", "5000")
+    )
+    OTEL_BSP_EXPORT_TIMEOUT_MS: int = int(
+        os.getenv("OTEL_BSP_EXPORT_TIMEOUT_MS", "30000")
+    )
+    # Print spans to the console; only used when ENVIRONMENT is development
+    OTEL_CONSOLE_EXPORTER: bool = (
+        os.getenv("OTEL_CONSOLE_EXPORTER", "True").lower() == "true"
+    )
+    # Comma-separated URL patterns not traced, e.g. probes and scrapes
+    OTEL_EXCLUDED_URLS: str = os.getenv("OTEL_EXCLUDED_URLS", "/health,/metrics")
+    # A span per SQL statement; disable to trace requests only
+    OTEL_SQLALCHEMY_ENABLED: bool = (
+        os.getenv("OTEL_SQLALCHEMY_ENABLED", "True").lower() == "true"
+    )
 
     # Server settings
     PORT: int = int(os.getenv("PORT", "8000"))
@@ -0,0 +1,167 @@
+"""
+Bounded worker pool for password hashing.
+
+Password hashing is deliberately slow. Running it on the same threadpool as
+every other sync endpoint lets a burst of logins occupy all threads, so this
+module gives hashing its own small executor. The number of operations that may
+wait for a worker is capped: once the pool is saturated new work is rejected
+with ``PasswordHashingOverloaded`` (surfaced to clients as HTTP 429) instead of
+piling up.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordHashingOverloaded(Exception):
+    """Raised when the password hashing pool cannot accept more work."""
+
+
+class PasswordHashPool:
+    """Size-limited executor for password hashing with queue-depth metrics."""
+
+    def __init__(self, max_workers: int | None = None, max_queue: int | None = None):
+        """
+        Initialize the pool. Threads are only started on first use.
+
+        Args:
+            max_workers: Number of hashing threads.
+            max_queue: Number of operations allowed to wait for a free thread.
+        """
+        self.max_workers = (
+            max_workers if max_workers is not None else settings.PASSWORD_HASH_POOL_SIZE
+        )
+        self.max_queue = (
+            max_queue if max_queue is not None else settings.PASSWORD_HASH_MAX_QUEUE
+        )
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._busy_seconds = 0.0
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        """
+        Schedule a hashing operation.
+
+        Args:
+            fn: Function to run.
+            *args: Arguments for the function.
+
+        Returns:
+            Future holding the function's result.
+
+        Raises:
+            PasswordHashingOverloaded: If the pool is saturated.
+        """
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHashingOverloaded(
+                    f"{self.pending} password hashing operations pending"
+                )
+            self.pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+            executor = self._executor
+
+        try:
+            return executor.submit(self._run, fn, *args)
+        except RuntimeError:
+            with self._lock:
+                self.pending -= 1
+            raise
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a hashing operation on the pool and wait for its result.
+
+        Args:
+            fn: Function to run.
+            *args: Arguments for the function.
+
+        Returns:
+            The function's result.
+        """
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a hashing operation on the pool without blocking the event loop.
+
+        Args:
+            fn: Function to run.
+            *args: Arguments for the function.
+
+        Returns:
+            The function's result.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a function on a pool thread, keeping the counters up to date."""
+        with self._lock:
+            self.running += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.running -= 1
+                self.pending -= 1
+                self.completed += 1
+                self._busy_seconds += elapsed
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dictionary with queue depth, capacity and throughput counters.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.pending - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_seconds": (
+                    self._busy_seconds / self.completed if self.completed else 0.0
+                ),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the pool's threads.
+
+        Args:
+            wait: Whether to wait for pending operations to finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Create a singleton instance for global use
+password_hash_pool = PasswordHashPool()
@@ -0,0 +1,223 @@
+"""
+Password hashing policy.
+
+Builds the passlib ``CryptContext`` used by ``app.core.security``. The policy
+names one scheme for new hashes (argon2id, scrypt or bcrypt) and keeps the
+others verifiable but deprecated. ``verify_and_upgrade`` rehashes a password
+on a successful login only if that makes its hash stronger: a hash is moved
+to a more preferred scheme or to higher cost parameters, never to a weaker
+scheme or lower costs. Hashes created under a stronger policy, e.g. the
+production profile or the 12 bcrypt rounds used before this policy existed,
+stay as they are when checked by a development deployment.
+
+Cost parameters come from a per-environment profile and can be overridden
+individually through ``Settings``. Use ``python -m app.utils.hash_benchmark``
+to measure verify latency for each scheme before changing them.
+"""
+
+import logging
+from typing import Any
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Schemes the policy can use, most preferred first
+SUPPORTED_SCHEMES = ("argon2", "scrypt", "bcrypt")
+
+# Cost parameters per environment. Production follows current OWASP guidance;
+# development and test trade strength for fast logins and test runs.
+HASH_PROFILES: dict[str, dict[str, dict[str, int]]] = {
+    "production": {
+        "argon2": {"time_cost": 3, "memory_cost": 65536, "parallelism": 4},
+        "scrypt": {"rounds": 16, "block_size": 8, "parallelism": 1},
+        "bcrypt": {"rounds": 12},
+    },
+    "development": {
+        "argon2": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+        "scrypt": {"rounds": 14, "block_size": 8, "parallelism": 1},
+        "bcrypt": {"rounds": 10},
+    },
+    "test": {
+        "argon2": {"time_cost": 1, "memory_cost": 8192, "parallelism": 1},
+        "scrypt": {"rounds": 10, "block_size": 8, "parallelism": 1},
+        "bcrypt": {"rounds": 4},
+    },
+}
+
+
+def scheme_available(scheme: str) -> bool:
+    """
+    Check whether a hashing scheme has a usable backend.
+
+    argon2 needs the optional ``argon2-cffi`` package.
+
+    Args:
+        scheme: passlib scheme name.
+
+    Returns:
+        True if hashes of this scheme can be created and verified.
+    """
+    from passlib.registry import get_crypt_handler
+
+    try:
+        handler = get_crypt_handler(scheme)
+    except KeyError:
+        return False
+    has_backend = getattr(handler, "has_backend", None)
+    return has_backend() if has_backend else True
+
+
+def get_scheme_parameters(
+    scheme: str, environment: str | None = None
+) -> dict[str, int]:
+    """
+    Get the cost parameters for a scheme.
+
+    Args:
+        scheme: passlib scheme name.
+        environment: Environment whose profile to use; defaults to
+            ``settings.ENVIRONMENT``. Unknown environments use production.
+
+    Returns:
+        Mapping of passlib parameter name to value.
+    """
+    environment = environment or settings.ENVIRONMENT
+    profile = HASH_PROFILES.get(environment, HASH_PROFILES["production"])
+    params = dict(profile[scheme])
+
+    overrides = {
+        "argon2": {
+            "time_cost": settings.PASSWORD_HASH_ARGON2_TIME_COST,
+            "memory_cost": settings.PASSWORD_HASH_ARGON2_MEMORY_COST,
+            "parallelism": settings.PASSWORD_HASH_ARGON2_PARALLELISM,
+        },
+        "scrypt": {"rounds": settings.PASSWORD_HASH_SCRYPT_ROUNDS},
+        "bcrypt": {"rounds": settings.PASSWORD_HASH_BCRYPT_ROUNDS},
+    }
+    for name, value in overrides[scheme].items():
+        if value is not None:
+            params[name] = value
+    return params
+
+
+def build_password_context(
+    scheme: str | None = None, environment: str | None = None
+) -> CryptContext:
+    """
+    Build the password hashing context for the configured policy.
+
+    Args:
+        scheme: Scheme for new hashes; defaults to
+            ``settings.PASSWORD_HASH_SCHEME``. Falls back to bcrypt if the
+            scheme's backend is not installed.
+        environment: Environment whose cost profile to use.
+
+    Returns:
+        CryptContext that hashes with ``scheme`` and marks every other
+        supported scheme as deprecated.
+    """
+    scheme = scheme or settings.PASSWORD_HASH_SCHEME
+    if scheme not in SUPPORTED_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    if not scheme_available(scheme):
+        logger.warning(
+            f"No backend for password hash scheme {scheme} (for argon2, install "
+            f"argon2-cffi); hashing new passwords with bcrypt instead"
+        )
+        scheme = "bcrypt"
+
+    schemes = [scheme]
+    for other in SUPPORTED_SCHEMES:
+        if other == scheme:
+            continue
+        if scheme_available(other):
+            schemes.append(other)
+        else:
+            logger.warning(
+                f"No backend for password hash scheme {other}; passwords "
+                f"stored with it cannot be verified"
+            )
+
+    context_kwargs: dict[str, Any] = {}
+    for name in schemes:
+        for param, value in get_scheme_parameters(name, environment).items():
+            context_kwargs[f"{name}__{param}"] = value
+
+    return CryptContext(
+        schemes=schemes, default=scheme, deprecated="auto", **context_kwargs
+    )
+
+
+def _cost(scheme: str, source: Any, rounds_attribute: str) -> dict[str, int]:
+    """
+    Get the parameters that make a hash of a scheme expensive to compute.
+
+    Args:
+        scheme: passlib scheme name.
+        source: Parsed hash or configured handler.
+        rounds_attribute: Attribute holding the rounds (time cost) of
+            ``source``.
+
+    Returns:
+        Mapping of parameter name to value; higher is stronger.
+    """
+    cost = {"rounds": getattr(source, rounds_attribute)}
+    if scheme == "argon2":
+        cost["memory_cost"] = source.memory_cost
+    elif scheme == "scrypt":
+        cost["block_size"] = source.block_size
+    return cost
+
+
+def is_upgrade(context: CryptContext, hashed_password: str) -> bool:
+    """
+    Check whether rehashing under a context makes a hash stronger.
+
+    Args:
+        context: Password hashing context.
+        hashed_password: Stored hash of a scheme known to the context.
+
+    Returns:
+        True if the context's default scheme is preferred over the hash's
+        scheme, or if it is the same scheme and the context's costs are at
+        least the hash's and higher in one parameter.
+    """
+    scheme = context.identify(hashed_password)
+    target = context.default_scheme()
+    if scheme != target:
+        return SUPPORTED_SCHEMES.index(target) < SUPPORTED_SCHEMES.index(scheme)
+
+    handler = context.handler(scheme)
+    current = _cost(scheme, handler.from_string(hashed_password), "rounds")
+    wanted = _cost(scheme, handler, "default_rounds")
+    return wanted != current and all(wanted[name] >= current[name] for name in wanted)
+
+
+def verify_and_upgrade(
+    context: CryptContext, plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password and rehash it if that strengthens the stored hash.
+
+    Unlike ``CryptContext.verify_and_update``, a hash is never replaced by
+    one with a less preferred scheme or lower costs.
+
+    Args:
+        context: Password hashing context.
+        plain_password: Plain password.
+        hashed_password: Stored hash.
+
+    Returns:
+        Tuple of whether the password matches and a replacement hash, or
+        None if the stored hash should be kept.
+    """
+    if not context.verify(plain_password, hashed_password):
+        return False, None
+    if not context.needs_update(hashed_password) or not is_upgrade(
+        context, hashed_password
+    ):
+        return True, None
+    return True, context.hash(plain_password)
@@ -0,0 +1,142 @@
+"""
+Access logging of HTTP requests.
+
+``AccessLogMiddleware`` is a plain ASGI middleware: it watches the response
+start message for the status code instead of wrapping the request in
+``BaseHTTPMiddleware``, which runs every request through an extra task and
+a memory stream. Each request produces at most one record on the
+``app.access`` logger, with the method, route template, status and duration
+both in the message and as record attributes.
+
+Records are sampled by ``REQUEST_LOG_SAMPLE_RATE`` and capped at
+``REQUEST_LOG_MAX_PER_SECOND``; server errors are always logged. Like other
+records, they are written by the listener thread of the logging pipeline
+(see ``libs.py.logging_config``), so slow output never blocks the event
+loop.
+"""
+
+import logging
+import random
+import time
+from typing import Any
+
+from app.core.config import settings
+
+ACCESS_LOGGER_NAME = "app.access"
+
+# Logged as the route of requests that matched no route, e.g. 404s
+UNMATCHED_ROUTE = "<unmatched>"
+
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware logging one record per sampled HTTP request.
+
+    Attributes:
+        sample_rate: Fraction of non-error requests that are logged.
+        max_per_second: Records allowed per second, 0 for no limit.
+        suppressed: Sampled records dropped by the rate cap, reported with
+            the next record that is logged.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        sample_rate: float | None = None,
+        max_per_second: int | None = None,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap.
+            sample_rate: Defaults to ``settings.REQUEST_LOG_SAMPLE_RATE``.
+            max_per_second: Defaults to ``settings.REQUEST_LOG_MAX_PER_SECOND``.
+        """
+        self.app = app
+        self.sample_rate = (
+            sample_rate if sample_rate is not None else settings.REQUEST_LOG_SAMPLE_RATE
+        )
+        self.max_per_second = (
+            max_per_second
+            if max_per_second is not None
+            else settings.REQUEST_LOG_MAX_PER_SECOND
+        )
+        self.suppressed = 0
+        self._window = 0
+        self._logged_in_window = 0
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        """Serve a request and log it once the app is done with it."""
+        if scope["type"] != "http" or not access_logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if self._should_log(status_code):
+                self._log(scope, status_code, time.perf_counter() - started)
+
+    def _should_log(self, status_code: int) -> bool:
+        """
+        Decide whether a request is logged.
+
+        Args:
+            status_code: Response status of the request.
+
+        Returns:
+            True for server errors and for sampled requests within the cap.
+        """
+        if status_code >= 500:
+            return True
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return False
+        if self.max_per_second <= 0:
+            return True
+        window = int(time.monotonic())
+        if window != self._window:
+            self._window = window
+            self._logged_in_window = 0
+        if self._logged_in_window >= self.max_per_second:
+            self.suppressed += 1
+            return False
+        self._logged_in_window += 1
+        return True
+
+    def _log(self, scope: dict, status_code: int, duration: float) -> None:
+        """
+        Write the access record of a request.
+
+        Args:
+            scope: ASGI scope of the request.
+            status_code: Response status.
+            duration: Seconds the app took to respond.
+        """
+        route = scope.get("route")
+        route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+        duration_ms = round(duration * 1000, 3)
+        suppressed, self.suppressed = self.suppressed, 0
+        level = logging.ERROR if status_code >= 500 else logging.INFO
+        access_logger.log(
+            level,
+            f"{scope['method']} {route_path} {status_code} {duration_ms}ms",
+            extra={
+                "http_method": scope["method"],
+                "http_route": route_path,
+                "http_status": status_code,
+                "duration_ms": duration_ms,
+                "suppressed": suppressed,
+            },
+        )
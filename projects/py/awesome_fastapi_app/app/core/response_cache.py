@@ -0,0 +1,441 @@
+"""
+Cache of serialized item and note responses.
+
+Single rows are cached under ``(namespace, id)`` and keyset list pages under
+``(namespace, owner_id, cursor, limit)``. Entries hold the JSON body exactly
+as it is sent, together with its ETag, so a hit skips both the query and the
+serialization, and clients revalidating with ``If-None-Match`` get a 304.
+
+CRUD writes invalidate the cache after they commit. Keys embed generation
+counters, which a write bumps so that the old entries are never read again.
+A row's key includes the counter of its stripe: IDs are hashed onto a fixed
+number of counters, so their count stays bounded at the price of retiring a
+few unrelated rows with each write. A list page's key (pages cannot be
+enumerated, there is one per cursor) includes the counter of its owner,
+bumped for each affected owner together with the counter of the
+namespace-wide listing used by superusers. Writes that do not know the
+owners (bulk updates and removals by ID) bump a namespace generation that
+every page key includes.
+
+A miss reads the key before loading the row or page and fills that key. If
+a write commits in between, the fill lands under the retired generation, so
+a stale response is never served.
+
+The in-process LRU backend is the default, but the cache is then off unless
+``RESPONSE_CACHE_ENABLED`` is set: with several workers or replicas each has
+its own copy, so a write handled by one only reaches the others through the
+TTL. ``RESPONSE_CACHE_BACKEND=redis`` shares one cache between them and
+turns it on.
+
+Misses are filled from the primary database (see
+``app.api.deps.get_cache_fill_db``). A replica that lags behind a write
+would otherwise put the old row back into the cache right after the write
+invalidated it, where it would stay for the TTL.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Number of generation counters the rows of a namespace are hashed onto
+OBJECT_GENERATION_STRIPES = 1024
+
+
+class CachedResponse:
+    """
+    A serialized response body and what is needed to serve it again.
+
+    Attributes:
+        body: JSON body.
+        etag: Strong ETag of the body, including quotes.
+        owner_id: Owner of the cached row, for permission checks on a hit.
+        next_cursor: Cursor of the next page, for cached list pages.
+    """
+
+    __slots__ = ("body", "etag", "owner_id", "next_cursor")
+
+    def __init__(
+        self,
+        body: bytes,
+        owner_id: int | None = None,
+        next_cursor: str | None = None,
+        etag: str | None = None,
+    ):
+        """
+        Initialize the entry.
+
+        Args:
+            body: JSON body.
+            owner_id: Owner of the cached row.
+            next_cursor: Cursor of the next page.
+            etag: ETag of the body; computed from the body if not given.
+        """
+        self.body = body
+        self.owner_id = owner_id
+        self.next_cursor = next_cursor
+        self.etag = etag or f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+    def encode(self) -> bytes:
+        """
+        Encode the entry for a bytes-only backend.
+
+        Returns:
+            A JSON header line followed by the body.
+        """
+        header = {"e": self.etag, "o": self.owner_id, "c": self.next_cursor}
+        return json.dumps(header).encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResponse":
+        """
+        Decode an entry written by ``encode``.
+
+        Args:
+            data: Encoded entry.
+
+        Returns:
+            The entry.
+        """
+        header, _, body = data.partition(b"\n")
+        values = json.loads(header)
+        return cls(
+            body, owner_id=values["o"], next_cursor=values["c"], etag=values["e"]
+        )
+
+
+class LRUBackend:
+    """In-process, bounded LRU store with per-entry expiry."""
+
+    def __init__(self, max_size: int):
+        """
+        Initialize the store.
+
+        Args:
+            max_size: Maximum number of entries.
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        # Generations are kept apart from the entries: evicting one would
+        # reset it and make pages of an earlier generation reachable again.
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Get an entry, or None if it is missing or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        """Store an entry for ``ttl`` seconds, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def generations(self, keys: list[str]) -> list[int]:
+        """Get generation counters, 0 for counters never bumped."""
+        with self._lock:
+            return [self._generations.get(key, 0) for key in keys]
+
+    def bump(self, keys: Iterable[str]) -> None:
+        """Increment generation counters."""
+        with self._lock:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def size(self) -> int:
+        """Get the number of entries."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Delete every entry and counter."""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+class RedisBackend:
+    """Store shared by all workers, in Redis."""
+
+    def __init__(self, url: str, prefix: str = "response-cache:"):
+        """
+        Initialize the store. The connection is opened on first use.
+
+        Args:
+            url: Redis URL.
+            prefix: Prefix of every key written.
+
+        Raises:
+            RuntimeError: If the redis package is not installed.
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the redis package"
+            ) from e
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Get an entry, or None if it is missing or expired."""
+        data = self._client.get(self.prefix + key)
+        return CachedResponse.decode(data) if data is not None else None
+
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        """Store an entry for ``ttl`` seconds."""
+        self._client.set(self.prefix + key, entry.encode(), px=int(ttl * 1000))
+
+    def generations(self, keys: list[str]) -> list[int]:
+        """Get generation counters in one round trip."""
+        values = self._client.mget([self.prefix + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def bump(self, keys: Iterable[str]) -> None:
+        """Increment generation counters in one round trip."""
+        pipeline = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.incr(self.prefix + key)
+        pipeline.execute()
+
+    def size(self) -> int | None:
+        """Entries are not counted in Redis."""
+        return None
+
+    def clear(self) -> None:
+        """Delete every key under the prefix."""
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+class ResponseCache:
+    """Response cache with owner-scoped invalidation, see the module docstring."""
+
+    def __init__(
+        self,
+        backend: LRUBackend | RedisBackend | None = None,
+        ttl_seconds: float | None = None,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Store for the entries; defaults to an in-process LRU of
+                ``RESPONSE_CACHE_MAX_SIZE`` entries.
+            ttl_seconds: Lifetime of an entry.
+            enabled: Whether caching is enabled.
+        """
+        self.enabled = enabled
+        self.backend = backend or LRUBackend(settings.RESPONSE_CACHE_MAX_SIZE)
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.RESPONSE_CACHE_TTL_SECONDS
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+
+    def object_key(self, namespace: str, id: Any) -> str | None:
+        """
+        Get the key of a single row at its current generation.
+
+        Args:
+            namespace: Cache namespace of the model, e.g. ``items``.
+            id: ID of the row.
+
+        Returns:
+            Cache key, or None if the generation could not be read, in which
+            case the row must not be cached.
+        """
+        if not self.enabled:
+            return None
+        try:
+            (generation,) = self.backend.generations(
+                [self._object_generation(namespace, id)]
+            )
+        except Exception as e:
+            self._record_error(e)
+            return None
+        return f"{namespace}:id:{id}:{generation}"
+
+    @staticmethod
+    def _object_generation(namespace: str, id: Any) -> str:
+        """Get the generation counter of a row's stripe."""
+        stripe = zlib.crc32(str(id).encode()) % OBJECT_GENERATION_STRIPES
+        return f"{namespace}:gen:id:{stripe}"
+
+    def page_key(
+        self, namespace: str, *, owner_id: int | None, cursor: str | None, limit: int
+    ) -> str | None:
+        """
+        Get the key of a list page at the current generations.
+
+        Args:
+            namespace: Cache namespace of the model.
+            owner_id: Owner the list is filtered to, or None for all rows.
+            cursor: Cursor of the page, or None for the first page.
+            limit: Page size.
+
+        Returns:
+            Cache key, or None if the generations could not be read, in which
+            case the page must not be cached.
+        """
+        if not self.enabled:
+            return None
+        scope = "all" if owner_id is None else f"owner:{owner_id}"
+        try:
+            namespace_gen, scope_gen = self.backend.generations(
+                [f"{namespace}:gen", f"{namespace}:gen:{scope}"]
+            )
+        except Exception as e:
+            self._record_error(e)
+            return None
+        return f"{namespace}:page:{namespace_gen}:{scope}:{scope_gen}:{cursor}:{limit}"
+
+    def get(self, key: str | None) -> CachedResponse | None:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key; None always misses.
+
+        Returns:
+            The entry, or None on a miss.
+        """
+        if not self.enabled or key is None:
+            return None
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            self._record_error(e)
+            return None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, key: str | None, entry: CachedResponse) -> CachedResponse:
+        """
+        Store an entry.
+
+        Args:
+            key: Cache key; with None nothing is stored.
+            entry: Entry to store.
+
+        Returns:
+            The entry, for chaining.
+        """
+        if self.enabled and key is not None and self.ttl_seconds > 0:
+            try:
+                self.backend.set(key, entry, self.ttl_seconds)
+            except Exception as e:
+                self._record_error(e)
+        return entry
+
+    def invalidate(
+        self,
+        namespace: str,
+        *,
+        ids: Iterable[Any] = (),
+        owner_ids: Iterable[int | None] | None = (),
+    ) -> None:
+        """
+        Invalidate the entries affected by a write.
+
+        Args:
+            namespace: Cache namespace of the model.
+            ids: IDs of the written rows.
+            owner_ids: Owners of the written rows, or None if they are not
+                known, which invalidates every list page of the namespace.
+        """
+        if not self.enabled:
+            return
+        generations = list({self._object_generation(namespace, id) for id in ids})
+        if owner_ids is None:
+            generations.append(f"{namespace}:gen")
+        else:
+            generations += [f"{namespace}:gen:all"] + [
+                f"{namespace}:gen:owner:{owner_id}"
+                for owner_id in set(owner_ids)
+                if owner_id is not None
+            ]
+        try:
+            self.backend.bump(generations)
+        except Exception as e:
+            self._record_error(e)
+            return
+        with self._lock:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        try:
+            self.backend.clear()
+        except Exception as e:
+            self._record_error(e)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with size and hit/miss counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "backend": type(self.backend).__name__,
+                "size": self.backend.size(),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+    def _record_error(self, error: Exception) -> None:
+        """Count a backend error; the cache degrades to a miss instead of failing."""
+        with self._lock:
+            self.errors += 1
+        logger.warning(f"Response cache backend error: {error}")
+
+
+def _create_backend() -> LRUBackend | RedisBackend:
+    """Create the backend selected by ``RESPONSE_CACHE_BACKEND``."""
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    return LRUBackend(settings.RESPONSE_CACHE_MAX_SIZE)
+
+
+# Create a singleton instance for global use
+response_cache = ResponseCache(
+    backend=_create_backend(), enabled=settings.RESPONSE_CACHE_ENABLED
+)
@@ -4,17 +4,26 @@ Secret Rotation Mechanism.
 This module handles the rotation of application secrets to enhance security.
 It implements a key rotation strategy where multiple keys can be active simultaneously
 during a transition period, allowing for smooth rotation without service disruption.
+
+Secrets are persisted through a ``SecretStore`` shared by all worker processes;
+every change is a locked read-modify-write, so concurrent workers never rotate
+the same key twice or overwrite each other's keys.
 """
 
-import json
+import copy
+import hashlib
 import logging
 import os
 import secrets
+import tempfile
+import threading
 import time
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from typing import Any
 
 from app.core.config import settings
+from app.core.secret_store import FileSecretStore, SecretStore, SecretStoreError
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +31,100 @@ logger = logging.getLogger(__name__)
 JWT_KEY_TYPE = "jwt"
 DB_CREDENTIAL_TYPE = "db_credential"
 
+# Key entries store naive UTC timestamps
+_EPOCH = datetime(1970, 1, 1)
+
+
+def jwt_key_id(key: str) -> str:
+    """
+    Derive the key ID (``kid``) for a JWT signing key.
+
+    The ID is derived from the key itself so that every worker computes the
+    same ``kid`` for a key, including keys that predate key IDs.
+
+    Args:
+        key: JWT signing key.
+
+    Returns:
+        Short hexadecimal key ID.
+    """
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+class JWTKeyring:
+    """
+    Index of JWT verification keys by key ID.
+
+    The keyring is immutable and rebuilt only when the set of keys changes,
+    so looking up a key on the request path is a dictionary access plus one
+    timestamp comparison.
+
+    Attributes:
+        current_kid: Key ID of the key used to sign new tokens.
+        current_key: Key used to sign new tokens.
+        rotate_at: Unix timestamp at which the keyring must be re-evaluated,
+            either because the current key expires or because an old key
+            leaves its transition period.
+    """
+
+    def __init__(
+        self,
+        entries: list[tuple[str, float | None]],
+        rotate_at: float = float("inf"),
+    ):
+        """
+        Build the keyring.
+
+        Args:
+            entries: ``(key, valid_until)`` pairs, newest first. ``valid_until``
+                is a Unix timestamp after which the key is no longer accepted,
+                or None if the key never expires.
+            rotate_at: Unix timestamp of the next rotation deadline.
+        """
+        self.rotate_at = rotate_at
+        self._keys: dict[str, tuple[str, float | None]] = {}
+        for key, valid_until in entries:
+            self._keys.setdefault(jwt_key_id(key), (key, valid_until))
+
+        self.current_key = entries[0][0] if entries else None
+        self.current_kid = jwt_key_id(self.current_key) if self.current_key else None
+
+    def __len__(self) -> int:
+        """Return the number of keys in the keyring."""
+        return len(self._keys)
+
+    def get(self, kid: str) -> str | None:
+        """
+        Get the verification key for a key ID.
+
+        Args:
+            kid: Key ID from the token header.
+
+        Returns:
+            The key if it is known and still accepted, None otherwise.
+        """
+        found = self._keys.get(kid)
+        if found is None:
+            return None
+        key, valid_until = found
+        if valid_until is not None and valid_until <= time.time():
+            return None
+        return key
+
+    def keys(self) -> list[str]:
+        """
+        Get all keys that are still accepted.
+
+        Returns:
+            List of keys, newest first.
+        """
+        now = time.time()
+        return [
+            key
+            for key, valid_until in self._keys.values()
+            if valid_until is None or valid_until > now
+        ]
+
 
 class SecretRotationManager:
     """Manages the rotation of application secrets."""
@@ -32,6 +135,7 @@ class SecretRotationManager:
         transition_period_days: int | None = None,
         key_lifetime_days: int | None = None,
         enabled: bool = True,
+        store: SecretStore | None = None,
     ):
         """
         Initialize the Secret Rotation Manager.
@@ -41,6 +145,8 @@ class SecretRotationManager:
             transition_period_days: Number of days to keep old keys active during transition
             key_lifetime_days: Number of days before rotating keys
             enabled: Whether secret rotation is enabled
+            store: Store shared with other workers; defaults to a file store
+                at ``secret_file_path``
         """
         self.enabled = enabled
 
@@ -60,10 +166,7 @@ class SecretRotationManager:
         if secret_file_path is None:
             self.secrets_dir = os.environ.get(
                 "SECRETS_DIR",
-                os.path.join(
-                    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                    "secrets",
-                ),
+                os.path.join(tempfile.gettempdir(), "awesome_fastapi_app", "secrets"),
             )
             os.makedirs(self.secrets_dir, exist_ok=True)
             self.secret_file_path = os.path.join(self.secrets_dir, "secret_keys.json")
@@ -72,8 +175,29 @@ class SecretRotationManager:
             self.secrets_dir = os.path.dirname(secret_file_path)
             os.makedirs(self.secrets_dir, exist_ok=True)
 
+        self.store = (
+            store if store is not None else FileSecretStore(self.secret_file_path)
+        )
+        self.secrets: dict[str, Any] = {JWT_KEY_TYPE: [], DB_CREDENTIAL_TYPE: []}
+        self.generation = 0
+
+        self._lock = threading.RLock()
+        self._subscribers: list[Callable[[JWTKeyring], None]] = []
+        self._scheduler: threading.Thread | None = None
+        self._scheduler_wakeup = threading.Event()
+        self._scheduler_stop = threading.Event()
+        self._jwt_keyring = self._build_jwt_keyring()
+
         # Load or initialize secrets
-        self.secrets = self._load_secrets()
+        try:
+            self._apply_secrets(*self.store.load())
+        except SecretStoreError as e:
+            # Keep the unreadable store as it is, so its keys can be recovered
+            logger.error(f"{e}; using SECRET_KEY from settings without saving it")
+            secrets_data = self._normalize_secrets({})
+            self._add_config_jwt_key(secrets_data)
+            self._apply_secrets(secrets_data, 0)
+            return
 
         # If we have a SECRET_KEY in settings but no JWT keys, add it as the initial key
         if (
@@ -81,58 +205,90 @@ class SecretRotationManager:
             and hasattr(settings, "SECRET_KEY")
             and settings.SECRET_KEY
         ):
-            now = datetime.utcnow().isoformat()
-            self.secrets[JWT_KEY_TYPE].append(
-                {
-                    "key": settings.SECRET_KEY,
-                    "created_at": now,
-                    "expires_at": (datetime.utcnow() + self.key_lifetime).isoformat(),
-                    "source": "config",
-                }
-            )
-            logger.info("Added SECRET_KEY from config as the initial JWT key")
-            self._save_secrets()
+            self._update_secrets(self._add_config_jwt_key)
 
-    def _load_secrets(self) -> dict[str, Any]:
-        """Load secrets from file or initialize if not exists."""
-        try:
-            if os.path.exists(self.secret_file_path):
-                with open(self.secret_file_path) as f:
-                    secrets_data = json.load(f)
-                logger.info(f"Loaded secrets from {self.secret_file_path}")
-                return secrets_data
-            else:
-                logger.info(
-                    f"No secrets file found at {self.secret_file_path}, initializing new secrets"
-                )
-                # Initialize with default structure
-                return {
-                    JWT_KEY_TYPE: [],
-                    DB_CREDENTIAL_TYPE: [],
-                }
-        except Exception as e:
-            logger.error(f"Error loading secrets: {e}")
-            # Return empty structure on error
-            return {
-                JWT_KEY_TYPE: [],
-                DB_CREDENTIAL_TYPE: [],
-            }
+    @staticmethod
+    def _normalize_secrets(secrets_data: dict[str, Any]) -> dict[str, Any]:
+        """Make sure every secret type is present."""
+        secrets_data.setdefault(JWT_KEY_TYPE, [])
+        secrets_data.setdefault(DB_CREDENTIAL_TYPE, [])
+        return secrets_data
 
-    def _save_secrets(self) -> None:
-        """Save secrets to file."""
+    def _apply_secrets(self, secrets_data: dict[str, Any], generation: int) -> None:
+        """
+        Adopt secrets read from the store.
+
+        Args:
+            secrets_data: Secrets as stored.
+            generation: Generation of the secrets.
+        """
+        secrets_data = self._normalize_secrets(secrets_data)
+        jwt_changed = secrets_data[JWT_KEY_TYPE] != self.secrets[JWT_KEY_TYPE]
+
+        self.secrets = secrets_data
+        self.generation = generation
+
+        if jwt_changed:
+            self._on_jwt_keys_changed()
+
+    def _update_secrets(self, mutator: Callable[[dict[str, Any]], bool]) -> None:
+        """
+        Change the secrets through a locked read-modify-write on the store.
+
+        The mutator sees the latest stored secrets, which may include changes
+        made by other workers, and returns True if it changed them.
+
+        Args:
+            mutator: Function applying the change in place.
+        """
         if not self.enabled:
             logger.debug("Secret rotation is disabled, not saving secrets")
             return
 
-        try:
-            with open(self.secret_file_path, "w") as f:
-                json.dump(self.secrets, f, indent=2)
-            logger.info(f"Saved secrets to {self.secret_file_path}")
+        with self._lock:
+            secrets_data, generation = self.store.update(
+                lambda data: mutator(self._normalize_secrets(data))
+            )
+            self._apply_secrets(secrets_data, generation)
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Pick up secrets rotated by another worker.
+
+        This is cheap when nothing changed: the store is only re-read when its
+        change check (for the file store, a single ``stat``) says so.
 
-            # Set secure permissions
-            os.chmod(self.secret_file_path, 0o600)
-        except Exception as e:
-            logger.error(f"Error saving secrets: {e}")
+        Returns:
+            True if newer secrets were loaded.
+        """
+        if not self.enabled or not self.store.has_changed():
+            return False
+
+        with self._lock:
+            secrets_data, generation = self.store.load()
+            if generation == self.generation:
+                return False
+            logger.info(f"Loaded secrets generation {generation} from peer")
+            self._apply_secrets(secrets_data, generation)
+            return True
+
+    def _add_config_jwt_key(self, secrets_data: dict[str, Any]) -> bool:
+        """Add SECRET_KEY from config as the initial JWT key, if none exists."""
+        if secrets_data[JWT_KEY_TYPE]:
+            # Another worker got there first
+            return False
+
+        now = datetime.utcnow().isoformat()
+        secrets_data[JWT_KEY_TYPE].append(
+            {
+                "key": settings.SECRET_KEY,
+                "created_at": now,
+                "expires_at": (datetime.utcnow() + self.key_lifetime).isoformat(),
+                "source": "config",
+            }
+        )
+        logger.info("Added SECRET_KEY from config as the initial JWT key")
+        return True
 
     def _generate_jwt_key(self) -> str:
         """Generate a new JWT signing key."""
@@ -150,6 +306,7 @@ class SecretRotationManager:
         Get the current JWT signing key.
 
         If no keys exist or the current key has expired, a new key is generated.
+        Until the next rotation deadline this is a single timestamp comparison.
 
         Returns:
             The current JWT signing key.
@@ -158,14 +315,8 @@ class SecretRotationManager:
             # If rotation is disabled, use the SECRET_KEY from settings
             return settings.SECRET_KEY
 
-        self._rotate_jwt_keys_if_needed()
-
-        if not self.secrets[JWT_KEY_TYPE]:
-            # Create a new key if none exists
-            self._add_new_jwt_key()
-
         # Return the most recent key
-        return self.secrets[JWT_KEY_TYPE][0]["key"]
+        return self._get_fresh_jwt_keyring().current_key
 
     def get_jwt_keys(self) -> list[str]:
         """
@@ -178,10 +329,167 @@ class SecretRotationManager:
             # If rotation is disabled, just return the SECRET_KEY from settings
             return [settings.SECRET_KEY]
 
-        self._rotate_jwt_keys_if_needed()
-
         # Return all active keys
-        return [key_entry["key"] for key_entry in self.secrets[JWT_KEY_TYPE]]
+        return self._get_fresh_jwt_keyring().keys()
+
+    def get_jwt_keyring(self) -> JWTKeyring:
+        """
+        Get the JWT verification keyring.
+
+        Unlike ``get_jwt_keys``, this does not evaluate key expiry: the
+        keyring is only rebuilt when keys are added or removed, which makes
+        it suitable for verifying tokens on every request.
+
+        Returns:
+            The current JWT keyring.
+        """
+        return self._jwt_keyring
+
+    def _get_fresh_jwt_keyring(self) -> JWTKeyring:
+        """
+        Get the keyring, making sure rotation has been handled.
+
+        When the rotation deadline has passed and the background scheduler is
+        running, the scheduler is woken up and the current keyring is returned
+        unchanged: old keys stay valid during their transition period, so the
+        request does not need to wait for the rotation. Without a scheduler,
+        or when there is no key at all, rotation runs inline.
+
+        Returns:
+            The current JWT keyring.
+        """
+        keyring = self._jwt_keyring
+        if keyring.rotate_at > time.time():
+            return keyring
+
+        if self.scheduler_running and keyring.current_key is not None:
+            self._scheduler_wakeup.set()
+            return keyring
+
+        with self._lock:
+            # Also creates a new key if none exists
+            self._rotate_jwt_keys_if_needed()
+            return self._jwt_keyring
+
+    def _build_jwt_keyring(self) -> JWTKeyring:
+        """Build a keyring from the current JWT key entries."""
+        if not self.enabled:
+            return JWTKeyring([(settings.SECRET_KEY, None)])
+
+        entries = []
+        deadlines = []
+        for i, key_entry in enumerate(self.secrets[JWT_KEY_TYPE]):
+            expires_at = datetime.fromisoformat(key_entry["expires_at"])
+            valid_until = (expires_at + self.transition_period - _EPOCH).total_seconds()
+            entries.append((key_entry["key"], valid_until))
+            deadlines.append(valid_until)
+            if i == 0:
+                deadlines.append((expires_at - _EPOCH).total_seconds())
+
+        # With no keys at all, rotation is due immediately
+        return JWTKeyring(entries, rotate_at=min(deadlines, default=0.0))
+
+    def _on_jwt_keys_changed(self) -> None:
+        """Rebuild the keyring after JWT keys changed and notify subscribers."""
+        keyring = self._build_jwt_keyring()
+        self._jwt_keyring = keyring
+
+        for callback in list(self._subscribers):
+            try:
+                callback(keyring)
+            except Exception as e:
+                logger.error(f"Error in JWT keyring subscriber: {e}")
+
+    def subscribe(self, callback: Callable[[JWTKeyring], None]) -> None:
+        """
+        Register a callback invoked with the new keyring whenever it changes.
+
+        Args:
+            callback: Function called with the rebuilt keyring.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[JWTKeyring], None]) -> None:
+        """
+        Remove a previously registered keyring callback.
+
+        Args:
+            callback: Function passed to ``subscribe``.
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    @property
+    def scheduler_running(self) -> bool:
+        """Whether the background rotation scheduler is running."""
+        return self._scheduler is not None and self._scheduler.is_alive()
+
+    def start_scheduler(self, check_interval_seconds: float | None = None) -> None:
+        """
+        Start the background thread that rotates and persists JWT keys.
+
+        The thread sleeps until the keyring's next rotation deadline, capped
+        at ``check_interval_seconds``, so rotation and the resulting store
+        write happen off the request path. Each wake-up also picks up keys
+        rotated by other workers.
+
+        Args:
+            check_interval_seconds: Maximum time between two rotation checks.
+        """
+        if not self.enabled or self.scheduler_running:
+            return
+
+        interval = (
+            check_interval_seconds
+            if check_interval_seconds is not None
+            else settings.SECRET_STORE_POLL_INTERVAL_SECONDS
+        )
+        self._scheduler_stop.clear()
+        self._scheduler = threading.Thread(
+            target=self._run_scheduler,
+            args=(interval,),
+            name="secret-rotation-scheduler",
+            daemon=True,
+        )
+        self._scheduler.start()
+        logger.info("Started secret rotation scheduler")
+
+    def stop_scheduler(self, timeout: float | None = 5.0) -> None:
+        """
+        Stop the background rotation thread.
+
+        Args:
+            timeout: Maximum time to wait for the thread to exit.
+        """
+        if self._scheduler is None:
+            return
+
+        self._scheduler_stop.set()
+        self._scheduler_wakeup.set()
+        self._scheduler.join(timeout)
+        self._scheduler = None
+        logger.info("Stopped secret rotation scheduler")
+
+    def _run_scheduler(self, interval: float) -> None:
+        """
+        Scheduler loop: pick up peer rotations, and rotate when due.
+
+        Args:
+            interval: Maximum time between two checks.
+        """
+        while not self._scheduler_stop.is_set():
+            delay = self._jwt_keyring.rotate_at - time.time()
+            self._scheduler_wakeup.wait(min(max(delay, 0.0), interval))
+            self._scheduler_wakeup.clear()
+            if self._scheduler_stop.is_set():
+                break
+
+            try:
+                self.refresh_if_changed()
+                if self._jwt_keyring.rotate_at <= time.time():
+                    self._rotate_jwt_keys_if_needed()
+            except Exception as e:
+                logger.error(f"Error rotating JWT keys: {e}")
 
     def get_current_db_credentials(self) -> dict[str, str]:
         """
@@ -200,25 +508,29 @@ class SecretRotationManager:
                 "password": settings.POSTGRES_PASSWORD,
             }
 
+        # Also creates new credentials if none exist
         self._rotate_db_credentials_if_needed()
 
-        if not self.secrets[DB_CREDENTIAL_TYPE]:
-            # Create new credentials if none exist
-            self._add_new_db_credentials()
-
         # Return the most recent credentials
         return self.secrets[DB_CREDENTIAL_TYPE][0]["credentials"]
 
     def _add_new_jwt_key(self) -> None:
         """Add a new JWT signing key."""
-        if not self.enabled:
-            return
+        self._update_secrets(self._prepend_jwt_key)
+        logger.info("Generated and saved new JWT signing key")
 
+    def _add_new_db_credentials(self) -> None:
+        """Add new database credentials."""
+        self._update_secrets(self._prepend_db_credentials)
+        logger.info("Generated and saved new database credentials")
+
+    def _prepend_jwt_key(self, secrets_data: dict[str, Any]) -> bool:
+        """Insert a newly generated JWT key as the current key."""
         new_key = self._generate_jwt_key()
         now = datetime.utcnow().isoformat()
 
         # Add the new key at the beginning of the list
-        self.secrets[JWT_KEY_TYPE].insert(
+        secrets_data[JWT_KEY_TYPE].insert(
             0,
             {
                 "key": new_key,
@@ -227,20 +539,15 @@ class SecretRotationManager:
                 "source": "rotation",
             },
         )
+        return True
 
-        self._save_secrets()
-        logger.info("Generated and saved new JWT signing key")
-
-    def _add_new_db_credentials(self) -> None:
-        """Add new database credentials."""
-        if not self.enabled:
-            return
-
+    def _prepend_db_credentials(self, secrets_data: dict[str, Any]) -> bool:
+        """Insert newly generated database credentials as the current ones."""
         new_credentials = self._generate_db_credential()
         now = datetime.utcnow().isoformat()
 
         # Add the new credentials at the beginning of the list
-        self.secrets[DB_CREDENTIAL_TYPE].insert(
+        secrets_data[DB_CREDENTIAL_TYPE].insert(
             0,
             {
                 "credentials": new_credentials,
@@ -248,21 +555,27 @@ class SecretRotationManager:
                 "expires_at": (datetime.utcnow() + self.key_lifetime).isoformat(),
             },
         )
-
-        self._save_secrets()
-        logger.info("Generated and saved new database credentials")
+        return True
 
     def _rotate_jwt_keys_if_needed(self) -> None:
         """Check if JWT keys need rotation and perform rotation if necessary."""
         if not self.enabled:
             return
 
+        # Only take the store lock when our copy says rotation is due; the
+        # locked update re-checks against the latest stored keys.
+        if self._expire_jwt_keys(copy.deepcopy(self.secrets)):
+            self._update_secrets(self._expire_jwt_keys)
+
+    def _expire_jwt_keys(self, secrets_data: dict[str, Any]) -> bool:
+        """Drop retired JWT keys and add a new one if the current key expired."""
+        jwt_keys = secrets_data[JWT_KEY_TYPE]
         now = datetime.utcnow()
         keys_to_remove = []
         current_key_expired = False
 
         # Check for expired keys and mark keys for removal
-        for i, key_entry in enumerate(self.secrets[JWT_KEY_TYPE]):
+        for i, key_entry in enumerate(jwt_keys):
             expires_at = datetime.fromisoformat(key_entry["expires_at"])
 
             if i == 0 and expires_at <= now:
@@ -276,25 +589,32 @@ class SecretRotationManager:
         # Remove expired keys (in reverse order to maintain correct indices)
         for i in sorted(keys_to_remove, reverse=True):
             logger.info(
-                f"Removing expired JWT key created at {self.secrets[JWT_KEY_TYPE][i]['created_at']}"
+                f"Removing expired JWT key created at {jwt_keys[i]['created_at']}"
             )
-            self.secrets[JWT_KEY_TYPE].pop(i)
+            jwt_keys.pop(i)
 
         # Add a new key if the current one expired
-        if current_key_expired or not self.secrets[JWT_KEY_TYPE]:
-            self._add_new_jwt_key()
+        if current_key_expired or not jwt_keys:
+            return self._prepend_jwt_key(secrets_data)
+        return bool(keys_to_remove)
 
     def _rotate_db_credentials_if_needed(self) -> None:
         """Check if database credentials need rotation and perform rotation if necessary."""
         if not self.enabled:
             return
 
+        if self._expire_db_credentials(copy.deepcopy(self.secrets)):
+            self._update_secrets(self._expire_db_credentials)
+
+    def _expire_db_credentials(self, secrets_data: dict[str, Any]) -> bool:
+        """Drop retired credentials and add new ones if the current ones expired."""
+        db_credentials = secrets_data[DB_CREDENTIAL_TYPE]
         now = datetime.utcnow()
         credentials_to_remove = []
         current_credentials_expired = False
 
         # Check for expired credentials and mark for removal
-        for i, cred_entry in enumerate(self.secrets[DB_CREDENTIAL_TYPE]):
+        for i, cred_entry in enumerate(db_credentials):
             expires_at = datetime.fromisoformat(cred_entry["expires_at"])
 
             if i == 0 and expires_at <= now:
@@ -308,13 +628,14 @@ class SecretRotationManager:
         # Remove expired credentials (in reverse order to maintain correct indices)
         for i in sorted(credentials_to_remove, reverse=True):
             logger.info(
-                f"Removing expired database credentials created at {self.secrets[DB_CREDENTIAL_TYPE][i]['created_at']}"
+                f"Removing expired database credentials created at {db_credentials[i]['created_at']}"
             )
-            self.secrets[DB_CREDENTIAL_TYPE].pop(i)
+            db_credentials.pop(i)
 
         # Add new credentials if the current ones expired
-        if current_credentials_expired or not self.secrets[DB_CREDENTIAL_TYPE]:
-            self._add_new_db_credentials()
+        if current_credentials_expired or not db_credentials:
+            return self._prepend_db_credentials(secrets_data)
+        return bool(credentials_to_remove)
 
     def force_rotate_jwt_key(self) -> str:
         """
@@ -326,8 +647,9 @@ class SecretRotationManager:
         if not self.enabled:
             return settings.SECRET_KEY
 
-        self._add_new_jwt_key()
-        return self.secrets[JWT_KEY_TYPE][0]["key"]
+        with self._lock:
+            self._add_new_jwt_key()
+            return self.secrets[JWT_KEY_TYPE][0]["key"]
 
     def force_rotate_db_credentials(self) -> dict[str, str]:
         """
@@ -384,6 +706,7 @@ class SecretRotationManager:
             expires_at = datetime.fromisoformat(key_entry["expires_at"])
             jwt_keys_status.append(
                 {
+                    "kid": jwt_key_id(key_entry["key"]),
                     "created_at": key_entry["created_at"],
                     "expires_at": key_entry["expires_at"],
                     "is_current": key_entry == self.secrets[JWT_KEY_TYPE][0],
@@ -0,0 +1,213 @@
+"""
+Storage backends for rotated secrets.
+
+Every worker process has its own ``SecretRotationManager``, so the backing
+store is what keeps them in agreement. A store offers a locked
+read-modify-write ``update`` so that only one worker performs a given
+rotation, a monotonically increasing generation counter, and a cheap
+``has_changed`` check that lets workers notice rotations done by their
+peers without re-reading the secrets.
+
+``FileSecretStore`` is the default. Other backends (e.g. Redis or a database
+table) only need to implement the ``SecretStore`` interface.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Key under which the generation counter is persisted alongside the secrets
+GENERATION_KEY = "generation"
+
+
+class SecretStoreError(Exception):
+    """The stored secrets exist but cannot be read."""
+
+
+class SecretStore(ABC):
+    """Interface for a store shared by all workers."""
+
+    @abstractmethod
+    def load(self) -> tuple[dict[str, Any], int]:
+        """
+        Load the secrets.
+
+        Returns:
+            Tuple of the secrets and their generation.
+
+        Raises:
+            SecretStoreError: If the stored secrets cannot be read.
+        """
+
+    @abstractmethod
+    def update(
+        self, mutator: Callable[[dict[str, Any]], bool]
+    ) -> tuple[dict[str, Any], int]:
+        """
+        Atomically read, modify and write the secrets.
+
+        The mutator is called with the latest secrets while the store is
+        locked against other writers. It changes them in place and returns
+        True if they should be written back, which bumps the generation.
+
+        Args:
+            mutator: Function applying the change.
+
+        Returns:
+            Tuple of the resulting secrets and their generation.
+
+        Raises:
+            SecretStoreError: If the stored secrets cannot be read; nothing
+                is written then, so the keys in the store are not lost.
+        """
+
+    @abstractmethod
+    def has_changed(self) -> bool:
+        """
+        Cheaply check whether the secrets changed since the last load/update.
+
+        Returns:
+            True if another writer may have changed the secrets.
+        """
+
+
+class FileSecretStore(SecretStore):
+    """
+    JSON file store safe for concurrent worker processes.
+
+    Writers hold an exclusive ``flock`` on a sidecar lock file and replace the
+    secrets file atomically (temporary file, ``fsync``, ``os.replace``), so
+    readers never see a partial file. Changes by other processes are
+    detected from the file's inode, mtime and size, which costs one
+    ``stat`` call.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path of the JSON file holding the secrets.
+        """
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self._signature: tuple[int, int, int] | None = None
+
+    def load(self) -> tuple[dict[str, Any], int]:
+        """Load the secrets under a shared lock."""
+        with self._file_lock(exclusive=False):
+            return self._read()
+
+    def update(
+        self, mutator: Callable[[dict[str, Any]], bool]
+    ) -> tuple[dict[str, Any], int]:
+        """Apply a change to the secrets under an exclusive lock."""
+        with self._file_lock(exclusive=True):
+            data, generation = self._read()
+            if mutator(data):
+                generation += 1
+                self._write(data, generation)
+            return data, generation
+
+    def has_changed(self) -> bool:
+        """Check the file's stat signature against the last one seen."""
+        return self._stat_signature() != self._signature
+
+    def _stat_signature(self) -> tuple[int, int, int] | None:
+        """Get the inode, mtime and size of the secrets file."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        """Hold an advisory lock on the sidecar lock file."""
+        if fcntl is None:
+            yield
+            return
+
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _read(self) -> tuple[dict[str, Any], int]:
+        """
+        Read the secrets file. Must be called with the lock held.
+
+        Raises:
+            SecretStoreError: If the file exists but cannot be parsed.
+        """
+        signature = self._stat_signature()
+        if signature is None:
+            logger.info(
+                f"No secrets file found at {self.path}, initializing new secrets"
+            )
+            self._signature = None
+            return {}, 0
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot read secrets file {self.path}: {e}")
+            raise SecretStoreError(f"Cannot read secrets file {self.path}") from e
+
+        self._signature = signature
+        generation = int(data.pop(GENERATION_KEY, 0))
+        logger.debug(f"Loaded secrets generation {generation} from {self.path}")
+        return data, generation
+
+    def _write(self, data: dict[str, Any], generation: int) -> None:
+        """Atomically replace the secrets file. Must hold the exclusive lock."""
+        directory = os.path.dirname(self.path) or "."
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=".secret_keys.", suffix=".tmp"
+        )
+        try:
+            # Set secure permissions before any secret is written
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({**data, GENERATION_KEY: generation}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._fsync_directory(directory)
+        self._signature = self._stat_signature()
+        logger.info(f"Saved secrets generation {generation} to {self.path}")
+
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        """Make the rename durable. Best effort; not supported everywhere."""
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
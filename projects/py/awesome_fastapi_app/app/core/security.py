@@ -6,12 +6,13 @@ from datetime import datetime, timedelta
 from typing import Any
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
-from app.core.secret_rotation import secret_manager
+from app.core.hashing_pool import password_hash_pool
+from app.core.password_policy import build_password_context, verify_and_upgrade
+from app.core.secret_rotation import jwt_key_id, secret_manager
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_password_context()
 
 
 def create_access_token(
@@ -35,33 +36,56 @@ def create_access_token(
         )
     to_encode = {"exp": expire, "sub": str(subject)}
 
-    # Use the current JWT key from the rotation manager
+    # Sign with the current key from the rotation manager and record its ID
+    # in the header so verification can pick the right key directly
     secret_key = secret_manager.get_current_jwt_key()
-    encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(
+        to_encode,
+        secret_key,
+        algorithm=settings.ALGORITHM,
+        headers={"kid": jwt_key_id(secret_key)},
+    )
     return encoded_jwt
 
 
-def verify_token(token: str) -> str | None:
+def decode_token(token: str) -> dict[str, Any] | None:
     """
-    Verify a JWT token and return the subject.
+    Verify a JWT token and return its claims.
 
-    This function tries all active keys when verifying tokens to allow
-    for smooth key rotation.
+    The key is looked up by the ``kid`` header in the rotation manager's
+    keyring, so exactly one signature check is done regardless of how many
+    keys are active. Tokens issued before key IDs were introduced carry no
+    ``kid`` and are checked against every active key instead.
 
     Args:
         token: JWT token to verify.
 
     Returns:
-        The subject of the token if valid, None otherwise.
+        The token claims if valid, None otherwise.
     """
-    # Get all active JWT keys
-    jwt_keys = secret_manager.get_jwt_keys()
+    keyring = secret_manager.get_jwt_keyring()
+
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except JWTError:
+        return None
+
+    if kid is not None:
+        key = keyring.get(kid)
+        if key is None and secret_manager.refresh_if_changed():
+            # The key may have just been rotated in by another worker
+            key = secret_manager.get_jwt_keyring().get(kid)
+        if key is None:
+            return None
+        try:
+            return jwt.decode(token, key, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            return None
 
-    # Try each key until one works
-    for key in jwt_keys:
+    # Legacy tokens without a key ID: try each key until one works
+    for key in keyring.keys():
         try:
-            payload = jwt.decode(token, key, algorithms=[settings.ALGORITHM])
-            return payload.get("sub")
+            return jwt.decode(token, key, algorithms=[settings.ALGORITHM])
         except JWTError:
             continue
 
@@ -69,28 +93,133 @@ def verify_token(token: str) -> str | None:
     return None
 
 
+def verify_token(token: str) -> str | None:
+    """
+    Verify a JWT token and return the subject.
+
+    Args:
+        token: JWT token to verify.
+
+    Returns:
+        The subject of the token if valid, None otherwise.
+    """
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    return payload.get("sub")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash.
 
+    The work runs on the bounded password hashing pool.
+
     Args:
         plain_password: Plain password.
         hashed_password: Hashed password.
 
     Returns:
         True if the password matches the hash, False otherwise.
+
+    Raises:
+        PasswordHashingOverloaded: If the hashing pool is saturated.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hash_pool.run(pwd_context.verify, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password.
 
+    The work runs on the bounded password hashing pool.
+
+    Args:
+        password: Plain password.
+
+    Returns:
+        Hashed password.
+
+    Raises:
+        PasswordHashingOverloaded: If the hashing pool is saturated.
+    """
+    return password_hash_pool.run(pwd_context.hash, password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password and rehash it if the hash policy has strengthened.
+
+    Args:
+        plain_password: Plain password.
+        hashed_password: Hashed password.
+
+    Returns:
+        Tuple of whether the password matches and, if the stored hash uses a
+        less preferred scheme or lower costs than the policy, a replacement
+        hash.
+
+    Raises:
+        PasswordHashingOverloaded: If the hashing pool is saturated.
+    """
+    return password_hash_pool.run(
+        verify_and_upgrade, pwd_context, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password and compute an upgraded hash without blocking the caller.
+
+    Args:
+        plain_password: Plain password.
+        hashed_password: Hashed password.
+
+    Returns:
+        Tuple of whether the password matches and an optional replacement hash.
+
+    Raises:
+        PasswordHashingOverloaded: If the hashing pool is saturated.
+    """
+    return await password_hash_pool.run_async(
+        verify_and_upgrade, pwd_context, plain_password, hashed_password
+    )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash without blocking the caller's thread.
+
+    Args:
+        plain_password: Plain password.
+        hashed_password: Hashed password.
+
+    Returns:
+        True if the password matches the hash, False otherwise.
+
+    Raises:
+        PasswordHashingOverloaded: If the hashing pool is saturated.
+    """
+    return await password_hash_pool.run_async(
+        pwd_context.verify, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password without blocking the caller's thread.
+
     Args:
         password: Plain password.
 
     Returns:
         Hashed password.
+
+    Raises:
+        PasswordHashingOverloaded: If the hashing pool is saturated.
     """
-    return pwd_context.hash(password)
+    return await password_hash_pool.run_async(pwd_context.hash, password)
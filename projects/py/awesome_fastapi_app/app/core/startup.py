@@ -0,0 +1,130 @@
+"""
+Startup-time profiling.
+
+The lifespan handler runs each startup step (secret rotation, database
+warm-up, ...) inside ``startup_profile.phase()``. Once the app is ready the
+report is logged and served from ``/metrics/startup``, so slow pod starts can
+be traced to a step instead of guessed at. The report also includes how long
+the process ran before the lifespan started, which covers interpreter start
+and imports.
+"""
+
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def process_age_seconds() -> float | None:
+    """
+    Get how long ago the current process started.
+
+    Returns:
+        Seconds since the process started, or None where ``/proc`` is not
+        available.
+    """
+    try:
+        with open("/proc/self/stat") as stat_file:
+            # The command name may contain spaces, so split after it
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+        start_ticks = int(fields[19])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class StartupProfile:
+    """
+    Durations of the application's startup phases.
+
+    Attributes:
+        phases: Mapping of phase name to duration in seconds, in run order.
+        ready: Whether startup has finished.
+    """
+
+    def __init__(self):
+        """Initialize an empty profile."""
+        self.phases: dict[str, float] = {}
+        self.ready = False
+        self._started_at: float | None = None
+        self._startup_seconds: float | None = None
+        self._process_age_at_start: float | None = None
+
+    def start(self) -> None:
+        """Mark the start of the startup sequence."""
+        self.phases = {}
+        self.ready = False
+        self._startup_seconds = None
+        self._started_at = time.perf_counter()
+        self._process_age_at_start = process_age_seconds()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time one startup phase.
+
+        Args:
+            name: Phase name used in the report.
+
+        Yields:
+            None; the phase's duration is recorded even if it raises.
+        """
+        if self._started_at is None:
+            self.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def finish(self) -> None:
+        """Mark the application as ready to serve."""
+        if self._started_at is None:
+            self.start()
+        self._startup_seconds = time.perf_counter() - self._started_at
+        self.ready = True
+
+    def report(self) -> dict[str, Any]:
+        """
+        Get the startup report.
+
+        Returns:
+            Dictionary with the phase durations, the time the lifespan took to
+            get ready and the time from process start to ready, in
+            milliseconds. Unknown values are None.
+        """
+        startup_ms = (
+            self._startup_seconds * 1000 if self._startup_seconds is not None else None
+        )
+        time_to_ready_ms = None
+        if self._process_age_at_start is not None and startup_ms is not None:
+            time_to_ready_ms = self._process_age_at_start * 1000 + startup_ms
+        return {
+            "ready": self.ready,
+            "phases_ms": {name: secs * 1000 for name, secs in self.phases.items()},
+            "startup_ms": startup_ms,
+            "time_to_ready_ms": time_to_ready_ms,
+        }
+
+    def log_report(self) -> None:
+        """Log the startup report."""
+        report = self.report()
+        phases = ", ".join(
+            f"{name}={ms:.1f}ms" for name, ms in report["phases_ms"].items()
+        )
+        time_to_ready = report["time_to_ready_ms"]
+        since_exec = f"{time_to_ready:.1f}ms" if time_to_ready is not None else "n/a"
+        logger.info(
+            f"Startup finished in {report['startup_ms']:.1f}ms "
+            f"({since_exec} since process start): {phases}"
+        )
+
+
+# Create a singleton instance for global use
+startup_profile = StartupProfile()
@@ -1,8 +1,22 @@
 """
 OpenTelemetry configuration for observability.
+
+Sampling happens in two places:
+
+- Head sampling decides when a trace starts: ``OTEL_TRACES_SAMPLE_RATE``
+  of new traces are recorded, and child spans follow their parent's
+  decision, including a sampled parent from an upstream service.
+- Tail sampling, when ``OTEL_TAIL_SAMPLING_ENABLED`` is set, decides once a
+  trace's local root span ends: slow and failed traces are exported, the
+  rest only at ``OTEL_TAIL_SAMPLING_KEEP_RATE``. It only sees traces that
+  head sampling recorded. Like head sampling, the keep rate is applied to
+  the trace ID, so the processors of all exporters, and of all services
+  using the same rate, keep the same traces.
 """
 
 import logging
+import threading
+from collections import OrderedDict
 
 from fastapi import FastAPI
 from opentelemetry import trace
@@ -11,8 +25,14 @@ from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.logging import LoggingInstrumentor
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import StatusCode
 from sqlalchemy.engine import Engine
 
 from app.core.config import settings
@@ -20,6 +40,145 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+class TailSamplingProcessor(SpanProcessor):
+    """
+    Span processor exporting only slow, failed or randomly kept traces.
+
+    Ended spans are buffered by trace until the trace's local root span ends
+    (the span without a parent in this process); the whole trace is then
+    passed to the wrapped processor or dropped. A trace evicted from a full
+    buffer is dropped as a whole: its spans that end later, including the
+    root, are discarded too.
+
+    Attributes:
+        kept: Traces passed to the wrapped processor.
+        dropped: Traces dropped, including those evicted from a full buffer.
+    """
+
+    def __init__(
+        self,
+        processor: SpanProcessor,
+        latency_threshold: float,
+        keep_rate: float = 0.0,
+        max_traces: int = 2048,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            processor: Processor receiving the spans of kept traces.
+            latency_threshold: Seconds from which a root span is slow.
+            keep_rate: Fraction of other traces that is kept.
+            max_traces: Traces buffered at most; the oldest is dropped when a
+                new trace would exceed it. Also the number of evicted traces
+                remembered so that their remaining spans are dropped.
+        """
+        self.processor = processor
+        self.latency_threshold = latency_threshold
+        self.keep_rate = keep_rate
+        self.max_traces = max_traces
+        self.kept = 0
+        self.dropped = 0
+        self._traces: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+        self._evicted: OrderedDict[int, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span, parent_context=None) -> None:
+        """Pass a started span to the wrapped processor."""
+        self.processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        """Buffer an ended span and decide on its trace at the local root."""
+        trace_id = span.context.trace_id
+        is_local_root = span.parent is None or span.parent.is_remote
+        with self._lock:
+            if trace_id in self._evicted:
+                if is_local_root:
+                    del self._evicted[trace_id]
+                return
+            spans = self._traces.pop(trace_id, [])
+            spans.append(span)
+            if not is_local_root:
+                self._traces[trace_id] = spans
+                if len(self._traces) > self.max_traces:
+                    self._evict()
+                return
+            keep = self._keep(span, spans)
+            if keep:
+                self.kept += 1
+            else:
+                self.dropped += 1
+        if keep:
+            for buffered in spans:
+                self.processor.on_end(buffered)
+
+    def _evict(self) -> None:
+        """Drop the oldest buffered trace and remember it until its root ends."""
+        evicted_id, _ = self._traces.popitem(last=False)
+        self.dropped += 1
+        self._evicted[evicted_id] = None
+        if len(self._evicted) > self.max_traces:
+            self._evicted.popitem(last=False)
+
+    def _keep(self, root: ReadableSpan, spans: list[ReadableSpan]) -> bool:
+        """
+        Decide whether a finished trace is exported.
+
+        Args:
+            root: Local root span of the trace.
+            spans: All buffered spans of the trace, including the root.
+
+        Returns:
+            True for slow or failed traces and for other traces whose ID falls
+            within the keep rate, decided as by ``TraceIdRatioBased``.
+        """
+        if (root.end_time - root.start_time) / 1e9 >= self.latency_threshold:
+            return True
+        if any(span.status.status_code is StatusCode.ERROR for span in spans):
+            return True
+        trace_id = root.context.trace_id & TraceIdRatioBased.TRACE_ID_LIMIT
+        return trace_id < TraceIdRatioBased.get_bound_for_rate(self.keep_rate)
+
+    def shutdown(self) -> None:
+        """Drop the unfinished traces and shut down the wrapped processor."""
+        with self._lock:
+            self._traces.clear()
+            self._evicted.clear()
+        self.processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Export the spans of kept traces that are still queued."""
+        return self.processor.force_flush(timeout_millis)
+
+
+def create_span_processor(exporter: SpanExporter) -> SpanProcessor:
+    """
+    Create the processor exporting spans with the configured batching.
+
+    Args:
+        exporter: Span exporter.
+
+    Returns:
+        Batch span processor, wrapped in a tail sampling processor if
+        ``OTEL_TAIL_SAMPLING_ENABLED`` is set.
+    """
+    processor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.OTEL_BSP_MAX_QUEUE_SIZE,
+        schedule_delay_millis=settings.OTEL_BSP_SCHEDULE_DELAY_MS,
+        max_export_batch_size=settings.OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+        export_timeout_millis=settings.OTEL_BSP_EXPORT_TIMEOUT_MS,
+    )
+    if not settings.OTEL_TAIL_SAMPLING_ENABLED:
+        return processor
+    return TailSamplingProcessor(
+        processor,
+        latency_threshold=settings.OTEL_TAIL_SAMPLING_LATENCY_MS / 1000,
+        keep_rate=settings.OTEL_TAIL_SAMPLING_KEEP_RATE,
+        max_traces=settings.OTEL_BSP_MAX_QUEUE_SIZE,
+    )
+
+
 def setup_telemetry(
     app: FastAPI,
     sqlalchemy_engine: Engine | None = None,
@@ -41,13 +200,14 @@ def setup_telemetry(
     # Create resource
     resource = Resource.create({"service.name": service_name})
 
-    # Create tracer provider
-    tracer_provider = TracerProvider(resource=resource)
+    # Create tracer provider; children follow their parent's sampling decision
+    sampler = ParentBased(TraceIdRatioBased(settings.OTEL_TRACES_SAMPLE_RATE))
+    tracer_provider = TracerProvider(resource=resource, sampler=sampler)
 
     # Add console exporter for development
-    if settings.ENVIRONMENT == "development":
+    if settings.ENVIRONMENT == "development" and settings.OTEL_CONSOLE_EXPORTER:
         logger.info("Setting up console exporter for OpenTelemetry")
-        tracer_provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+        tracer_provider.add_span_processor(create_span_processor(ConsoleSpanExporter()))
 
     # Add OTLP exporter if endpoint is provided
     if exporter_endpoint or settings.OTLP_EXPORTER_ENDPOINT:
@@ -57,14 +217,18 @@ def setup_telemetry(
         )
 
         otlp_exporter = OTLPSpanExporter(endpoint=endpoint)
-        tracer_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
+        tracer_provider.add_span_processor(create_span_processor(otlp_exporter))
 
     # Set global tracer provider
     trace.set_tracer_provider(tracer_provider)
 
     # Instrument FastAPI
     logger.info("Instrumenting FastAPI with OpenTelemetry")
-    FastAPIInstrumentor.instrument_app(app, tracer_provider=tracer_provider)
+    FastAPIInstrumentor.instrument_app(
+        app,
+        tracer_provider=tracer_provider,
+        excluded_urls=settings.OTEL_EXCLUDED_URLS,
+    )
 
     # Instrument logging
     logger.info("Instrumenting logging with OpenTelemetry")
@@ -72,10 +236,25 @@ def setup_telemetry(
 
     # Instrument SQLAlchemy if engine is provided
     if sqlalchemy_engine:
-        logger.info("Instrumenting SQLAlchemy with OpenTelemetry")
-        SQLAlchemyInstrumentor().instrument(
-            engine=sqlalchemy_engine,
-            tracer_provider=tracer_provider,
-        )
+        instrument_sqlalchemy(sqlalchemy_engine)
 
     logger.info("OpenTelemetry setup complete")
+
+
+def instrument_sqlalchemy(engine: Engine) -> None:
+    """
+    Trace the queries of a SQLAlchemy engine.
+
+    Engines are created lazily, after ``setup_telemetry`` has run, so this is
+    registered as an engine-created listener instead of being called at setup.
+
+    Args:
+        engine: SQLAlchemy engine instance.
+    """
+    if not settings.OTEL_SQLALCHEMY_ENABLED:
+        return
+    logger.info("Instrumenting SQLAlchemy with OpenTelemetry")
+    SQLAlchemyInstrumentor().instrument(
+        engine=engine,
+        tracer_provider=trace.get_tracer_provider(),
+    )
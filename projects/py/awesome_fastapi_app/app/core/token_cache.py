@@ -0,0 +1,276 @@
+"""
+In-process cache of verified access tokens.
+
+Every authenticated request used to decode its JWT and then load the user
+row from the database. This module keeps a bounded, TTL-based LRU cache that
+maps an already-verified token to a lightweight snapshot of its user, so that
+repeated requests with the same token skip both the signature check and the
+SELECT.
+
+Entries are keyed by the token signature and remember the signed header and
+payload, so a hit is only possible for the exact token that was verified.
+An entry never outlives the token's own ``exp`` claim, and all entries for a
+user are dropped whenever that user is updated, deactivated or removed.
+"""
+
+import hmac
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Columns copied from the User row into the cached snapshot. The password hash
+# is deliberately left out; it is lazily loaded if anything ever touches it.
+SNAPSHOT_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "is_active",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+
+
+class UserSnapshot:
+    """
+    Lightweight, immutable copy of the user columns needed by request handlers.
+
+    Attributes:
+        user_id: ID of the user.
+        values: Mapping of column name to value for ``SNAPSHOT_FIELDS``.
+    """
+
+    __slots__ = ("user_id", "values")
+
+    def __init__(self, user_id: int, values: dict[str, Any]):
+        """
+        Initialize the snapshot.
+
+        Args:
+            user_id: ID of the user.
+            values: Column values taken from the user row.
+        """
+        self.user_id = user_id
+        self.values = values
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserSnapshot":
+        """
+        Build a snapshot from a loaded User model instance.
+
+        Args:
+            user: User model instance.
+
+        Returns:
+            Snapshot of the user's columns.
+        """
+        values = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+        return cls(user.id, values)
+
+
+class _CacheEntry:
+    """A single cached token."""
+
+    __slots__ = ("signing_input", "snapshot", "expires_at")
+
+    def __init__(self, signing_input: str, snapshot: UserSnapshot, expires_at: float):
+        self.signing_input = signing_input
+        self.snapshot = snapshot
+        self.expires_at = expires_at
+
+
+def _split_token(token: str) -> tuple[str, str] | None:
+    """
+    Split a compact JWT into its signing input and signature.
+
+    Args:
+        token: Encoded JWT.
+
+    Returns:
+        Tuple of ``(header.payload, signature)``, or None if malformed.
+    """
+    signing_input, sep, signature = token.rpartition(".")
+    if not sep or not signing_input or not signature:
+        return None
+    return signing_input, signature
+
+
+class TokenCache:
+    """Bounded, TTL-based LRU cache of verified tokens and their users."""
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        ttl_seconds: float | None = None,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of tokens kept in the cache.
+            ttl_seconds: Maximum time a verified token is trusted without
+                re-checking the database.
+            enabled: Whether caching is enabled.
+        """
+        self.enabled = enabled
+        self.max_size = (
+            max_size if max_size is not None else settings.TOKEN_CACHE_MAX_SIZE
+        )
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.TOKEN_CACHE_TTL_SECONDS
+        )
+
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._signatures_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, token: str) -> UserSnapshot | None:
+        """
+        Look up a token.
+
+        Args:
+            token: Encoded JWT presented by the client.
+
+        Returns:
+            The cached user snapshot, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        parts = _split_token(token)
+        if parts is None:
+            return None
+        signing_input, signature = parts
+
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._discard(signature, entry)
+                self.misses += 1
+                return None
+
+            if not hmac.compare_digest(entry.signing_input, signing_input):
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(signature)
+            self.hits += 1
+            return entry.snapshot
+
+    def put(self, token: str, user: Any, token_expires_at: float | None = None) -> None:
+        """
+        Cache a token that has just been verified.
+
+        Args:
+            token: Encoded JWT that was successfully verified.
+            user: User model instance the token resolved to.
+            token_expires_at: The token's ``exp`` claim as a Unix timestamp.
+        """
+        if not self.enabled or self.max_size <= 0:
+            return
+
+        parts = _split_token(token)
+        if parts is None:
+            return
+        signing_input, signature = parts
+
+        ttl = self.ttl_seconds
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - time.time())
+        if ttl <= 0:
+            return
+
+        snapshot = UserSnapshot.from_user(user)
+        entry = _CacheEntry(signing_input, snapshot, time.monotonic() + ttl)
+
+        with self._lock:
+            previous = self._entries.pop(signature, None)
+            if previous is not None:
+                self._unindex(signature, previous)
+
+            self._entries[signature] = entry
+            self._signatures_by_user.setdefault(snapshot.user_id, set()).add(signature)
+
+            while len(self._entries) > self.max_size:
+                old_signature, old_entry = self._entries.popitem(last=False)
+                self._unindex(old_signature, old_entry)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop every cached token that resolves to a user.
+
+        Args:
+            user_id: ID of the user whose tokens should be dropped.
+        """
+        with self._lock:
+            signatures = self._signatures_by_user.pop(user_id, None)
+            if not signatures:
+                return
+            for signature in signatures:
+                if self._entries.pop(signature, None) is not None:
+                    self.invalidations += 1
+
+        logger.debug(f"Invalidated cached tokens for user {user_id}")
+
+    def clear(self) -> None:
+        """Drop every cached token."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._signatures_by_user.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with size, capacity and hit/miss counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _discard(self, signature: str, entry: _CacheEntry) -> None:
+        """Remove an entry. Must be called with the lock held."""
+        del self._entries[signature]
+        self._unindex(signature, entry)
+
+    def _unindex(self, signature: str, entry: _CacheEntry) -> None:
+        """Remove an entry from the per-user index. Must hold the lock."""
+        signatures = self._signatures_by_user.get(entry.snapshot.user_id)
+        if signatures is None:
+            return
+        signatures.discard(signature)
+        if not signatures:
+            del self._signatures_by_user[entry.snapshot.user_id]
+
+
+# Create a singleton instance for global use
+token_cache = TokenCache(enabled=settings.TOKEN_CACHE_ENABLED)
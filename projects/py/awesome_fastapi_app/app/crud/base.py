@@ -2,27 +2,75 @@
 Base CRUD class for database operations.
 """
 
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime
 from typing import Any, Generic, TypeVar
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import Select, delete, insert, null, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.crud.pagination import InvalidCursor, Page, decode_cursor, encode_cursor
 from app.db.base_class import Base
+from app.models.outbox import OutboxEvent
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def obj_in_to_dict(
+    obj_in: BaseModel | dict[str, Any], *, exclude_unset: bool = False
+) -> dict[str, Any]:
+    """
+    Get the data of a write request as a dict.
+
+    Unlike ``jsonable_encoder`` this keeps Python values (datetimes, enums)
+    as they are, which is what SQLAlchemy expects anyway.
+
+    Args:
+        obj_in: Pydantic schema or dict.
+        exclude_unset: Leave out fields the client did not set.
+
+    Returns:
+        Field values by name.
+    """
+    if isinstance(obj_in, dict):
+        return dict(obj_in)
+    if hasattr(obj_in, "model_dump"):
+        return obj_in.model_dump(exclude_unset=exclude_unset)
+    return obj_in.dict(exclude_unset=exclude_unset)
+
+
+def _chunks(rows: Sequence[Any], size: int | None) -> list[Sequence[Any]]:
+    """Split rows into chunks of at most ``size`` (the configured default)."""
+    size = size or settings.CRUD_BULK_CHUNK_SIZE
+    return [rows[i : i + size] for i in range(0, len(rows), size)]
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Base class for CRUD operations.
 
     Attributes:
         model: The SQLAlchemy model class.
+        cache_namespace: Response cache namespace of the model, or None if
+            its responses are not cached.
+        owner_field: Column holding the owning user's ID, used to invalidate
+            that user's cached list pages.
+        event_name: Name used in the model's outbox events, e.g. ``item`` for
+            ``item_created``, or None if writes are not published.
+        event_topic: Pub/Sub topic of the model's outbox events.
     """
 
+    cache_namespace: str | None = None
+    owner_field: str | None = None
+    event_name: str | None = None
+    event_topic: str | None = None
+
     def __init__(self, model: type[ModelType]):
         """
         Initialize with SQLAlchemy model.
@@ -31,6 +79,106 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             model: The SQLAlchemy model class.
         """
         self.model = model
+        self._column_keys: frozenset[str] | None = None
+
+    @property
+    def column_keys(self) -> frozenset[str]:
+        """Names of the model's column attributes, from the mapper."""
+        if self._column_keys is None:
+            self._column_keys = frozenset(self.model.__mapper__.columns.keys())
+        return self._column_keys
+
+    def _owner_of(self, db_obj: ModelType) -> int | None:
+        """Get the owner of a record, or None if the model has no owner."""
+        return getattr(db_obj, self.owner_field) if self.owner_field else None
+
+    def _invalidate_cache(
+        self, *, ids: Sequence[Any] = (), owner_ids: Sequence[int | None] | None = ()
+    ) -> None:
+        """
+        Invalidate cached responses after a committed write.
+
+        Args:
+            ids: IDs of the changed records.
+            owner_ids: Owners of the changed records, or None if unknown.
+        """
+        if self.cache_namespace is not None:
+            response_cache.invalidate(
+                self.cache_namespace, ids=ids, owner_ids=owner_ids
+            )
+
+    @property
+    def events_enabled(self) -> bool:
+        """Whether writes add outbox events to their transaction."""
+        return self.event_name is not None and settings.OUTBOX_ENABLED
+
+    def _event_rows(
+        self, action: str, changes: Iterable[tuple[Any, int | None]]
+    ) -> list[dict[str, Any]]:
+        """
+        Build the outbox events describing a write.
+
+        Events of the same owner share an ordering key, so they are published
+        in the order they were written.
+
+        Args:
+            action: ``created``, ``updated`` or ``deleted``.
+            changes: ID and owner of each written record.
+
+        Returns:
+            Rows for ``OutboxEvent``; empty if the model has no events or the
+            outbox is disabled.
+        """
+        if not self.events_enabled:
+            return []
+        return [
+            {
+                "topic": self.event_topic,
+                "ordering_key": "" if owner_id is None else str(owner_id),
+                "payload": {
+                    "action": f"{self.event_name}_{action}",
+                    f"{self.event_name}_id": id,
+                    "owner_id": owner_id,
+                },
+                "attributes": (
+                    None if owner_id is None else {"user_id": str(owner_id)}
+                ),
+            }
+            for id, owner_id in changes
+        ]
+
+    def _write_events(
+        self, db: Session, action: str, changes: Iterable[tuple[Any, int | None]]
+    ) -> None:
+        """Add outbox events for a write to the current transaction."""
+        rows = self._event_rows(action, changes)
+        if rows:
+            db.execute(insert(OutboxEvent), rows)
+
+    async def _write_events_async(
+        self,
+        db: AsyncSession,
+        action: str,
+        changes: Iterable[tuple[Any, int | None]],
+    ) -> None:
+        """Add outbox events for a write to the current transaction."""
+        rows = self._event_rows(action, changes)
+        if rows:
+            await db.execute(insert(OutboxEvent), rows)
+
+    def _owner_in(self, row: dict[str, Any]) -> int | None:
+        """Get the owner from the column values of a record."""
+        return row.get(self.owner_field) if self.owner_field else None
+
+    def _id_and_owner(self) -> tuple[Any, Any]:
+        """Get the ID column and the owner column, or NULL without an owner."""
+        owner = getattr(self.model, self.owner_field) if self.owner_field else null()
+        return self.model.id, owner
+
+    def _owners(self, db: Session, ids: Sequence[Any]) -> list[tuple[Any, int | None]]:
+        """Look up the owners of records by ID."""
+        statement = select(*self._id_and_owner()).where(self.model.id.in_(ids))
+        return list(db.execute(statement).tuples())
 
     def get(self, db: Session, id: Any) -> ModelType | None:
         """
@@ -61,10 +209,111 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: Sequence[str] = ("id",),
+        filters: Sequence[Any] = (),
+    ) -> Page[ModelType]:
+        """
+        Get a page of records using keyset pagination.
+
+        Rows are ordered by ``order_by`` and the page starts after the row the
+        cursor points at, so the cost does not grow with the page number as
+        it does for ``get_multi``. ``id`` is appended to the sort key if it is
+        not already part of it to make the order total.
+
+        Args:
+            db: Database session.
+            cursor: Cursor from the previous page, or None for the first page.
+            limit: Maximum number of records to return.
+            order_by: Names of the columns to sort by, ascending.
+            filters: Extra SQLAlchemy filter expressions.
+
+        Returns:
+            The page of records and the cursor for the next page.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or for another sort key.
+            ValueError: If ``limit`` is less than 1.
+        """
+        statement, keys = self._page_statement(cursor, limit, order_by, filters)
+        return self._to_page(db.scalars(statement).all(), keys, limit)
+
+    def _page_statement(
+        self,
+        cursor: str | None,
+        limit: int,
+        order_by: Sequence[str],
+        filters: Sequence[Any],
+    ) -> tuple[Select, list[str]]:
+        """
+        Build the SELECT for a keyset page, fetching one row extra.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or for another sort key.
+            ValueError: If ``limit`` is less than 1.
+        """
+        if limit < 1:
+            raise ValueError(f"Page limit must be at least 1, got {limit}")
+        keys = list(order_by)
+        if "id" not in keys:
+            keys.append("id")
+        columns = [getattr(self.model, key) for key in keys]
+
+        statement = select(self.model).where(*filters)
+        if cursor is not None:
+            values = [
+                self._cursor_value(column, value)
+                for column, value in zip(columns, decode_cursor(cursor, keys))
+            ]
+            if len(columns) == 1:
+                statement = statement.where(columns[0] > values[0])
+            else:
+                statement = statement.where(tuple_(*columns) > tuple_(*values))
+
+        # Fetch one extra row to find out whether there is a next page
+        return statement.order_by(*columns).limit(limit + 1), keys
+
+    @staticmethod
+    def _to_page(
+        rows: Sequence[ModelType], keys: list[str], limit: int
+    ) -> Page[ModelType]:
+        """Turn the rows fetched by a page statement into a page."""
+        rows = list(rows)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(keys, [getattr(last, key) for key in keys])
+        return Page(rows, next_cursor)
+
+    @staticmethod
+    def _cursor_value(column: Any, value: Any) -> Any:
+        """Convert a decoded cursor value back to the column's Python type."""
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        try:
+            if python_type in (datetime, date) and isinstance(value, str):
+                return python_type.fromisoformat(value)
+            if value is not None and not isinstance(value, python_type):
+                return python_type(value)
+        except (TypeError, ValueError) as e:
+            raise InvalidCursor("Malformed cursor") from e
+        return value
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
         Create a new record.
 
+        Server-generated columns are filled in from the INSERT's RETURNING
+        clause, so the record is not refreshed afterwards.
+
         Args:
             db: Database session.
             obj_in: Input data.
@@ -72,11 +321,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             The created record.
         """
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)  # type: ignore
+        db_obj = self.model(**obj_in_to_dict(obj_in))  # type: ignore
         db.add(db_obj)
+        if self.events_enabled:
+            # The event needs the ID, so insert the record first
+            db.flush()
+            self._write_events(db, "created", [(db_obj.id, self._owner_of(db_obj))])
         db.commit()
-        db.refresh(db_obj)
+        self._invalidate_cache(owner_ids=[self._owner_of(db_obj)])
         return db_obj
 
     def update(
@@ -89,6 +341,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Update a record.
 
+        Only columns whose value changes are written; if nothing changes no
+        statement is sent.
+
         Args:
             db: Database session.
             db_obj: Database object to update.
@@ -97,19 +352,28 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             The updated record.
         """
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        old_owner_id = self._owner_of(db_obj)
+        if not self._apply_update(db_obj, obj_in):
+            return db_obj
         db.add(db_obj)
+        self._write_events(db, "updated", [(db_obj.id, self._owner_of(db_obj))])
         db.commit()
-        db.refresh(db_obj)
+        self._invalidate_cache(
+            ids=[db_obj.id], owner_ids=[old_owner_id, self._owner_of(db_obj)]
+        )
         return db_obj
 
+    def _apply_update(
+        self, db_obj: ModelType, obj_in: UpdateSchemaType | dict[str, Any]
+    ) -> bool:
+        """Set the columns of ``db_obj`` that change; return whether any did."""
+        changed = False
+        for field, value in obj_in_to_dict(obj_in, exclude_unset=True).items():
+            if field in self.column_keys and getattr(db_obj, field) != value:
+                setattr(db_obj, field, value)
+                changed = True
+        return changed
+
     def remove(self, db: Session, *, id: Any) -> ModelType:
         """
         Remove a record.
@@ -123,5 +387,267 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         obj = db.query(self.model).get(id)
         db.delete(obj)
+        self._write_events(db, "deleted", [(id, self._owner_of(obj))])
         db.commit()
+        self._invalidate_cache(ids=[id], owner_ids=[self._owner_of(obj)])
+        return obj
+
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[CreateSchemaType | dict[str, Any]],
+        chunk_size: int | None = None,
+    ) -> list[int]:
+        """
+        Create records in a single transaction.
+
+        Rows are sent in chunks with ``INSERT ... RETURNING id`` instead of
+        one commit and refresh per row.
+
+        Args:
+            db: Database session.
+            objs_in: Input data for each record.
+            chunk_size: Rows per statement; defaults to
+                ``settings.CRUD_BULK_CHUNK_SIZE``.
+
+        Returns:
+            IDs of the created records, in input order.
+        """
+        rows = [obj_in_to_dict(obj_in) for obj_in in objs_in]
+        if not rows:
+            return []
+
+        statement = insert(self.model).returning(
+            self.model.id, sort_by_parameter_order=True
+        )
+        ids: list[int] = []
+        try:
+            for chunk in _chunks(rows, chunk_size):
+                ids.extend(db.execute(statement, chunk).scalars().all())
+            self._write_events(
+                db, "created", zip(ids, (self._owner_in(row) for row in rows))
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        self._invalidate_cache(
+            owner_ids=[row.get(self.owner_field) for row in rows]
+            if self.owner_field
+            else ()
+        )
+        return ids
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[dict[str, Any]],
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        Update records by ID in a single transaction.
+
+        Each row must contain ``id`` and the columns to change. Rows changing
+        the same columns are sent together as one executemany statement.
+
+        Args:
+            db: Database session.
+            objs_in: Column values for each record, including its ``id``.
+            chunk_size: Rows per statement; defaults to
+                ``settings.CRUD_BULK_CHUNK_SIZE``.
+
+        Returns:
+            Number of rows submitted.
+
+        Raises:
+            ValueError: If a row has no ``id``.
+        """
+        if any(row.get("id") is None for row in objs_in):
+            raise ValueError("Every row passed to update_many needs an id")
+        if not objs_in:
+            return 0
+
+        try:
+            for chunk in _chunks(objs_in, chunk_size):
+                db.execute(update(self.model), list(chunk))
+                if self.events_enabled:
+                    self._write_events(
+                        db, "updated", self._owners(db, [row["id"] for row in chunk])
+                    )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        self._invalidate_cache(ids=[row["id"] for row in objs_in], owner_ids=None)
+        return len(objs_in)
+
+    def remove_many(
+        self, db: Session, *, ids: Sequence[Any], chunk_size: int | None = None
+    ) -> int:
+        """
+        Remove records by ID in a single transaction.
+
+        Args:
+            db: Database session.
+            ids: IDs of the records.
+            chunk_size: IDs per statement; defaults to
+                ``settings.CRUD_BULK_CHUNK_SIZE``.
+
+        Returns:
+            Number of records removed.
+        """
+        removed = 0
+        try:
+            for chunk in _chunks(ids, chunk_size):
+                statement = delete(self.model).where(self.model.id.in_(chunk))
+                if self.events_enabled:
+                    deleted = db.execute(statement.returning(*self._id_and_owner()))
+                    changes = deleted.tuples().all()
+                    self._write_events(db, "deleted", changes)
+                    removed += len(changes)
+                else:
+                    removed += db.execute(statement).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        self._invalidate_cache(ids=ids, owner_ids=None)
+        return removed
+
+    # Async variants, used by endpoints running with DB_MODE=async
+
+    async def get_async(self, db: AsyncSession, id: Any) -> ModelType | None:
+        """
+        Get a record by ID.
+
+        Args:
+            db: Async database session.
+            id: ID of the record.
+
+        Returns:
+            The record if found, None otherwise.
+        """
+        return await db.get(self.model, id)
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> list[ModelType]:
+        """
+        Get multiple records.
+
+        Args:
+            db: Async database session.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+
+        Returns:
+            List of records.
+        """
+        result = await db.scalars(select(self.model).offset(skip).limit(limit))
+        return list(result.all())
+
+    async def get_page_async(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: Sequence[str] = ("id",),
+        filters: Sequence[Any] = (),
+    ) -> Page[ModelType]:
+        """
+        Get a page of records using keyset pagination.
+
+        Args:
+            db: Async database session.
+            cursor: Cursor from the previous page, or None for the first page.
+            limit: Maximum number of records to return.
+            order_by: Names of the columns to sort by, ascending.
+            filters: Extra SQLAlchemy filter expressions.
+
+        Returns:
+            The page of records and the cursor for the next page.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or for another sort key.
+            ValueError: If ``limit`` is less than 1.
+        """
+        statement, keys = self._page_statement(cursor, limit, order_by, filters)
+        result = await db.scalars(statement)
+        return self._to_page(result.all(), keys, limit)
+
+    async def create_async(
+        self, db: AsyncSession, *, obj_in: CreateSchemaType
+    ) -> ModelType:
+        """
+        Create a new record.
+
+        Args:
+            db: Async database session.
+            obj_in: Input data.
+
+        Returns:
+            The created record.
+        """
+        db_obj = self.model(**obj_in_to_dict(obj_in))  # type: ignore
+        db.add(db_obj)
+        if self.events_enabled:
+            await db.flush()
+            await self._write_events_async(
+                db, "created", [(db_obj.id, self._owner_of(db_obj))]
+            )
+        await db.commit()
+        self._invalidate_cache(owner_ids=[self._owner_of(db_obj)])
+        return db_obj
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict[str, Any],
+    ) -> ModelType:
+        """
+        Update a record.
+
+        Args:
+            db: Async database session.
+            db_obj: Database object to update.
+            obj_in: Input data.
+
+        Returns:
+            The updated record.
+        """
+        old_owner_id = self._owner_of(db_obj)
+        if not self._apply_update(db_obj, obj_in):
+            return db_obj
+        db.add(db_obj)
+        await self._write_events_async(
+            db, "updated", [(db_obj.id, self._owner_of(db_obj))]
+        )
+        await db.commit()
+        self._invalidate_cache(
+            ids=[db_obj.id], owner_ids=[old_owner_id, self._owner_of(db_obj)]
+        )
+        return db_obj
+
+    async def remove_async(self, db: AsyncSession, *, id: Any) -> ModelType | None:
+        """
+        Remove a record.
+
+        Args:
+            db: Async database session.
+            id: ID of the record.
+
+        Returns:
+            The removed record, or None if it did not exist.
+        """
+        obj = await db.get(self.model, id)
+        if obj is not None:
+            await db.delete(obj)
+            await self._write_events_async(db, "deleted", [(id, self._owner_of(obj))])
+            await db.commit()
+            self._invalidate_cache(ids=[id], owner_ids=[self._owner_of(obj)])
         return obj
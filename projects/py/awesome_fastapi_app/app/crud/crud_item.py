@@ -2,10 +2,15 @@
 CRUD operations for Item model.
 """
 
-from fastapi.encoders import jsonable_encoder
+from collections.abc import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.core.config import settings
+from app.crud.base import CRUDBase, obj_in_to_dict
+from app.crud.pagination import Page
 from app.models.item import Item
 from app.schemas.item import ItemCreate, ItemUpdate
 
@@ -13,6 +18,15 @@ from app.schemas.item import ItemCreate, ItemUpdate
 class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
     """CRUD operations for Item model."""
 
+    cache_namespace = "items"
+    owner_field = "owner_id"
+    event_name = "item"
+
+    @property
+    def event_topic(self) -> str:  # type: ignore[override]
+        """Pub/Sub topic of item events."""
+        return settings.PUBSUB_TOPIC_ITEM_EVENTS
+
     def create_with_owner(
         self, db: Session, *, obj_in: ItemCreate, owner_id: int
     ) -> Item:
@@ -27,13 +41,39 @@ class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
         Returns:
             The created item.
         """
-        obj_in_data = jsonable_encoder(obj_in)
+        obj_in_data = obj_in_to_dict(obj_in)
         db_obj = Item(**obj_in_data, owner_id=owner_id)
         db.add(db_obj)
+        if self.events_enabled:
+            db.flush()
+            self._write_events(db, "created", [(db_obj.id, owner_id)])
         db.commit()
-        db.refresh(db_obj)
+        self._invalidate_cache(owner_ids=[owner_id])
         return db_obj
 
+    def create_many_with_owner(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[ItemCreate],
+        owner_id: int,
+        chunk_size: int | None = None,
+    ) -> list[int]:
+        """
+        Create items with an owner in a single transaction.
+
+        Args:
+            db: Database session.
+            objs_in: Input data for each item.
+            owner_id: ID of the owner.
+            chunk_size: Rows per statement.
+
+        Returns:
+            IDs of the created items, in input order.
+        """
+        rows = [{**obj_in_to_dict(obj_in), "owner_id": owner_id} for obj_in in objs_in]
+        return self.create_many(db, objs_in=rows, chunk_size=chunk_size)
+
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> list[Item]:
@@ -57,6 +97,99 @@ class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
             .all()
         )
 
+    def get_page_by_owner(
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> Page[Item]:
+        """
+        Get a page of items by owner using keyset pagination.
+
+        Served by the ``(owner_id, id)`` index.
+
+        Args:
+            db: Database session.
+            owner_id: ID of the owner.
+            cursor: Cursor from the previous page, or None for the first page.
+            limit: Maximum number of items to return.
+
+        Returns:
+            The page of items and the cursor for the next page.
+        """
+        return self.get_page(
+            db, cursor=cursor, limit=limit, filters=[Item.owner_id == owner_id]
+        )
+
+    async def create_with_owner_async(
+        self, db: AsyncSession, *, obj_in: ItemCreate, owner_id: int
+    ) -> Item:
+        """
+        Create a new item with an owner.
+
+        Args:
+            db: Async database session.
+            obj_in: Input data.
+            owner_id: ID of the owner.
+
+        Returns:
+            The created item.
+        """
+        db_obj = Item(**obj_in_to_dict(obj_in), owner_id=owner_id)
+        db.add(db_obj)
+        if self.events_enabled:
+            await db.flush()
+            await self._write_events_async(db, "created", [(db_obj.id, owner_id)])
+        await db.commit()
+        self._invalidate_cache(owner_ids=[owner_id])
+        return db_obj
+
+    async def get_multi_by_owner_async(
+        self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100
+    ) -> list[Item]:
+        """
+        Get multiple items by owner.
+
+        Args:
+            db: Async database session.
+            owner_id: ID of the owner.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+
+        Returns:
+            List of items.
+        """
+        result = await db.scalars(
+            select(Item).where(Item.owner_id == owner_id).offset(skip).limit(limit)
+        )
+        return list(result.all())
+
+    async def get_page_by_owner_async(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> Page[Item]:
+        """
+        Get a page of items by owner using keyset pagination.
+
+        Args:
+            db: Async database session.
+            owner_id: ID of the owner.
+            cursor: Cursor from the previous page, or None for the first page.
+            limit: Maximum number of items to return.
+
+        Returns:
+            The page of items and the cursor for the next page.
+        """
+        return await self.get_page_async(
+            db, cursor=cursor, limit=limit, filters=[Item.owner_id == owner_id]
+        )
+
     def get_by_title(self, db: Session, *, title: str) -> Item | None:
         """
         Get an item by title.
@@ -2,15 +2,28 @@
 CRUD operations for User model.
 """
 
+import logging
+from collections.abc import Sequence
 from typing import Any
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.core.security import get_password_hash, verify_password
-from app.crud.base import CRUDBase
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    verify_and_update_password,
+    verify_and_update_password_async,
+)
+from app.core.token_cache import token_cache
+from app.crud.base import CRUDBase, obj_in_to_dict
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
+logger = logging.getLogger(__name__)
+
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     """CRUD operations for User model."""
@@ -48,7 +61,6 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         )
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def update(
@@ -65,15 +77,179 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         Returns:
             The updated user.
         """
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
+        update_data = obj_in_to_dict(obj_in, exclude_unset=True)
         if update_data.get("password"):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        token_cache.invalidate_user(user.id)
+        return user
+
+    def remove(self, db: Session, *, id: Any) -> User:
+        """
+        Remove a user.
+
+        Args:
+            db: Database session.
+            id: ID of the user.
+
+        Returns:
+            The removed user.
+        """
+        user = super().remove(db, id=id)
+        token_cache.invalidate_user(id)
+        return user
+
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[UserCreate | dict[str, Any]],
+        chunk_size: int | None = None,
+    ) -> list[int]:
+        """
+        Create users in a single transaction, hashing their passwords.
+
+        Args:
+            db: Database session.
+            objs_in: Input data for each user.
+            chunk_size: Rows per statement.
+
+        Returns:
+            IDs of the created users, in input order.
+        """
+        rows = []
+        for obj_in in objs_in:
+            row = obj_in_to_dict(obj_in)
+            password = row.pop("password", None)
+            if password:
+                row["hashed_password"] = get_password_hash(password)
+            rows.append(row)
+        return super().create_many(db, objs_in=rows, chunk_size=chunk_size)
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[dict[str, Any]],
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        Update users by ID in a single transaction.
+
+        Args:
+            db: Database session.
+            objs_in: Column values for each user, including its ``id``.
+            chunk_size: Rows per statement.
+
+        Returns:
+            Number of rows submitted.
+        """
+        rows = []
+        for obj_in in objs_in:
+            row = dict(obj_in)
+            password = row.pop("password", None)
+            if password:
+                row["hashed_password"] = get_password_hash(password)
+            rows.append(row)
+        updated = super().update_many(db, objs_in=rows, chunk_size=chunk_size)
+        for row in rows:
+            token_cache.invalidate_user(row["id"])
+        return updated
+
+    def remove_many(
+        self, db: Session, *, ids: Sequence[Any], chunk_size: int | None = None
+    ) -> int:
+        """
+        Remove users by ID in a single transaction.
+
+        Args:
+            db: Database session.
+            ids: IDs of the users.
+            chunk_size: IDs per statement.
+
+        Returns:
+            Number of users removed.
+        """
+        removed = super().remove_many(db, ids=ids, chunk_size=chunk_size)
+        for id in ids:
+            token_cache.invalidate_user(id)
+        return removed
+
+    async def get_by_email_async(self, db: AsyncSession, *, email: str) -> User | None:
+        """
+        Get a user by email.
+
+        Args:
+            db: Async database session.
+            email: Email of the user.
+
+        Returns:
+            The user if found, None otherwise.
+        """
+        result = await db.scalars(select(User).where(User.email == email).limit(1))
+        return result.first()
+
+    async def create_async(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        """
+        Create a new user.
+
+        Args:
+            db: Async database session.
+            obj_in: Input data.
+
+        Returns:
+            The created user.
+        """
+        db_obj = User(
+            email=obj_in.email,
+            hashed_password=await get_password_hash_async(obj_in.password),
+            full_name=obj_in.full_name,
+            is_active=obj_in.is_active,
+            is_superuser=obj_in.is_superuser,
+        )
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def update_async(
+        self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate | dict[str, Any]
+    ) -> User:
+        """
+        Update a user.
+
+        Args:
+            db: Async database session.
+            db_obj: Database object to update.
+            obj_in: Input data.
+
+        Returns:
+            The updated user.
+        """
+        update_data = obj_in_to_dict(obj_in, exclude_unset=True)
+        if update_data.get("password"):
+            hashed_password = await get_password_hash_async(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        user = await super().update_async(db, db_obj=db_obj, obj_in=update_data)
+        token_cache.invalidate_user(user.id)
+        return user
+
+    async def remove_async(self, db: AsyncSession, *, id: Any) -> User | None:
+        """
+        Remove a user.
+
+        Args:
+            db: Async database session.
+            id: ID of the user.
+
+        Returns:
+            The removed user, or None if it did not exist.
+        """
+        user = await super().remove_async(db, id=id)
+        token_cache.invalidate_user(id)
+        return user
 
     def authenticate(self, db: Session, *, email: str, password: str) -> User | None:
         """
@@ -90,10 +266,68 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not verified:
+            return None
+        if new_hash:
+            self._upgrade_password_hash(db, user=user, new_hash=new_hash)
+        return user
+
+    async def authenticate_async(
+        self, db: Session, *, email: str, password: str
+    ) -> User | None:
+        """
+        Authenticate a user from an async endpoint.
+
+        The user lookup runs on the threadpool and the password check on the
+        password hashing pool, so no thread is held while bcrypt runs.
+
+        Args:
+            db: Database session.
+            email: Email of the user.
+            password: Password of the user.
+
+        Returns:
+            The authenticated user if successful, None otherwise.
+
+        Raises:
+            PasswordHashingOverloaded: If the hashing pool is saturated.
+        """
+        user = await run_in_threadpool(self.get_by_email, db, email=email)
+        if not user:
+            return None
+        verified, new_hash = await verify_and_update_password_async(
+            password, user.hashed_password
+        )
+        if not verified:
             return None
+        if new_hash:
+            await run_in_threadpool(
+                self._upgrade_password_hash, db, user=user, new_hash=new_hash
+            )
         return user
 
+    def _upgrade_password_hash(self, db: Session, *, user: User, new_hash: str) -> None:
+        """
+        Store a password hash that was upgraded to the current hash policy.
+
+        Failing to store it only delays the upgrade to the next login, so
+        errors are logged rather than failing the login.
+
+        Args:
+            db: Database session.
+            user: Authenticated user.
+            new_hash: Hash of the same password under the current policy.
+        """
+        try:
+            user.hashed_password = new_hash
+            db.add(user)
+            db.commit()
+            logger.info(f"Upgraded password hash for user {user.id}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error upgrading password hash for user {user.id}: {e}")
+
     def is_active(self, user: User) -> bool:
         """
         Check if a user is active.
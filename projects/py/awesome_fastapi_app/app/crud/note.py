@@ -2,10 +2,14 @@
 CRUD operations for notes.
 """
 
-from fastapi.encoders import jsonable_encoder
+from collections.abc import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, obj_in_to_dict
+from app.crud.pagination import Page
 from app.models.note import Note
 from app.schemas.note import NoteCreate, NoteUpdate
 
@@ -15,6 +19,9 @@ class CRUDNote(CRUDBase[Note, NoteCreate, NoteUpdate]):
     CRUD operations for notes.
     """
 
+    cache_namespace = "notes"
+    owner_field = "user_id"
+
     def create_with_owner(
         self, db: Session, *, obj_in: NoteCreate, owner_id: int
     ) -> Note:
@@ -30,13 +37,36 @@ class CRUDNote(CRUDBase[Note, NoteCreate, NoteUpdate]):
             The created note.
         """
 
-        obj_in_data = jsonable_encoder(obj_in)
+        obj_in_data = obj_in_to_dict(obj_in)
         db_obj = self.model(**obj_in_data, user_id=owner_id)
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
+        self._invalidate_cache(owner_ids=[owner_id])
         return db_obj
 
+    def create_many_with_owner(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[NoteCreate],
+        owner_id: int,
+        chunk_size: int | None = None,
+    ) -> list[int]:
+        """
+        Create notes with an owner in a single transaction.
+
+        Args:
+            db: Database session.
+            objs_in: Input data for each note.
+            owner_id: ID of the owner.
+            chunk_size: Rows per statement.
+
+        Returns:
+            IDs of the created notes, in input order.
+        """
+        rows = [{**obj_in_to_dict(obj_in), "user_id": owner_id} for obj_in in objs_in]
+        return self.create_many(db, objs_in=rows, chunk_size=chunk_size)
+
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> list[Note]:
@@ -61,5 +91,95 @@ class CRUDNote(CRUDBase[Note, NoteCreate, NoteUpdate]):
             .all()
         )
 
+    def get_page_by_owner(
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> Page[Note]:
+        """
+        Get a page of notes by owner using keyset pagination.
+
+        Served by the ``(user_id, id)`` index.
+
+        Args:
+            db: Database session.
+            owner_id: ID of the owner.
+            cursor: Cursor from the previous page, or None for the first page.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            The page of notes and the cursor for the next page.
+        """
+        return self.get_page(
+            db, cursor=cursor, limit=limit, filters=[Note.user_id == owner_id]
+        )
+
+    async def create_with_owner_async(
+        self, db: AsyncSession, *, obj_in: NoteCreate, owner_id: int
+    ) -> Note:
+        """
+        Create a new note with an owner.
+
+        Args:
+            db: Async database session.
+            obj_in: Input data.
+            owner_id: ID of the owner.
+
+        Returns:
+            The created note.
+        """
+        db_obj = Note(**obj_in_to_dict(obj_in), user_id=owner_id)
+        db.add(db_obj)
+        await db.commit()
+        self._invalidate_cache(owner_ids=[owner_id])
+        return db_obj
+
+    async def get_multi_by_owner_async(
+        self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100
+    ) -> list[Note]:
+        """
+        Get multiple notes by owner.
+
+        Args:
+            db: Async database session.
+            owner_id: ID of the owner.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+
+        Returns:
+            List of notes.
+        """
+        result = await db.scalars(
+            select(Note).where(Note.user_id == owner_id).offset(skip).limit(limit)
+        )
+        return list(result.all())
+
+    async def get_page_by_owner_async(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> Page[Note]:
+        """
+        Get a page of notes by owner using keyset pagination.
+
+        Args:
+            db: Async database session.
+            owner_id: ID of the owner.
+            cursor: Cursor from the previous page, or None for the first page.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            The page of notes and the cursor for the next page.
+        """
+        return await self.get_page_async(
+            db, cursor=cursor, limit=limit, filters=[Note.user_id == owner_id]
+        )
+
 
 note = CRUDNote(Note)
@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last row of
+a page. The next page is fetched with ``WHERE (sort key) > (cursor values)``,
+which an index on the sort key answers directly, so deep pages cost the same
+as the first one, unlike ``OFFSET``.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class Page(Generic[T]):
+    """
+    A page of results.
+
+    Attributes:
+        items: Rows on this page.
+        next_cursor: Cursor for the next page, or None if this is the last page.
+    """
+
+    def __init__(self, items: list[T], next_cursor: str | None):
+        """
+        Initialize the page.
+
+        Args:
+            items: Rows on this page.
+            next_cursor: Cursor for the next page.
+        """
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+def _encode_value(value: Any) -> Any:
+    """Make a sort key value JSON serializable."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(keys: Sequence[str], values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page.
+
+    Args:
+        keys: Names of the sort key columns.
+        values: Values of the sort key columns.
+
+    Returns:
+        Opaque cursor string.
+    """
+    payload = {"k": list(keys), "v": [_encode_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> list[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Opaque cursor string.
+        keys: Names of the sort key columns the cursor must have been made for.
+
+    Returns:
+        Sort key values, still JSON-typed.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or for another sort key.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        cursor_keys = payload["k"]
+        values = payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+    if cursor_keys != list(keys) or not isinstance(values, list):
+        raise InvalidCursor("Cursor does not match the sort order")
+    if len(values) != len(keys):
+        raise InvalidCursor("Malformed cursor")
+    return values
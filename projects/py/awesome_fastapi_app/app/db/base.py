@@ -5,3 +5,5 @@ Import all models here to ensure they are registered with SQLAlchemy.
 from app.db.base_class import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.item import Item  # noqa
+from app.models.note import Note  # noqa
+from app.models.outbox import OutboxEvent  # noqa
@@ -13,6 +13,10 @@ from sqlalchemy.sql import func
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
 
+    # Fetch server-generated values (id, created_at, updated_at) with
+    # RETURNING as part of each INSERT/UPDATE instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     # Generate __tablename__ automatically
     @declared_attr.directive
     @classmethod
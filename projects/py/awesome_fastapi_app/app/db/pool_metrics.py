@@ -0,0 +1,185 @@
+"""
+Connection pool instrumentation.
+
+The pool classes here time how long each checkout waits for a connection
+and count the callers currently waiting, which SQLAlchemy's pool events do
+not expose. Together with the pool's own in-use and overflow counts this is
+what is needed to size ``DB_POOL_SIZE`` and ``DB_MAX_OVERFLOW`` per pod.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Number of recent checkout latencies kept for percentiles
+LATENCY_SAMPLES = 1024
+
+
+class PoolMetrics:
+    """Checkout latency and wait-queue counters for one connection pool."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_checkout_seconds = 0.0
+
+    def checkout_started(self) -> None:
+        """Record a caller starting to wait for a connection."""
+        with self._lock:
+            self.waiting += 1
+
+    def checkout_finished(self, elapsed: float, timed_out: bool = False) -> None:
+        """
+        Record the end of a wait for a connection.
+
+        Args:
+            elapsed: Seconds spent waiting.
+            timed_out: Whether the wait ended with a pool timeout.
+        """
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self._latencies.append(elapsed)
+            self.max_checkout_seconds = max(self.max_checkout_seconds, elapsed)
+
+    def stats(self, pool: Pool) -> dict[str, Any]:
+        """
+        Get the counters together with the pool's current state.
+
+        Args:
+            pool: Pool the counters belong to.
+
+        Returns:
+            Dictionary of gauges and counters; latencies are in milliseconds.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waiting = self.waiting
+            checkouts = self.checkouts
+            timeouts = self.timeouts
+            max_seconds = self.max_checkout_seconds
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        return {
+            "pool_size": pool.size(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "waiting": waiting,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "checkout_p50_ms": percentile(0.5) * 1000,
+            "checkout_p99_ms": percentile(0.99) * 1000,
+            "checkout_max_ms": max_seconds * 1000,
+        }
+
+
+class _InstrumentedPoolMixin:
+    """Times ``_do_get``, the pool method that blocks until a connection is free."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self) -> Any:
+        metrics = self.metrics
+        metrics.checkout_started()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            metrics.checkout_finished(time.perf_counter() - start, timed_out=True)
+            raise
+        except BaseException:
+            metrics.checkout_finished(time.perf_counter() - start)
+            raise
+        metrics.checkout_finished(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> Any:
+        # Keep the counters when the engine replaces its pool (e.g. dispose())
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool that records checkout latency and waiters."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the pool and its metrics."""
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout latency and waiters."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the pool and its metrics."""
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+def pool_stats(pool: Pool) -> dict[str, Any] | None:
+    """
+    Get the metrics of an instrumented pool.
+
+    Args:
+        pool: Connection pool.
+
+    Returns:
+        Pool metrics, or None if the pool is not instrumented.
+    """
+    metrics = getattr(pool, "metrics", None)
+    if not isinstance(metrics, PoolMetrics):
+        return None
+    return metrics.stats(pool)
+
+
+def register_pool_gauges(name: str, get_pool: Any) -> None:
+    """
+    Publish pool metrics as OpenTelemetry observable gauges.
+
+    Gauges are only exported when a MeterProvider is configured; otherwise
+    the OpenTelemetry API makes this a no-op.
+
+    Args:
+        name: Pool name, recorded as the ``pool`` attribute.
+        get_pool: Function returning the pool, or None if it does not exist.
+    """
+    try:
+        from opentelemetry.metrics import Observation, get_meter
+    except ImportError:
+        return
+
+    meter = get_meter(__name__)
+
+    def gauge(key: str):
+        def callback(options: Any) -> list[Any]:
+            pool = get_pool()
+            stats = pool_stats(pool) if pool is not None else None
+            if stats is None:
+                return []
+            return [Observation(stats[key], {"pool": name})]
+
+        return callback
+
+    for key in ("in_use", "overflow", "waiting", "checkout_p99_ms"):
+        meter.create_observable_gauge(f"db.pool.{key}", callbacks=[gauge(key)])
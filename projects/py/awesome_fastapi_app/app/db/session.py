@@ -1,19 +1,128 @@
 """
 Database session management.
+
+Engines are created by ``db_engines`` the first time a session needs one,
+not when this module is imported, so importing the application (CLI tools,
+test collection) never touches the database. The FastAPI lifespan warms the
+pool up before the app starts serving and disposes the engines on shutdown.
+
+When ``DB_REPLICA_URLS`` is set, sessions are ``RoutingSession`` instances
+that send plain SELECTs to the read replicas and everything else to the
+primary.
 """
 
 import logging
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AsyncExitStack
+from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, ExceptionContext, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import ClauseElement
 
 from app.core.config import settings
-from app.db.base_class import Base
+from app.db.base_class import Base  # noqa: F401 - models import Base from here
+from app.db.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    register_pool_gauges,
+)
 
 logger = logging.getLogger(__name__)
 
-# Create SQLAlchemy engine
-try:
+
+def get_engine_options(async_driver: bool = False) -> dict[str, Any]:
+    """
+    Get the ``create_engine`` options for the PostgreSQL engines.
+
+    Args:
+        async_driver: Build options for the asyncpg engine.
+
+    Returns:
+        Keyword arguments for ``create_engine`` / ``create_async_engine``.
+    """
+    pool_class = InstrumentedAsyncQueuePool if async_driver else InstrumentedQueuePool
+    options: dict[str, Any] = {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DB_ECHO,
+    }
+
+    connect_args: dict[str, Any] = {}
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if settings.DB_PGBOUNCER:
+        # PgBouncer in transaction mode hands each transaction a different
+        # server connection, so server-side prepared statements cannot be
+        # reused and startup options are rejected. The statement timeout is
+        # set per transaction instead, see _set_local_statement_timeout.
+        if async_driver:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+    elif timeout:
+        if async_driver:
+            connect_args["server_settings"] = {"statement_timeout": str(timeout)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _set_local_statement_timeout(connection: Any) -> None:
+    """Apply the statement timeout to the transaction that just began."""
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}"
+    )
+
+
+def configure_engine(engine: Engine) -> None:
+    """
+    Install the per-transaction hooks an engine needs.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine.
+    """
+    if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT_MS:
+        event.listen(engine, "begin", _set_local_statement_timeout)
+
+
+# Async drivers for the sync engine's database
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def get_async_url(url: URL) -> URL:
+    """
+    Get the async-driver URL for a database URL.
+
+    Args:
+        url: URL of the sync engine.
+
+    Returns:
+        The same URL using asyncpg for PostgreSQL and aiosqlite for SQLite.
+    """
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def get_database_url() -> str:
+    """
+    Build the PostgreSQL URL from the ``POSTGRES_*`` settings.
+
+    Returns:
+        Database URL for the sync driver.
+    """
     # Handle the case where port might be a full TCP URL
     port = settings.POSTGRES_PORT
     if isinstance(port, str) and port.startswith("tcp://"):
@@ -26,34 +135,447 @@ try:
         # Extract just the server address
         server = server.split("//")[1].split(":")[0]
 
-    # Create database URI regardless of whether settings.SQLALCHEMY_DATABASE_URI is set
-    db_uri = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{server}:{port}/{settings.POSTGRES_DB}"
-    logger.info(f"Using database URI: {db_uri}")
-
-    engine = create_engine(
-        db_uri,
-        pool_pre_ping=True,
-        echo=settings.ENVIRONMENT == "development",
+    return (
+        f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{server}:{port}/{settings.POSTGRES_DB}"
     )
-    logger.info("Successfully created database engine")
-
-    # Create session factory
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-except Exception as e:
-    logger.warning(f"Failed to create database engine: {e}")
-    # Create a SQLite in-memory engine for testing
-    logger.warning("Falling back to SQLite in-memory database (for testing only)")
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
+
+
+def get_replica_urls() -> list[str]:
+    """
+    Get the read replica URLs from ``DB_REPLICA_URLS``.
+
+    Returns:
+        Database URLs of the replicas, possibly empty.
+    """
+    return [url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()]
+
+
+class ReplicaSet:
+    """
+    Read replica engines, used round-robin and skipped while they are down.
+
+    A replica is marked down when connecting to it fails or one of its
+    connections is lost, and is tried again after ``retry_seconds``.
+
+    Attributes:
+        engines: Sync engines of the replicas.
+        retry_seconds: How long a replica that is down is skipped.
+    """
+
+    def __init__(self, engines: list[Engine], retry_seconds: float):
+        """
+        Initialize the replica set and watch the engines for connection errors.
+
+        Args:
+            engines: Sync engines of the replicas (``sync_engine`` for async).
+            retry_seconds: How long a replica that is down is skipped.
+        """
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until: dict[Engine, float] = {}
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        """Mark a replica down when it cannot be connected to."""
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+    def mark_down(self, engine: Engine) -> None:
+        """
+        Stop using a replica for ``retry_seconds``.
+
+        Args:
+            engine: Engine of the replica.
+        """
+        with self._lock:
+            was_up = self._down_until.get(engine, 0.0) <= time.monotonic()
+            self._down_until[engine] = time.monotonic() + self.retry_seconds
+        if was_up:
+            logger.warning(
+                f"Read replica {engine.url!r} is down, retrying in "
+                f"{self.retry_seconds}s"
+            )
+
+    def choose(self) -> Engine | None:
+        """
+        Pick the next healthy replica.
+
+        Returns:
+            Replica engine, or None if every replica is down.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[self._next % len(self.engines)]
+                self._next += 1
+                if self._down_until.get(engine, 0.0) <= now:
+                    return engine
+        return None
+
+    def status(self) -> list[dict[str, Any]]:
+        """
+        Get the health of each replica.
+
+        Returns:
+            List with the URL (without password) and health of each replica.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": engine.url.render_as_string(hide_password=True),
+                    "healthy": self._down_until.get(engine, 0.0) <= now,
+                }
+                for engine in self.engines
+            ]
+
+
+# Session.info key that routes all statements of a session to the primary
+USE_PRIMARY = "use_primary"
+
+
+def use_primary(session: Session | AsyncSession) -> None:
+    """
+    Route every further statement of a session to the primary.
+
+    Args:
+        session: Sync or async session.
+    """
+    session.info[USE_PRIMARY] = True
+
+
+def _is_replica_read(clause: ClauseElement | None) -> bool:
+    """Whether a statement is a SELECT that a replica can answer."""
+    return (
+        clause is not None
+        and clause.is_select
+        and getattr(clause, "_for_update_arg", None) is None
     )
 
-    # Create tables in SQLite memory database
-    logger.info("Creating tables in SQLite memory database")
-    Base.metadata.create_all(bind=engine)
 
-    # Create session factory
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a replica and the rest to the primary.
+
+    Once a session writes (or runs anything other than a SELECT) it stays on
+    the primary, so a request always reads its own writes even when the
+    replicas lag behind. Without replicas it behaves like a plain Session.
+
+    Attributes:
+        replicas: Replica engines, or None to use the primary only.
+    """
+
+    def __init__(self, *args: Any, replicas: ReplicaSet | None = None, **kwargs: Any):
+        """
+        Initialize the session.
+
+        Args:
+            *args: Positional arguments for Session.
+            replicas: Replica engines, or None to use the primary only.
+            **kwargs: Keyword arguments for Session.
+        """
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        clause: ClauseElement | None = None,
+        bind: Any = None,
+        **kw: Any,
+    ) -> Any:
+        """Pick the engine for a statement, see the class docstring."""
+        routed = bind is None and self.replicas is not None
+        if routed and not self.info.get(USE_PRIMARY):
+            if self._flushing or not _is_replica_read(clause):
+                use_primary(self)
+            else:
+                replica = self.replicas.choose()
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper, clause=clause, bind=bind, **kw)
+
+
+class EngineRegistry:
+    """
+    Lazily created database engines and their session factories.
+
+    Attributes:
+        url: Database URL of the primary.
+        replica_urls: Database URLs of the read replicas.
+    """
+
+    def __init__(self, url: str | None = None, replica_urls: list[str] | None = None):
+        """
+        Initialize the registry. No engine is created until first use.
+
+        Args:
+            url: Database URL; defaults to the one built from settings.
+            replica_urls: Read replica URLs; default to ``DB_REPLICA_URLS``.
+        """
+        self.url = url
+        self.replica_urls = (
+            replica_urls if replica_urls is not None else get_replica_urls()
+        )
+        self._lock = threading.Lock()
+        self._engine: Engine | None = None
+        self._replicas: ReplicaSet | None = None
+        self._async_engine: AsyncEngine | None = None
+        self._async_replica_engines: list[AsyncEngine] = []
+        self._async_replicas: ReplicaSet | None = None
+        self._sessionmaker: sessionmaker[Session] | None = None
+        self._async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+        self._engine_listeners: list[Callable[[Engine], None]] = []
+
+    @property
+    def engine(self) -> Engine:
+        """The sync engine of the primary, created on first access."""
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._engine = self._create_engine(self.url or get_database_url())
+        return self._engine
+
+    @property
+    def replicas(self) -> ReplicaSet | None:
+        """The sync replica engines, or None if no replicas are configured."""
+        if self._replicas is None and self.replica_urls:
+            with self._lock:
+                if self._replicas is None:
+                    self._replicas = ReplicaSet(
+                        [self._create_engine(url) for url in self.replica_urls],
+                        settings.DB_REPLICA_RETRY_SECONDS,
+                    )
+        return self._replicas
+
+    @property
+    def async_engine(self) -> AsyncEngine | None:
+        """The async engine if it has been created, otherwise None."""
+        return self._async_engine
+
+    @property
+    def async_replicas(self) -> ReplicaSet | None:
+        """The async replica engines if they have been created, otherwise None."""
+        return self._async_replicas
+
+    @property
+    def engine_created(self) -> bool:
+        """Whether the sync engine has been created."""
+        return self._engine is not None
+
+    def _create_engine(self, url: str) -> Engine:
+        """Create a sync engine and run the engine listeners."""
+        url = make_url(url)
+        if url.get_backend_name() == "postgresql":
+            engine = create_engine(url, **get_engine_options())
+            configure_engine(engine)
+        else:
+            engine = create_engine(url)
+        logger.info(f"Created database engine for {engine.url!r}")
+        for listener in self._engine_listeners:
+            listener(engine)
+        return engine
+
+    def on_engine_created(self, listener: Callable[[Engine], None]) -> None:
+        """
+        Register a function to call with each sync engine once it exists.
+
+        Args:
+            listener: Function taking the engine, e.g. to instrument it. Called
+                immediately for engines that already exist.
+        """
+        self._engine_listeners.append(listener)
+        if self._engine is not None:
+            listener(self._engine)
+        if self._replicas is not None:
+            for engine in self._replicas.engines:
+                listener(engine)
+
+    def get_sessionmaker(self) -> sessionmaker[Session]:
+        """
+        Get the session factory for the sync engines.
+
+        Objects stay loaded after commit: CRUD writes get server-generated
+        values through RETURNING, so expiring them would only cost another
+        SELECT when the response is serialized.
+
+        Returns:
+            Factory of routing sessions.
+        """
+        if self._sessionmaker is None:
+            self._sessionmaker = sessionmaker(
+                class_=RoutingSession,
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                bind=self.engine,
+                replicas=self.replicas,
+            )
+        return self._sessionmaker
+
+    def get_async_sessionmaker(self) -> async_sessionmaker[AsyncSession]:
+        """
+        Get the async session factory, creating the async engines on first use.
+
+        The async engines point at the same databases as the sync engines.
+        They are only created when an async endpoint needs them, so sync
+        deployments do not need asyncpg installed.
+
+        Returns:
+            Factory of async sessions that route like ``RoutingSession``.
+        """
+        if self._async_sessionmaker is None:
+            with self._lock:
+                if self._async_sessionmaker is None:
+                    self._async_engine = self._create_async_engine(
+                        self.url or get_database_url()
+                    )
+                    self._async_replica_engines = [
+                        self._create_async_engine(url) for url in self.replica_urls
+                    ]
+                    if self._async_replica_engines:
+                        self._async_replicas = ReplicaSet(
+                            [e.sync_engine for e in self._async_replica_engines],
+                            settings.DB_REPLICA_RETRY_SECONDS,
+                        )
+                    self._async_sessionmaker = async_sessionmaker(
+                        self._async_engine,
+                        sync_session_class=RoutingSession,
+                        autoflush=False,
+                        expire_on_commit=False,
+                        replicas=self._async_replicas,
+                    )
+        return self._async_sessionmaker
+
+    @staticmethod
+    def _create_async_engine(url: str) -> AsyncEngine:
+        """Create the async engine for the database of a sync URL."""
+        async_url = get_async_url(make_url(url))
+        if async_url.get_backend_name() != "postgresql":
+            return create_async_engine(async_url)
+        async_engine = create_async_engine(
+            async_url, **get_engine_options(async_driver=True)
+        )
+        configure_engine(async_engine.sync_engine)
+        logger.info("Created async database engine")
+        return async_engine
+
+    def warm_up(self, connections: int) -> int:
+        """
+        Open pooled connections ahead of the first requests.
+
+        The connections are opened together and then returned to the pool,
+        so the first requests after startup skip the connect handshake.
+        Replicas that cannot be reached are logged and marked down.
+
+        Args:
+            connections: Number of connections to open per engine; capped at
+                the pool size, since overflow connections are not kept.
+
+        Returns:
+            Number of connections opened.
+
+        Raises:
+            Exception: If the primary cannot be connected to.
+        """
+        count = min(connections, settings.DB_POOL_SIZE)
+        opened = _open_connections(self.engine, count)
+        for replica in self.replicas.engines if self.replicas else []:
+            try:
+                opened += _open_connections(replica, count)
+            except Exception as e:
+                logger.warning(f"Read replica warm-up failed: {e}")
+        return opened
+
+    async def warm_up_async(self, connections: int) -> int:
+        """
+        Open pooled connections on the async engines.
+
+        Args:
+            connections: Number of connections to open per engine; capped at
+                the pool size.
+
+        Returns:
+            Number of connections opened.
+        """
+        self.get_async_sessionmaker()
+        count = min(connections, settings.DB_POOL_SIZE)
+        opened = await _open_connections_async(self._async_engine, count)
+        for replica in self._async_replica_engines:
+            try:
+                opened += await _open_connections_async(replica, count)
+            except Exception as e:
+                logger.warning(f"Read replica warm-up failed: {e}")
+        return opened
+
+    def dispose(self) -> None:
+        """Close the sync engines' pooled connections, if they were created."""
+        if self._engine is not None:
+            self._engine.dispose()
+        for replica in self._replicas.engines if self._replicas else []:
+            replica.dispose()
+
+    async def dispose_async(self) -> None:
+        """Close the async engines' pooled connections, if they were created."""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        for replica in self._async_replica_engines:
+            await replica.dispose()
+        self._async_engine = None
+        self._async_replica_engines = []
+        self._async_replicas = None
+        self._async_sessionmaker = None
+
+
+def _open_connections(engine: Engine, count: int) -> int:
+    """Open ``count`` connections on an engine together, then return them."""
+    opened = []
+    try:
+        for _ in range(count):
+            opened.append(engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+async def _open_connections_async(engine: AsyncEngine, count: int) -> int:
+    """Open ``count`` connections on an async engine together, then return them."""
+    opened = 0
+    async with AsyncExitStack() as stack:
+        for _ in range(count):
+            await stack.enter_async_context(engine.connect())
+            opened += 1
+    return opened
+
+
+# Create a singleton instance for global use
+db_engines = EngineRegistry()
+
+
+def SessionLocal() -> Session:  # noqa: N802 - kept from the sessionmaker it replaces
+    """
+    Create a session on the sync engine.
+
+    Returns:
+        Database session.
+    """
+    return db_engines.get_sessionmaker()()
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Get the async session factory, creating the async engine on first use.
+
+    Returns:
+        Async session factory.
+    """
+    return db_engines.get_async_sessionmaker()
 
 
 def get_db():
@@ -68,3 +590,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+register_pool_gauges(
+    "sync", lambda: db_engines.engine.pool if db_engines.engine_created else None
+)
+register_pool_gauges(
+    "async",
+    lambda: db_engines.async_engine.pool if db_engines.async_engine else None,
+)
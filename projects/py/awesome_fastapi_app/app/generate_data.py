@@ -0,0 +1,80 @@
+"""
+Script to fill the database with a large deterministic synthetic dataset.
+
+Usage example:
+    python -m app.generate_data --seed 42 --users 1000 --items 1000000 \\
+        --notes 1000000 --report dataset-report.json
+"""
+
+import argparse
+import json
+import logging
+
+from libs.py.logging_config.models.logging_config import configure_logging
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.utils.synthetic_data import METHODS, SyntheticDataGenerator
+
+configure_logging(settings)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Arguments, defaults to ``sys.argv``.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the dataset")
+    parser.add_argument("--users", type=int, default=100, help="Users to create")
+    parser.add_argument("--items", type=int, default=1000, help="Items to create")
+    parser.add_argument("--notes", type=int, default=1000, help="Notes to create")
+    parser.add_argument(
+        "--batch-size", type=int, default=10000, help="Rows written per transaction"
+    )
+    parser.add_argument(
+        "--method",
+        choices=METHODS,
+        default="auto",
+        help="COPY (PostgreSQL only) or multi-row INSERT; auto picks COPY if possible",
+    )
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Main function.
+
+    Args:
+        argv: Arguments, defaults to ``sys.argv``.
+    """
+    args = parse_args(argv)
+    generator = SyntheticDataGenerator(
+        seed=args.seed,
+        users=args.users,
+        items=args.items,
+        notes=args.notes,
+        batch_size=args.batch_size,
+        method=args.method,
+    )
+    logger.info("Generating synthetic data")
+    db = SessionLocal()
+    try:
+        report = generator.run(db)
+    finally:
+        db.close()
+    logger.info(f"Synthetic data generated: {json.dumps(report)}")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,13 @@ Script to initialize the database with a superuser.
 
 import logging
 
+from libs.py.logging_config.models.logging_config import configure_logging
+
+from app.core.config import settings
 from app.db.init_db import init_db
 from app.db.session import SessionLocal
 
-logging.basicConfig(level=logging.INFO)
+configure_logging(settings)
 logger = logging.getLogger(__name__)
 
 
@@ -2,45 +2,122 @@
 Main FastAPI application.
 """
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from libs.py.logging_config.models.logging_config import configure_logging
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.v1.api import api_router
 from app.core.config import settings
-from app.core.telemetry import setup_telemetry
-from app.db.session import engine
+from app.core.hashing_pool import PasswordHashingOverloaded, password_hash_pool
+from app.core.request_logging import AccessLogMiddleware
+from app.core.secret_rotation import secret_manager
+from app.core.startup import startup_profile
+from app.core.telemetry import instrument_sqlalchemy, setup_telemetry
+from app.core.token_cache import token_cache
+from app.db.session import db_engines
+from app.pubsub.provisioning import provision_pubsub
+from app.pubsub.publisher import pubsub_publisher
+from app.pubsub.subscriber import pubsub_subscriber
+from app.services.outbox_relay import outbox_relay
+from app.services.seed_jobs import seed_jobs
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(settings)
 logger = logging.getLogger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging requests."""
+def _clear_token_cache(keyring: Any) -> None:
+    """Drop cached tokens when the JWT keyring changes, e.g. a key is retired."""
+    token_cache.clear()
 
-    async def dispatch(self, request: Request, call_next: Any) -> Any:
-        """
-        Log request information.
 
-        Args:
-            request: Request object.
-            call_next: Next middleware.
+async def warm_up_database() -> None:
+    """
+    Open pooled database connections before the app starts serving.
+
+    A database that is unreachable at startup is logged and left to the
+    first requests, unless ``DB_WARMUP_REQUIRED`` is set.
+    """
+    connections = settings.DB_WARMUP_CONNECTIONS
+    if connections <= 0:
+        return
+    try:
+        opened = await run_in_threadpool(db_engines.warm_up, connections)
+        if settings.DB_MODE == "async":
+            opened += await db_engines.warm_up_async(connections)
+        logger.info(f"Warmed up {opened} database connections")
+    except Exception as e:
+        if settings.DB_WARMUP_REQUIRED:
+            raise
+        logger.warning(f"Database warm-up failed: {e}")
+
+
+async def provision_pubsub_resources() -> None:
+    """
+    Create missing Pub/Sub topics and subscriptions before serving.
+
+    Provisioning is bounded by ``PUBSUB_PROVISION_TIMEOUT_SECONDS``; a
+    failure is logged and publishing is left to fail on its own.
+    """
+    if not settings.PUBSUB_PROVISION_ON_STARTUP or not pubsub_publisher.enabled:
+        return
+    timeout = settings.PUBSUB_PROVISION_TIMEOUT_SECONDS
+    try:
+        await asyncio.wait_for(run_in_threadpool(provision_pubsub, timeout), timeout)
+    except Exception as e:
+        logger.warning(f"Pub/Sub provisioning failed: {e!r}")
 
-        Returns:
-            Response from the next middleware.
-        """
-        logger.info(f"Request: {request.method} {request.url.path}")
-        response = await call_next(request)
-        logger.info(f"Response status: {response.status_code}")
-        return response
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start background services and warm up the database, then shut them down.
+
+    Args:
+        app: FastAPI application instance.
+    """
+    startup_profile.start()
+    with startup_profile.phase("secret_rotation"):
+        # Start background key rotation and keep the token cache in sync with it
+        secret_manager.subscribe(_clear_token_cache)
+        secret_manager.start_scheduler()
+    with startup_profile.phase("database_warmup"):
+        await warm_up_database()
+    with startup_profile.phase("pubsub_provisioning"):
+        await provision_pubsub_resources()
+    if settings.OUTBOX_ENABLED:
+        with startup_profile.phase("outbox_relay"):
+            outbox_relay.start()
+    startup_profile.finish()
+    startup_profile.log_report()
+
+    yield
+
+    secret_manager.stop_scheduler()
+    secret_manager.unsubscribe(_clear_token_cache)
+    password_hash_pool.shutdown(wait=False)
+    seed_jobs.shutdown(wait=False)
+    outbox_relay.stop()
+    # Settle received messages while dead letters can still be published
+    await run_in_threadpool(
+        pubsub_subscriber.close, settings.PUBSUB_FLUSH_TIMEOUT_SECONDS
+    )
+    # Send the messages still batched in the publisher before exiting
+    await run_in_threadpool(pubsub_publisher.flush)
+    await db_engines.dispose_async()
+    db_engines.dispose()
 
 
 # Initialize rate limiter
@@ -53,6 +130,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/swagger",
     redoc_url="/docs",
+    lifespan=lifespan,
 )
 
 # Add rate limiter to app state and exception handler
@@ -67,19 +145,22 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
-# Add request logging middleware
-app.add_middleware(RequestLoggingMiddleware)
+# Log one record per sampled request
+if settings.REQUEST_LOG_ENABLED:
+    app.add_middleware(AccessLogMiddleware)
 
 # Set up OpenTelemetry
 if settings.ENABLE_TELEMETRY:
     setup_telemetry(
         app=app,
-        sqlalchemy_engine=engine,
         service_name=settings.OTLP_SERVICE_NAME,
         exporter_endpoint=settings.OTLP_EXPORTER_ENDPOINT,
     )
+    # The engine is created on first use, after telemetry is set up
+    db_engines.on_engine_created(instrument_sqlalchemy)
 
 
 @app.get("/")
@@ -108,6 +189,28 @@ def health() -> Any:
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.exception_handler(PasswordHashingOverloaded)
+async def password_hashing_overloaded_handler(
+    request: Request, exc: PasswordHashingOverloaded
+) -> JSONResponse:
+    """
+    Reject requests with 429 while the password hashing pool is saturated.
+
+    Args:
+        request: Request object.
+        exc: Exception.
+
+    Returns:
+        JSON response asking the client to retry later.
+    """
+    logger.warning(f"Password hashing pool saturated: {exc}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many authentication requests, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """
@@ -2,7 +2,7 @@
 Item model.
 """
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -25,3 +25,6 @@ class Item(Base):
     is_active = Column(Boolean, default=True)
     owner_id = Column(Integer, ForeignKey("user.id"), nullable=True)
     owner = relationship("User", back_populates="items")
+
+    # Serves keyset pagination of a user's items: WHERE owner_id = ? AND id > ?
+    __table_args__ = (Index("ix_item_owner_id_id", "owner_id", "id"),)
@@ -2,7 +2,7 @@
 Note model.
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -23,3 +23,6 @@ class Note(Base):
     content = Column(Text, nullable=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=True)
     user = relationship("User", back_populates="notes")
+
+    # Serves keyset pagination of a user's notes: WHERE user_id = ? AND id > ?
+    __table_args__ = (Index("ix_note_user_id_id", "user_id", "id"),)
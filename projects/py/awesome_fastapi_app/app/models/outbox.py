@@ -0,0 +1,34 @@
+"""
+Outbox event model.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+
+from app.db.session import Base
+
+
+class OutboxEvent(Base):
+    """
+    Event waiting to be relayed to Pub/Sub.
+
+    Events are written in the same transaction as the change they describe
+    and deleted by the relay once Pub/Sub has accepted them.
+
+    Attributes:
+        topic: Pub/Sub topic name.
+        ordering_key: Pub/Sub ordering key; events with the same key are
+            published in ID order.
+        payload: Message body.
+        attributes: Message attributes.
+        attempts: Number of failed publish attempts.
+        next_attempt_at: Earliest time of the next attempt after a failure.
+        last_error: Error of the last failed attempt.
+    """
+
+    topic = Column(String(255), nullable=False)
+    ordering_key = Column(String(255), nullable=False, default="")
+    payload = Column(JSON, nullable=False)
+    attributes = Column(JSON, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
@@ -0,0 +1,231 @@
+"""
+Serialization of Pub/Sub message payloads.
+
+Every published message carries a ``content-type`` attribute naming the
+codec that encoded it, and subscribers decode each message with the codec
+registered for that content type. Messages without the attribute were
+published as JSON, which stays the default.
+
+Available codecs:
+    ``application/json``: orjson when installed, the standard library
+        otherwise; both produce the same JSON.
+    ``application/msgpack``: MessagePack; requires the msgpack package.
+    ``ITEM_EVENT_CONTENT_TYPE``: the ``ItemEvent`` protobuf schema of item
+        events, see ``app/pubsub/item_event.proto``.
+
+Usage example:
+    from app.pubsub.codecs import get_codec
+
+    codec = get_codec("application/msgpack")
+    data = codec.encode({"action": "item_created", "item_id": 1})
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Attribute naming the codec of a message
+CONTENT_TYPE_ATTRIBUTE = "content-type"
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+ITEM_EVENT_CONTENT_TYPE = "application/x-protobuf; messageType=awesome.ItemEvent"
+
+
+class JSONCodec:
+    """JSON payloads, encoded with orjson when it is installed."""
+
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, message: Any) -> bytes:
+        """Encode a message."""
+        if orjson is not None:
+            return orjson.dumps(message)
+        return json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decode a message.
+
+        Raises:
+            ValueError: If the data is not valid JSON.
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data.decode("utf-8"))
+
+
+class MsgpackCodec:
+    """MessagePack payloads."""
+
+    content_type = MSGPACK_CONTENT_TYPE
+
+    def __init__(self):
+        """
+        Initialize the codec.
+
+        Raises:
+            RuntimeError: If the msgpack package is not installed.
+        """
+        try:
+            import msgpack
+        except ImportError as e:
+            raise RuntimeError(
+                f"{MSGPACK_CONTENT_TYPE} payloads require the msgpack package"
+            ) from e
+        self._msgpack = msgpack
+
+    def encode(self, message: Any) -> bytes:
+        """Encode a message."""
+        return self._msgpack.packb(message)
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decode a message.
+
+        Raises:
+            ValueError: If the data is not valid MessagePack.
+        """
+        return self._msgpack.unpackb(data)
+
+
+def _item_event_class() -> type:
+    """Build the ``ItemEvent`` message class, as in ``item_event.proto``."""
+    file = descriptor_pb2.FileDescriptorProto(
+        name="awesome/item_event.proto", package="awesome", syntax="proto3"
+    )
+    message = file.message_type.add(name="ItemEvent")
+    for number, (name, kind) in enumerate(
+        [
+            ("action", descriptor_pb2.FieldDescriptorProto.TYPE_STRING),
+            ("item_id", descriptor_pb2.FieldDescriptorProto.TYPE_INT64),
+            ("owner_id", descriptor_pb2.FieldDescriptorProto.TYPE_INT64),
+        ],
+        start=1,
+    ):
+        message.field.add(
+            name=name,
+            number=number,
+            type=kind,
+            label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL,
+        )
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file)
+    return message_factory.GetMessageClass(
+        pool.FindMessageTypeByName("awesome.ItemEvent")
+    )
+
+
+class ProtobufCodec:
+    """Payloads of one flat protobuf message type, exchanged as dicts."""
+
+    def __init__(self, message_class: type, content_type: str):
+        """
+        Initialize the codec.
+
+        Args:
+            message_class: Generated protobuf message class.
+            content_type: Content type naming the message type.
+        """
+        self.message_class = message_class
+        self.content_type = content_type
+        self._fields = [field.name for field in message_class.DESCRIPTOR.fields]
+
+    def encode(self, message: dict[str, Any]) -> bytes:
+        """
+        Encode a message; None values are left unset.
+
+        Raises:
+            ValueError: If the message has a field the schema does not.
+        """
+        fields = {key: value for key, value in message.items() if value is not None}
+        unknown = fields.keys() - set(self._fields)
+        if unknown:
+            raise ValueError(f"Fields not in the schema: {sorted(unknown)}")
+        return self.message_class(**fields).SerializeToString()
+
+    def decode(self, data: bytes) -> dict[str, Any]:
+        """
+        Decode a message, with defaults for unset fields.
+
+        Raises:
+            ValueError: If the data is not a valid message.
+        """
+        try:
+            message = self.message_class.FromString(data)
+        except Exception as e:
+            raise ValueError(f"Invalid {self.content_type} payload: {e}") from e
+        return {name: getattr(message, name) for name in self._fields}
+
+
+CODECS: dict[str, Callable[[], Any]] = {
+    JSON_CONTENT_TYPE: JSONCodec,
+    MSGPACK_CONTENT_TYPE: MsgpackCodec,
+    ITEM_EVENT_CONTENT_TYPE: lambda: ProtobufCodec(
+        _item_event_class(), ITEM_EVENT_CONTENT_TYPE
+    ),
+}
+
+_instances: dict[str, Any] = {}
+
+
+def register_codec(content_type: str, factory: Callable[[], Any]) -> None:
+    """
+    Register a codec for a content type.
+
+    Args:
+        content_type: Content type of the messages the codec handles.
+        factory: Callable returning the codec, called on first use.
+    """
+    CODECS[content_type] = factory
+    _instances.pop(content_type, None)
+
+
+def get_codec(content_type: str | None = None) -> Any:
+    """
+    Get the codec of a content type.
+
+    Args:
+        content_type: Content type; JSON if None or empty.
+
+    Returns:
+        Codec with ``content_type``, ``encode`` and ``decode``.
+
+    Raises:
+        ValueError: If no codec is registered for the content type.
+        RuntimeError: If the codec's package is not installed.
+    """
+    content_type = content_type or JSON_CONTENT_TYPE
+    if content_type not in _instances:
+        if content_type not in CODECS:
+            raise ValueError(f"No codec for content type {content_type!r}")
+        _instances[content_type] = CODECS[content_type]()
+    return _instances[content_type]
+
+
+def decode_message(data: bytes, attributes: dict[str, str]) -> Any:
+    """
+    Decode a message with the codec named by its content type attribute.
+
+    Args:
+        data: Message data.
+        attributes: Message attributes.
+
+    Returns:
+        Decoded payload.
+
+    Raises:
+        ValueError: If the content type is unknown or the data is invalid.
+    """
+    try:
+        codec = get_codec(attributes.get(CONTENT_TYPE_ATTRIBUTE))
+    except RuntimeError as e:
+        raise ValueError(str(e)) from e
+    return codec.decode(data)
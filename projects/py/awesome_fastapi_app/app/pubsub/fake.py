@@ -0,0 +1,328 @@
+"""
+In-process Pub/Sub transport for tests and local load runs.
+
+With ``PUBSUB_TRANSPORT=fake`` the publisher and subscriber use
+``FakePublisherClient`` and ``FakeSubscriberClient`` instead of gRPC clients.
+They share a ``FakeBroker`` that keeps topics and subscriptions in memory and
+delivers each published message to every subscription of its topic, so the
+whole publish, batch, ack and dead-letter path runs without the emulator.
+
+The fake mirrors the parts of the client API the app uses: publishes resolve
+immediately, nacked messages are redelivered, and streaming pulls stop
+delivering once ``FlowControl.max_messages`` messages are leased.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any
+
+from google.api_core.exceptions import AlreadyExists, NotFound
+
+logger = logging.getLogger(__name__)
+
+# Project ID of the fake transport when GCP_PROJECT_ID is not set
+FAKE_PROJECT_ID = "local"
+
+
+class FakeMessage:
+    """Message leased from a fake subscription."""
+
+    def __init__(
+        self,
+        subscription: "FakeSubscription",
+        message_id: str,
+        data: bytes,
+        attributes: dict[str, str],
+        ordering_key: str,
+        publish_time: datetime,
+    ):
+        """
+        Initialize the message.
+
+        Args:
+            subscription: Subscription the message was leased from.
+            message_id: Message ID.
+            data: Message data.
+            attributes: Message attributes.
+            ordering_key: Ordering key the message was published with.
+            publish_time: Time the message was published.
+        """
+        self.subscription = subscription
+        self.message_id = message_id
+        self.data = data
+        self.attributes = attributes
+        self.ordering_key = ordering_key
+        self.publish_time = publish_time
+        self.delivery_attempt: int | None = None
+        self.size = len(data)
+        self._settled = False
+
+    def ack(self) -> None:
+        """Remove the message from the subscription."""
+        self._settle(redeliver=False)
+
+    def nack(self) -> None:
+        """Make the message available for redelivery."""
+        self._settle(redeliver=True)
+
+    def _settle(self, redeliver: bool) -> None:
+        """Ack or nack the message once."""
+        if self._settled:
+            return
+        self._settled = True
+        self.subscription.settle(self, redeliver)
+
+
+class FakeSubscription:
+    """Queue of the messages of one subscription."""
+
+    def __init__(self, name: str, topic: str):
+        """
+        Initialize the subscription.
+
+        Args:
+            name: Subscription path.
+            topic: Topic path.
+        """
+        self.name = name
+        self.topic = topic
+        self.queue: queue.Queue = queue.Queue()
+        self.acked = 0
+        self.redelivered = 0
+        self._leases: threading.Semaphore | None = None
+
+    def settle(self, message: FakeMessage, redeliver: bool) -> None:
+        """Ack or nack a leased message."""
+        if redeliver:
+            self.redelivered += 1
+            self.queue.put(
+                (
+                    message.message_id,
+                    message.data,
+                    message.attributes,
+                    message.ordering_key,
+                    message.publish_time,
+                )
+            )
+        else:
+            self.acked += 1
+        if self._leases is not None:
+            self._leases.release()
+
+
+class FakeStreamingPullFuture(Future):
+    """Handle of a streaming pull, cancelled to stop delivering messages."""
+
+    def __init__(self):
+        super().__init__()
+        self.stopped = threading.Event()
+
+    def cancel(self) -> bool:
+        """Stop delivering messages."""
+        self.stopped.set()
+        if not self.done():
+            self.set_result(None)
+        return True
+
+
+class FakeBroker:
+    """In-memory topics and subscriptions shared by the fake clients."""
+
+    def __init__(self):
+        """Initialize an empty broker."""
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.topics: set[str] = set()
+        self.subscriptions: dict[str, FakeSubscription] = {}
+
+    def create_topic(self, name: str) -> None:
+        """Create a topic, raising ``AlreadyExists`` if it exists."""
+        with self._lock:
+            if name in self.topics:
+                raise AlreadyExists(f"Topic already exists: {name}")
+            self.topics.add(name)
+
+    def create_subscription(self, name: str, topic: str) -> None:
+        """Create a subscription, raising ``AlreadyExists`` if it exists."""
+        with self._lock:
+            if name in self.subscriptions:
+                raise AlreadyExists(f"Subscription already exists: {name}")
+            if topic not in self.topics:
+                raise NotFound(f"Topic not found: {topic}")
+            self.subscriptions[name] = FakeSubscription(name, topic)
+
+    def publish(
+        self, topic: str, data: bytes, attributes: dict[str, str], ordering_key: str
+    ) -> str:
+        """
+        Deliver a message to every subscription of a topic.
+
+        Topics are created on first publish, so messages can be published
+        before provisioning.
+
+        Returns:
+            Message ID.
+        """
+        with self._lock:
+            self.topics.add(topic)
+            message_id = str(next(self._ids))
+            subscriptions = [
+                subscription
+                for subscription in self.subscriptions.values()
+                if subscription.topic == topic
+            ]
+        publish_time = datetime.now(timezone.utc)
+        for subscription in subscriptions:
+            subscription.queue.put(
+                (message_id, data, attributes, ordering_key, publish_time)
+            )
+        return message_id
+
+    def subscription(self, name: str) -> FakeSubscription:
+        """Get a subscription, raising ``NotFound`` if it does not exist."""
+        with self._lock:
+            if name not in self.subscriptions:
+                raise NotFound(f"Subscription not found: {name}")
+            return self.subscriptions[name]
+
+    def reset(self) -> None:
+        """Remove all topics and subscriptions."""
+        with self._lock:
+            self.topics.clear()
+            self.subscriptions.clear()
+
+
+class FakePublisherClient:
+    """Stand-in for ``pubsub_v1.PublisherClient`` backed by a broker."""
+
+    def __init__(self, broker: FakeBroker):
+        """
+        Initialize the client.
+
+        Args:
+            broker: Broker to publish to.
+        """
+        self.broker = broker
+        self.stopped = False
+
+    @staticmethod
+    def topic_path(project_id: str, topic_name: str) -> str:
+        """Get the path of a topic."""
+        return f"projects/{project_id}/topics/{topic_name}"
+
+    def create_topic(self, request: dict[str, Any], **kwargs: Any) -> None:
+        """Create a topic."""
+        self.broker.create_topic(request["name"])
+
+    def publish(
+        self, topic: str, data: bytes, ordering_key: str = "", **attributes: str
+    ) -> Future:
+        """
+        Publish a message.
+
+        Returns:
+            Future, already resolved with the message ID.
+
+        Raises:
+            RuntimeError: If the client was stopped.
+        """
+        if self.stopped:
+            raise RuntimeError("Cannot publish on a stopped publisher.")
+        future: Future = Future()
+        future.set_result(self.broker.publish(topic, data, attributes, ordering_key))
+        return future
+
+    def resume_publish(self, topic: str, ordering_key: str) -> None:
+        """Publishes never fail, so there is nothing to resume."""
+
+    def stop(self) -> None:
+        """Stop accepting messages."""
+        self.stopped = True
+
+
+class FakeSubscriberClient:
+    """Stand-in for ``pubsub_v1.SubscriberClient`` backed by a broker."""
+
+    def __init__(self, broker: FakeBroker):
+        """
+        Initialize the client.
+
+        Args:
+            broker: Broker to pull from.
+        """
+        self.broker = broker
+
+    topic_path = staticmethod(FakePublisherClient.topic_path)
+
+    @staticmethod
+    def subscription_path(project_id: str, subscription_name: str) -> str:
+        """Get the path of a subscription."""
+        return f"projects/{project_id}/subscriptions/{subscription_name}"
+
+    def create_subscription(self, request: dict[str, Any], **kwargs: Any) -> None:
+        """Create a subscription."""
+        self.broker.create_subscription(request["name"], request["topic"])
+
+    def subscribe(
+        self,
+        subscription: str,
+        callback: Callable[[FakeMessage], Any],
+        flow_control: Any = None,
+        **kwargs: Any,
+    ) -> FakeStreamingPullFuture:
+        """
+        Deliver the messages of a subscription to a callback from a thread.
+
+        Args:
+            subscription: Subscription path.
+            callback: Called with each leased message.
+            flow_control: Limits leased messages to its ``max_messages``.
+
+        Returns:
+            Future that stops delivery when cancelled.
+        """
+        fake_subscription = self.broker.subscription(subscription)
+        max_messages = getattr(flow_control, "max_messages", 0)
+        if max_messages:
+            fake_subscription._leases = threading.Semaphore(max_messages)
+        future = FakeStreamingPullFuture()
+        threading.Thread(
+            target=self._deliver,
+            args=(fake_subscription, callback, future),
+            name=f"fake-pull-{subscription.rsplit('/', 1)[-1]}",
+            daemon=True,
+        ).start()
+        return future
+
+    @staticmethod
+    def _deliver(
+        subscription: FakeSubscription,
+        callback: Callable[[FakeMessage], Any],
+        future: FakeStreamingPullFuture,
+    ) -> None:
+        """Lease messages and pass them to the callback until cancelled."""
+        while not future.stopped.is_set():
+            leases = subscription._leases
+            if leases is not None and not leases.acquire(timeout=0.1):
+                continue
+            try:
+                entry = subscription.queue.get(timeout=0.1)
+            except queue.Empty:
+                if leases is not None:
+                    leases.release()
+                continue
+            message = FakeMessage(subscription, *entry)
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"Error in fake subscriber callback: {e}")
+                message.nack()
+
+
+# Create a singleton instance
+fake_broker = FakeBroker()
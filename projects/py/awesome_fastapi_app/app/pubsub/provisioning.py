@@ -0,0 +1,82 @@
+"""
+Creation of the app's Pub/Sub topics and subscriptions.
+
+Provisioning runs once at startup, or from deployment tooling, instead of in
+the publisher and subscriber constructors. It is idempotent: existing topics
+and subscriptions are left as they are.
+"""
+
+import logging
+import time
+
+from app.core.config import settings
+from app.pubsub.publisher import PubSubPublisher, pubsub_publisher
+from app.pubsub.subscriber import PubSubSubscriber, pubsub_subscriber
+
+logger = logging.getLogger(__name__)
+
+
+def required_topics() -> list[str]:
+    """
+    Get the topics the app publishes to.
+
+    Returns:
+        Topic names, without duplicates.
+    """
+    topics = [
+        settings.PUBSUB_TOPIC_EXAMPLE,
+        settings.PUBSUB_TOPIC_ITEM_EVENTS,
+        f"{settings.PUBSUB_SUBSCRIPTION_EXAMPLE}"
+        f"{settings.PUBSUB_DEAD_LETTER_TOPIC_SUFFIX}",
+    ]
+    return list(dict.fromkeys(topics))
+
+
+def required_subscriptions() -> list[tuple[str, str]]:
+    """
+    Get the subscriptions the app pulls from.
+
+    Returns:
+        ``(topic, subscription)`` name pairs.
+    """
+    return [(settings.PUBSUB_TOPIC_EXAMPLE, settings.PUBSUB_SUBSCRIPTION_EXAMPLE)]
+
+
+def provision_pubsub(
+    timeout: float | None = None,
+    publisher: PubSubPublisher | None = None,
+    subscriber: PubSubSubscriber | None = None,
+) -> None:
+    """
+    Create missing topics and subscriptions.
+
+    Args:
+        timeout: Seconds for the whole provisioning; defaults to
+            ``settings.PUBSUB_PROVISION_TIMEOUT_SECONDS``.
+        publisher: Publisher creating the topics; defaults to the global one.
+        subscriber: Subscriber creating the subscriptions; defaults to the
+            global one.
+
+    Raises:
+        TimeoutError: If the time ran out before everything was created.
+    """
+    publisher = publisher or pubsub_publisher
+    subscriber = subscriber or pubsub_subscriber
+    timeout = (
+        timeout if timeout is not None else settings.PUBSUB_PROVISION_TIMEOUT_SECONDS
+    )
+    deadline = time.monotonic() + timeout
+
+    def remaining() -> float:
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise TimeoutError(f"Pub/Sub provisioning took longer than {timeout}s")
+        return left
+
+    for topic_name in required_topics():
+        publisher.ensure_topic_exists(topic_name, timeout=remaining())
+    for topic_name, subscription_name in required_subscriptions():
+        subscriber.ensure_subscription_exists(
+            topic_name, subscription_name, timeout=remaining()
+        )
+    logger.info("Provisioned Pub/Sub topics and subscriptions")
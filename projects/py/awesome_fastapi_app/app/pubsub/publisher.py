@@ -1,48 +1,145 @@
 """
 Google Cloud Pub/Sub publisher service.
+
+Messages can be published in two ways. ``publish_message`` waits for the
+message ID. ``publish_nowait`` returns as soon as the message is handed to the
+client, which batches messages according to ``BatchSettings`` and sends them
+from its own threads; the outcome is recorded by a completion callback. The
+messages awaiting a result form a bounded in-memory outbox: once it holds
+``PUBSUB_OUTBOX_MAX_MESSAGES`` messages or ``PUBSUB_OUTBOX_MAX_BYTES`` bytes,
+new messages are dropped and counted instead of blocking the caller.
+
+Payloads are encoded with the codec of their topic's content type, which is
+sent in the ``content-type`` attribute; see ``app.pubsub.codecs``.
+
+Messages given an ordering key are delivered in publish order per key when
+``PUBSUB_ENABLE_MESSAGE_ORDERING`` is set. After a failed publish the client
+rejects further messages with that key until ``resume`` is called.
 """
 
-import json
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from typing import Any
 
 from google.api_core.exceptions import AlreadyExists
 from google.cloud import pubsub_v1
+from google.cloud.pubsub_v1.types import (
+    BatchSettings,
+    LimitExceededBehavior,
+    PublisherOptions,
+    PublishFlowControl,
+)
 
 from app.core.config import settings
+from app.pubsub.codecs import CONTENT_TYPE_ATTRIBUTE, get_codec
+from app.pubsub.fake import FAKE_PROJECT_ID, FakePublisherClient, fake_broker
 
 logger = logging.getLogger(__name__)
 
+# Number of recent publish latencies kept for percentiles
+LATENCY_SAMPLES = 1024
+
+
+def pubsub_configured() -> bool:
+    """Whether Pub/Sub clients can be created from settings."""
+    return bool(settings.GCP_PROJECT_ID) or settings.PUBSUB_TRANSPORT == "fake"
+
+
+def pubsub_project_id() -> str:
+    """Get the project of topics and subscriptions."""
+    if settings.PUBSUB_TRANSPORT == "fake":
+        return settings.GCP_PROJECT_ID or FAKE_PROJECT_ID
+    return settings.GCP_PROJECT_ID
+
+
+def create_publisher_client() -> Any:
+    """
+    Create a publisher client with batching and flow control from settings.
+
+    Returns:
+        Publisher client, backed by the in-process broker when
+        ``PUBSUB_TRANSPORT`` is ``fake``.
+    """
+    if settings.PUBSUB_TRANSPORT == "fake":
+        return FakePublisherClient(fake_broker)
+    return pubsub_v1.PublisherClient(
+        batch_settings=BatchSettings(
+            max_messages=settings.PUBSUB_BATCH_MAX_MESSAGES,
+            max_bytes=settings.PUBSUB_BATCH_MAX_BYTES,
+            max_latency=settings.PUBSUB_BATCH_MAX_LATENCY_SECONDS,
+        ),
+        publisher_options=PublisherOptions(
+            enable_message_ordering=settings.PUBSUB_ENABLE_MESSAGE_ORDERING,
+            flow_control=PublishFlowControl(
+                message_limit=settings.PUBSUB_OUTBOX_MAX_MESSAGES,
+                byte_limit=settings.PUBSUB_OUTBOX_MAX_BYTES,
+                # Never block a request on a full outbox
+                limit_exceeded_behavior=LimitExceededBehavior.ERROR,
+            ),
+        ),
+    )
+
 
 class PubSubPublisher:
     """Google Cloud Pub/Sub publisher service."""
 
-    def __init__(self):
-        """Initialize the publisher client."""
-        self.project_id = settings.GCP_PROJECT_ID
+    def __init__(self, client: Any = None):
+        """
+        Initialize the publisher.
+
+        The client is created on first use, so importing the publisher does
+        not open gRPC channels.
 
-        # Skip initialization if project ID is not set
-        if not self.project_id:
+        Args:
+            client: Publisher client to use instead of one created from
+                settings.
+        """
+        self.project_id = pubsub_project_id()
+        self.max_pending = settings.PUBSUB_OUTBOX_MAX_MESSAGES
+        self.max_pending_bytes = settings.PUBSUB_OUTBOX_MAX_BYTES
+        self.content_type = settings.PUBSUB_CONTENT_TYPE
+        self.topic_content_types = {
+            settings.PUBSUB_TOPIC_ITEM_EVENTS: settings.PUBSUB_ITEM_EVENTS_CONTENT_TYPE
+        }
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.pending = 0
+        self.pending_bytes = 0
+        self.published = 0
+        self.failed = 0
+        self.dropped = 0
+
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.enabled = client is not None or pubsub_configured()
+        if not self.enabled:
             logger.warning(
                 "GCP_PROJECT_ID is not set. PubSub publisher will not be initialized."
             )
-            self.publisher = None
-            return
 
-        self.publisher = pubsub_v1.PublisherClient()
+    @property
+    def publisher(self) -> Any:
+        """Publisher client, created on first use; None if not configured."""
+        if self._client is None and self.enabled:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = create_publisher_client()
+        return self._client
 
-        # Create topics if they don't exist
-        try:
-            self._ensure_topic_exists(settings.PUBSUB_TOPIC_EXAMPLE)
-        except Exception as e:
-            logger.error(f"Failed to ensure topic exists: {e}")
-
-    def _ensure_topic_exists(self, topic_name: str) -> None:
+    def ensure_topic_exists(
+        self, topic_name: str, timeout: float | None = None
+    ) -> None:
         """
         Ensure that a topic exists, creating it if it doesn't.
 
         Args:
             topic_name: Name of the topic.
+            timeout: Seconds to wait for Pub/Sub.
         """
         if not self.publisher:
             return
@@ -50,11 +147,99 @@ class PubSubPublisher:
         topic_path = self.publisher.topic_path(self.project_id, topic_name)
 
         try:
-            self.publisher.create_topic(request={"name": topic_path})
+            self.publisher.create_topic(request={"name": topic_path}, timeout=timeout)
             logger.info(f"Created topic: {topic_path}")
         except AlreadyExists:
             logger.info(f"Topic already exists: {topic_path}")
 
+    def codec_for(self, topic_name: str) -> Any:
+        """
+        Get the codec of the payloads published to a topic.
+
+        Args:
+            topic_name: Name of the topic.
+
+        Returns:
+            Codec of the topic's content type, or of ``PUBSUB_CONTENT_TYPE``.
+        """
+        return get_codec(self.topic_content_types.get(topic_name, self.content_type))
+
+    def _submit(
+        self,
+        topic_name: str,
+        message: dict[str, Any] | bytes,
+        attributes: dict[str, str] | None,
+        ordering_key: str = "",
+    ) -> Future | None:
+        """
+        Hand a message to the client and track it until it completes.
+
+        Returns:
+            Future of the message ID, or None if the outbox is full.
+        """
+        if not isinstance(message, bytes):
+            codec = self.codec_for(topic_name)
+            message = codec.encode(message)
+            attributes = {
+                **(attributes or {}),
+                CONTENT_TYPE_ATTRIBUTE: codec.content_type,
+            }
+        data = message
+        with self._lock:
+            if (
+                self.pending >= self.max_pending
+                or self.pending_bytes + len(data) > self.max_pending_bytes
+            ):
+                self.dropped += 1
+                return None
+            self.pending += 1
+            self.pending_bytes += len(data)
+
+        started = time.perf_counter()
+        topic_path = self.publisher.topic_path(self.project_id, topic_name)
+        # Only pass an ordering key when set, the client rejects keys
+        # unless message ordering is enabled
+        options = {"ordering_key": ordering_key} if ordering_key else {}
+        try:
+            future = self.publisher.publish(
+                topic_path, data=data, **options, **attributes or {}
+            )
+        except Exception as e:
+            # Flow control limits or a stopped client
+            self._finish(len(data))
+            with self._lock:
+                self.dropped += 1
+            logger.warning(f"Dropped message to {topic_name}: {e}")
+            return None
+        future.add_done_callback(
+            lambda future: self._on_done(future, topic_name, len(data), started)
+        )
+        return future
+
+    def _on_done(
+        self, future: Future, topic_name: str, size: int, started: float
+    ) -> None:
+        """Record the outcome and latency of a publish."""
+        elapsed = time.perf_counter() - started
+        error = future.exception()
+        with self._lock:
+            if error is None:
+                self.published += 1
+                self._latencies.append(elapsed)
+            else:
+                self.failed += 1
+        if error is not None:
+            logger.error(f"Failed to publish message to {topic_name}: {error}")
+        self._finish(size)
+
+    def _finish(self, size: int) -> None:
+        """Remove a message from the outbox."""
+        with self._lock:
+            self.pending -= 1
+            self.pending_bytes -= size
+            if self.pending == 0:
+                self._idle.notify_all()
+
     def publish_message(
         self,
         topic_name: str,
@@ -62,7 +247,7 @@ class PubSubPublisher:
         attributes: dict[str, str] | None = None,
     ) -> str:
         """
-        Publish a message to a topic.
+        Publish a message to a topic and wait for its ID.
 
         Args:
             topic_name: Name of the topic.
@@ -71,6 +256,9 @@ class PubSubPublisher:
 
         Returns:
             str: Message ID.
+
+        Raises:
+            RuntimeError: If the outbox is full.
         """
         if not self.publisher:
             logger.warning(
@@ -78,21 +266,142 @@ class PubSubPublisher:
             )
             return "not-published"
 
+        future = self._submit(topic_name, message, attributes)
+        if future is None:
+            raise RuntimeError("PubSub outbox is full")
+
+        # Get message ID
+        message_id = future.result(timeout=settings.PUBSUB_PUBLISH_TIMEOUT_SECONDS)
+        logger.debug(f"Published message with ID: {message_id}")
+
+        return message_id
+
+    def publish_nowait(
+        self,
+        topic_name: str,
+        message: dict[str, Any],
+        attributes: dict[str, str] | None = None,
+    ) -> bool:
+        """
+        Queue a message for publishing without waiting for the result.
+
+        Args:
+            topic_name: Name of the topic.
+            message: Message to publish.
+            attributes: Optional attributes to include with the message.
+
+        Returns:
+            Whether the message was queued; False if the publisher is not
+            initialized or the outbox is full.
+        """
+        if not self.publisher:
+            return False
+        return self._submit(topic_name, message, attributes) is not None
+
+    def publish(
+        self,
+        topic_name: str,
+        message: dict[str, Any] | bytes,
+        attributes: dict[str, str] | None = None,
+        ordering_key: str = "",
+    ) -> Future | None:
+        """
+        Queue a message for publishing and return its future.
+
+        Args:
+            topic_name: Name of the topic.
+            message: Message to publish; bytes are sent as they are, without
+                a content type.
+            attributes: Optional attributes to include with the message.
+            ordering_key: Messages with the same key are delivered in
+                publish order.
+
+        Returns:
+            Future of the message ID, or None if the publisher is not
+            initialized or the outbox is full.
+        """
+        if not self.publisher:
+            return None
+        return self._submit(topic_name, message, attributes, ordering_key)
+
+    def resume(self, topic_name: str, ordering_key: str) -> None:
+        """
+        Accept messages with an ordering key again after a failed publish.
+
+        Args:
+            topic_name: Name of the topic.
+            ordering_key: Ordering key of the failed message.
+        """
+        if not self.publisher or not ordering_key:
+            return
         topic_path = self.publisher.topic_path(self.project_id, topic_name)
+        try:
+            self.publisher.resume_publish(topic_path, ordering_key)
+        except ValueError:
+            # Message ordering is disabled
+            pass
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Send all batched messages now and stop accepting new ones.
+
+        Meant for shutdown: messages published afterwards are dropped.
 
-        # Convert message to JSON string
-        message_json = json.dumps(message).encode("utf-8")
+        Args:
+            timeout: Seconds to wait for outstanding messages to complete;
+                defaults to ``settings.PUBSUB_FLUSH_TIMEOUT_SECONDS``.
 
-        # Publish message
-        future = self.publisher.publish(
-            topic_path, data=message_json, **attributes if attributes else {}
+        Returns:
+            Whether every outstanding message completed in time.
+        """
+        if self._client is None:
+            return True
+        timeout = (
+            timeout if timeout is not None else settings.PUBSUB_FLUSH_TIMEOUT_SECONDS
         )
+        try:
+            self.publisher.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping PubSub publisher: {e}")
+        with self._lock:
+            done = self._idle.wait_for(lambda: self.pending == 0, timeout=timeout)
+            if not done:
+                logger.warning(
+                    f"{self.pending} PubSub messages still pending after {timeout}s"
+                )
+        return done
 
-        # Get message ID
-        message_id = future.result()
-        logger.info(f"Published message with ID: {message_id}")
+    def stats(self) -> dict[str, Any]:
+        """
+        Get publishing counters.
 
-        return message_id
+        Returns:
+            Dictionary with outbox depth, outcome counters and publish
+            latency in milliseconds.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "enabled": self.enabled,
+                "pending": self.pending,
+                "pending_bytes": self.pending_bytes,
+                "max_pending": self.max_pending,
+                "published": self.published,
+                "failed": self.failed,
+                "dropped": self.dropped,
+            }
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        stats.update(
+            latency_p50_ms=percentile(0.5) * 1000,
+            latency_p99_ms=percentile(0.99) * 1000,
+            latency_max_ms=latencies[-1] * 1000 if latencies else 0.0,
+        )
+        return stats
 
 
 # Create a singleton instance
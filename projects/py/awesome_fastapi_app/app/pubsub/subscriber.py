@@ -1,47 +1,470 @@
 """
 Google Cloud Pub/Sub subscriber service.
+
+The streaming pull client leases messages up to the ``FlowControl`` limits
+and hands them to ``Subscription.receive``, which only buffers them. Full
+batches, or whatever arrived within ``PUBSUB_SUBSCRIBER_BATCH_MAX_WAIT_SECONDS``,
+are decoded with the codec named by their ``content-type`` attribute and
+passed as a list to the callback on an executor: a thread pool, or an
+asyncio event loop for coroutine callbacks. Acks and nacks are sent by the
+client in batches.
+
+A callback fails messages by raising, which fails the whole batch, or by
+returning the messages that failed. Failed messages are redelivered until
+they reach ``PUBSUB_SUBSCRIBER_MAX_DELIVERY_ATTEMPTS``, then published to the
+subscription's dead-letter topic and acked. Messages that cannot be decoded
+are dead-lettered right away.
 """
 
-import json
+import asyncio
 import logging
-from collections.abc import Callable
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Any
 
 from google.api_core.exceptions import AlreadyExists, NotFound
 from google.cloud import pubsub_v1
+from google.cloud.pubsub_v1.types import FlowControl
 
 from app.core.config import settings
+from app.pubsub.codecs import decode_message
+from app.pubsub.fake import FakeSubscriberClient, fake_broker
+from app.pubsub.publisher import pubsub_configured, pubsub_project_id, pubsub_publisher
 
 logger = logging.getLogger(__name__)
 
+# Number of recent lag and batch duration samples kept for percentiles
+LATENCY_SAMPLES = 1024
+
+# Messages whose failed attempts are counted in process, for subscriptions
+# without a dead-letter policy, where Pub/Sub does not count them
+TRACKED_ATTEMPTS = 10000
+
+
+class ReceivedMessage:
+    """Decoded Pub/Sub message passed to batch callbacks."""
+
+    def __init__(self, message: Any, data: Any):
+        """
+        Initialize the message.
+
+        Args:
+            message: Message received from the client.
+            data: Decoded message data.
+        """
+        self.message = message
+        self.data = data
+        self.attributes = dict(message.attributes)
+        self.message_id = message.message_id
+        self.publish_time = message.publish_time
+        self.delivery_attempt = message.delivery_attempt
+
+
+BatchCallback = Callable[[list[ReceivedMessage]], Iterable[ReceivedMessage] | None]
+AsyncBatchCallback = Callable[
+    [list[ReceivedMessage]], Awaitable[Iterable[ReceivedMessage] | None]
+]
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    """Get a percentile of sorted samples, or 0 without samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class Subscription:
+    """Batching, acking and metrics of one subscription."""
+
+    def __init__(
+        self,
+        name: str,
+        callback: BatchCallback | AsyncBatchCallback,
+        executor: Executor | asyncio.AbstractEventLoop | None = None,
+        batch_size: int | None = None,
+        max_wait: float | None = None,
+        dead_letter_topic: str | None = None,
+        max_delivery_attempts: int | None = None,
+    ):
+        """
+        Initialize the subscription.
+
+        Args:
+            name: Name of the subscription.
+            callback: Called with each batch of messages; returns the messages
+                that failed, if any. A coroutine function when ``executor``
+                is an event loop.
+            executor: Where callbacks run; defaults to a thread pool of
+                ``settings.PUBSUB_SUBSCRIBER_WORKERS`` threads.
+            batch_size: Maximum messages per callback; defaults to
+                ``settings.PUBSUB_SUBSCRIBER_BATCH_SIZE``.
+            max_wait: Seconds to wait for a batch to fill; defaults to
+                ``settings.PUBSUB_SUBSCRIBER_BATCH_MAX_WAIT_SECONDS``.
+            dead_letter_topic: Topic of messages that keep failing; empty to
+                redeliver them forever. Defaults to the subscription name with
+                ``settings.PUBSUB_DEAD_LETTER_TOPIC_SUFFIX``.
+            max_delivery_attempts: Attempts before a message is dead-lettered;
+                defaults to ``settings.PUBSUB_SUBSCRIBER_MAX_DELIVERY_ATTEMPTS``.
+        """
+        self.name = name
+        self.callback = callback
+        self.batch_size = batch_size or settings.PUBSUB_SUBSCRIBER_BATCH_SIZE
+        self.max_wait = (
+            max_wait
+            if max_wait is not None
+            else settings.PUBSUB_SUBSCRIBER_BATCH_MAX_WAIT_SECONDS
+        )
+        self.dead_letter_topic = (
+            dead_letter_topic
+            if dead_letter_topic is not None
+            else f"{name}{settings.PUBSUB_DEAD_LETTER_TOPIC_SUFFIX}"
+        )
+        self.max_delivery_attempts = (
+            max_delivery_attempts or settings.PUBSUB_SUBSCRIBER_MAX_DELIVERY_ATTEMPTS
+        )
+
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=settings.PUBSUB_SUBSCRIBER_WORKERS,
+            thread_name_prefix=f"pubsub-{name}",
+        )
+        self.future: Any = None
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._buffer: list[Any] = []
+        self._timer: threading.Timer | None = None
+        self._closed = False
+        self._attempts: OrderedDict[str, int] = OrderedDict()
+        self._lags: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._durations: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.started = time.monotonic()
+        self.in_flight = 0
+        self.received = 0
+        self.acked = 0
+        self.nacked = 0
+        self.dead_lettered = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    def receive(self, message: Any) -> None:
+        """
+        Buffer a message from the streaming pull client.
+
+        Runs on the client's callback threads, so it only buffers; the batch
+        is processed on the executor once it is full or ``max_wait`` passed.
+
+        Args:
+            message: Pub/Sub message.
+        """
+        lag = self._lag(message)
+        with self._lock:
+            if self._closed:
+                message.nack()
+                return
+            self.received += 1
+            self.in_flight += 1
+            if lag is not None:
+                self._lags.append(lag)
+            self._buffer.append(message)
+            batch = self._take_batch(full_only=True)
+            if not batch and self._timer is None:
+                self._timer = threading.Timer(self.max_wait, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._dispatch(batch)
+
+    def _take_batch(self, full_only: bool) -> list[Any]:
+        """Remove a batch from the buffer; called with the lock held."""
+        if not self._buffer or (full_only and len(self._buffer) < self.batch_size):
+            return []
+        batch = self._buffer[: self.batch_size]
+        del self._buffer[: self.batch_size]
+        if self._timer is not None and not self._buffer:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush(self) -> None:
+        """Dispatch the messages buffered for ``max_wait``."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batches = []
+            while batch := self._take_batch(full_only=False):
+                batches.append(batch)
+        for batch in batches:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[Any]) -> None:
+        """Process a batch on the executor."""
+        try:
+            if isinstance(self.executor, asyncio.AbstractEventLoop):
+                asyncio.run_coroutine_threadsafe(
+                    self._process_async(batch), self.executor
+                )
+            else:
+                self.executor.submit(self._process, batch)
+        except RuntimeError as e:
+            # Executor shut down or event loop closed
+            logger.warning(f"Could not process batch of {self.name}: {e}")
+            self._settle([], [], batch)
+
+    def _decode(self, batch: list[Any]) -> list[ReceivedMessage]:
+        """Decode a batch, dead-lettering messages that cannot be decoded."""
+        messages = []
+        for message in batch:
+            try:
+                data = decode_message(message.data, message.attributes)
+            except ValueError as e:
+                self._dead_letter(message, f"undecodable: {e}")
+                self._release(1)
+                continue
+            messages.append(ReceivedMessage(message, data))
+        return messages
+
+    def _process(self, batch: list[Any]) -> None:
+        """Decode a batch, run the callback and settle the messages."""
+        messages = self._decode(batch)
+        if not messages:
+            return
+        started = time.perf_counter()
+        try:
+            failed = self.callback(messages)  # type: ignore[assignment]
+        except Exception as e:
+            logger.error(f"Error processing batch of {self.name}: {e}")
+            failed = messages
+        self._finish_batch(messages, failed, started)
+
+    async def _process_async(self, batch: list[Any]) -> None:
+        """Decode a batch, await the callback and settle the messages."""
+        messages = self._decode(batch)
+        if not messages:
+            return
+        started = time.perf_counter()
+        try:
+            failed = await self.callback(messages)  # type: ignore[misc]
+        except Exception as e:
+            logger.error(f"Error processing batch of {self.name}: {e}")
+            failed = messages
+        self._finish_batch(messages, failed, started)
+
+    def _finish_batch(
+        self,
+        messages: list[ReceivedMessage],
+        failed: Iterable[ReceivedMessage] | None,
+        started: float,
+    ) -> None:
+        """Record a processed batch and ack or retry its messages."""
+        failed_ids = {message.message_id for message in failed or ()}
+        with self._lock:
+            self.batches += 1
+            self.failed_batches += bool(failed_ids)
+            self._durations.append(time.perf_counter() - started)
+        self._settle(
+            [m.message for m in messages if m.message_id not in failed_ids],
+            [m.message for m in messages if m.message_id in failed_ids],
+        )
+
+    def _settle(
+        self, succeeded: list[Any], failed: list[Any], dropped: Sequence[Any] = ()
+    ) -> None:
+        """
+        Ack processed messages and retry or dead-letter failed ones.
+
+        Args:
+            succeeded: Messages to ack.
+            failed: Messages whose processing failed.
+            dropped: Messages that were not processed; nacked without
+                counting an attempt.
+        """
+        for message in succeeded:
+            message.ack()
+        retried = 0
+        for message in failed:
+            if self._failed_attempt(message) >= self.max_delivery_attempts and (
+                self.dead_letter_topic
+            ):
+                self._dead_letter(message, "max delivery attempts exceeded")
+            else:
+                message.nack()
+                retried += 1
+        for message in dropped:
+            message.nack()
+        with self._lock:
+            self.acked += len(succeeded)
+            self.nacked += retried + len(dropped)
+        self._release(len(succeeded) + len(failed) + len(dropped))
+
+    def _failed_attempt(self, message: Any) -> int:
+        """Count a failed attempt and get the number of attempts so far."""
+        if message.delivery_attempt:
+            # Counted by Pub/Sub when the subscription has a dead-letter policy
+            return message.delivery_attempt
+        with self._lock:
+            attempts = self._attempts.pop(message.message_id, 0) + 1
+            if attempts < self.max_delivery_attempts:
+                self._attempts[message.message_id] = attempts
+                if len(self._attempts) > TRACKED_ATTEMPTS:
+                    self._attempts.popitem(last=False)
+        return attempts
+
+    def _dead_letter(self, message: Any, reason: str) -> None:
+        """Publish a message to the dead-letter topic, then ack it."""
+        if not self.dead_letter_topic:
+            message.nack()
+            return
+        attributes = {
+            **message.attributes,
+            "dead_letter_reason": reason,
+            "source_subscription": self.name,
+            "source_message_id": message.message_id,
+        }
+        future = pubsub_publisher.publish(
+            self.dead_letter_topic, message.data, attributes
+        )
+        if future is None:
+            message.nack()
+            return
+
+        def on_done(future: Future) -> None:
+            if future.exception() is None:
+                message.ack()
+            else:
+                logger.error(
+                    f"Failed to dead-letter message {message.message_id}: "
+                    f"{future.exception()}"
+                )
+                message.nack()
+
+        future.add_done_callback(on_done)
+        with self._lock:
+            self.dead_lettered += 1
+        logger.warning(
+            f"Dead-lettered message {message.message_id} of {self.name}: {reason}"
+        )
+
+    def _release(self, count: int) -> None:
+        """Mark messages as no longer in flight."""
+        with self._lock:
+            self.in_flight -= count
+            if self.in_flight == 0:
+                self._idle.notify_all()
+
+    @staticmethod
+    def _lag(message: Any) -> float | None:
+        """Get the seconds between publishing and receiving a message."""
+        publish_time = getattr(message, "publish_time", None)
+        if not isinstance(publish_time, datetime):
+            return None
+        if publish_time.tzinfo is None:
+            publish_time = publish_time.replace(tzinfo=timezone.utc)
+        return max((datetime.now(timezone.utc) - publish_time).total_seconds(), 0.0)
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Stop pulling messages and wait for buffered messages to be processed.
+
+        Args:
+            timeout: Seconds to wait for messages in flight.
+
+        Returns:
+            Whether every message in flight was settled in time.
+        """
+        if self.future is not None:
+            self.future.cancel()
+        with self._lock:
+            self._closed = True
+        self._flush()
+        with self._lock:
+            done = self._idle.wait_for(lambda: self.in_flight == 0, timeout=timeout)
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)  # type: ignore[union-attr]
+        return done
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get subscription counters.
+
+        Returns:
+            Dictionary with message outcomes, throughput in acked messages per
+            second, and delivery lag and batch duration in milliseconds.
+        """
+        with self._lock:
+            lags = sorted(self._lags)
+            durations = sorted(self._durations)
+            elapsed = time.monotonic() - self.started
+            return {
+                "received": self.received,
+                "acked": self.acked,
+                "nacked": self.nacked,
+                "dead_lettered": self.dead_lettered,
+                "in_flight": self.in_flight,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "messages_per_second": self.acked / elapsed if elapsed > 0 else 0.0,
+                "lag_p50_ms": _percentile(lags, 0.5) * 1000,
+                "lag_p99_ms": _percentile(lags, 0.99) * 1000,
+                "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+                "batch_p50_ms": _percentile(durations, 0.5) * 1000,
+                "batch_p99_ms": _percentile(durations, 0.99) * 1000,
+            }
+
+
+def create_subscriber_client() -> Any:
+    """
+    Create a subscriber client.
+
+    Returns:
+        Subscriber client, backed by the in-process broker when
+        ``PUBSUB_TRANSPORT`` is ``fake``.
+    """
+    if settings.PUBSUB_TRANSPORT == "fake":
+        return FakeSubscriberClient(fake_broker)
+    return pubsub_v1.SubscriberClient()
+
 
 class PubSubSubscriber:
     """Google Cloud Pub/Sub subscriber service."""
 
-    def __init__(self):
-        """Initialize the subscriber client."""
-        self.project_id = settings.GCP_PROJECT_ID
+    def __init__(self, client: Any = None):
+        """
+        Initialize the subscriber.
+
+        The client is created on first use, so importing the subscriber does
+        not open gRPC channels.
+
+        Args:
+            client: Subscriber client to use instead of a new one.
+        """
+        self.project_id = pubsub_project_id()
+        self.subscriptions: dict[str, Subscription] = {}
 
-        # Skip initialization if project ID is not set
-        if not self.project_id:
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.enabled = client is not None or pubsub_configured()
+        if not self.enabled:
             logger.warning(
                 "GCP_PROJECT_ID is not set. PubSub subscriber will not be initialized."
             )
-            self.subscriber = None
-            return
 
-        self.subscriber = pubsub_v1.SubscriberClient()
+    @property
+    def subscriber(self) -> Any:
+        """Subscriber client, created on first use; None if not configured."""
+        if self._client is None and self.enabled:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = create_subscriber_client()
+        return self._client
 
-        # Create subscriptions if they don't exist
-        try:
-            self._ensure_subscription_exists(
-                settings.PUBSUB_TOPIC_EXAMPLE, settings.PUBSUB_SUBSCRIPTION_EXAMPLE
-            )
-        except Exception as e:
-            logger.error(f"Failed to ensure subscription exists: {e}")
-
-    def _ensure_subscription_exists(
-        self, topic_name: str, subscription_name: str
+    def ensure_subscription_exists(
+        self, topic_name: str, subscription_name: str, timeout: float | None = None
     ) -> None:
         """
         Ensure that a subscription exists, creating it if it doesn't.
@@ -49,6 +472,7 @@ class PubSubSubscriber:
         Args:
             topic_name: Name of the topic.
             subscription_name: Name of the subscription.
+            timeout: Seconds to wait for Pub/Sub.
         """
         if not self.subscriber:
             return
@@ -60,7 +484,8 @@ class PubSubSubscriber:
 
         try:
             self.subscriber.create_subscription(
-                request={"name": subscription_path, "topic": topic_path}
+                request={"name": subscription_path, "topic": topic_path},
+                timeout=timeout,
             )
             logger.info(f"Created subscription: {subscription_path}")
         except AlreadyExists:
@@ -68,58 +493,124 @@ class PubSubSubscriber:
         except NotFound:
             logger.error(f"Topic not found: {topic_path}")
 
-    def subscribe(
+    def subscribe_batch(
         self,
         subscription_name: str,
-        callback: Callable[[dict[str, Any], dict[str, str]], None],
-    ) -> pubsub_v1.subscriber.futures.StreamingPullFuture | None:
+        callback: BatchCallback | AsyncBatchCallback,
+        executor: Executor | asyncio.AbstractEventLoop | None = None,
+        batch_size: int | None = None,
+        max_wait: float | None = None,
+        flow_control: FlowControl | None = None,
+        dead_letter_topic: str | None = None,
+        max_delivery_attempts: int | None = None,
+    ) -> Subscription | None:
         """
-        Subscribe to a subscription and process messages.
+        Subscribe to a subscription and process messages in batches.
 
         Args:
             subscription_name: Name of the subscription.
-            callback: Callback function to process messages.
+            callback: Called with each batch of decoded messages; returns the
+                messages that failed, if any. A coroutine function when
+                ``executor`` is an event loop.
+            executor: Thread pool or event loop running the callback; defaults
+                to a thread pool of ``settings.PUBSUB_SUBSCRIBER_WORKERS``.
+            batch_size: Maximum messages per callback.
+            max_wait: Seconds to wait for a batch to fill.
+            flow_control: Limits on leased messages; defaults to the
+                ``PUBSUB_SUBSCRIBER_MAX_*`` settings.
+            dead_letter_topic: Topic of messages that keep failing; empty to
+                redeliver them forever.
+            max_delivery_attempts: Attempts before a message is dead-lettered.
 
         Returns:
-            StreamingPullFuture: Future for the subscription, or None if subscriber is not initialized.
+            Subscription, or None if the subscriber is not initialized.
         """
         if not self.subscriber:
             logger.warning("PubSub subscriber is not initialized. Cannot subscribe.")
             return None
 
+        subscription = Subscription(
+            subscription_name,
+            callback,
+            executor=executor,
+            batch_size=batch_size,
+            max_wait=max_wait,
+            dead_letter_topic=dead_letter_topic,
+            max_delivery_attempts=max_delivery_attempts,
+        )
         subscription_path = self.subscriber.subscription_path(
             self.project_id, subscription_name
         )
+        subscription.future = self.subscriber.subscribe(
+            subscription_path,
+            subscription.receive,
+            flow_control=flow_control
+            or FlowControl(
+                max_messages=settings.PUBSUB_SUBSCRIBER_MAX_MESSAGES,
+                max_bytes=settings.PUBSUB_SUBSCRIBER_MAX_BYTES,
+                max_lease_duration=settings.PUBSUB_SUBSCRIBER_MAX_LEASE_SECONDS,
+            ),
+        )
+        self.subscriptions[subscription_name] = subscription
+        logger.info(f"Subscribed to {subscription_path}")
 
-        def process_message(message: pubsub_v1.subscriber.message.Message) -> None:
-            """
-            Process a Pub/Sub message.
+        return subscription
 
-            Args:
-                message: Pub/Sub message.
-            """
-            logger.info(f"Received message: {message.message_id}")
+    def subscribe(
+        self,
+        subscription_name: str,
+        callback: Callable[[dict[str, Any], dict[str, str]], None],
+    ) -> pubsub_v1.subscriber.futures.StreamingPullFuture | None:
+        """
+        Subscribe to a subscription and process messages one at a time.
 
-            try:
-                # Parse message data
-                data = json.loads(message.data.decode("utf-8"))
+        Messages are still received in batches; a failing message only fails
+        itself.
+
+        Args:
+            subscription_name: Name of the subscription.
+            callback: Callback function to process messages.
 
-                # Call callback with data and attributes
-                callback(data, dict(message.attributes))
+        Returns:
+            StreamingPullFuture: Future for the subscription, or None if
+            subscriber is not initialized.
+        """
 
-                # Acknowledge message
-                message.ack()
+        def process_batch(messages: list[ReceivedMessage]) -> list[ReceivedMessage]:
+            failed = []
+            for message in messages:
+                try:
+                    callback(message.data, message.attributes)
+                except Exception as e:
+                    logger.error(f"Error processing message {message.message_id}: {e}")
+                    failed.append(message)
+            return failed
 
-                logger.info(f"Processed message: {message.message_id}")
-            except Exception as e:
-                logger.error(f"Error processing message {message.message_id}: {str(e)}")
-                message.nack()
+        subscription = self.subscribe_batch(subscription_name, process_batch)
+        return subscription.future if subscription else None
 
-        # Subscribe to the subscription
-        future = self.subscriber.subscribe(subscription_path, process_message)
-        logger.info(f"Subscribed to {subscription_path}")
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Close all subscriptions.
+
+        Args:
+            timeout: Seconds to wait for each subscription's messages in flight.
+        """
+        for subscription in list(self.subscriptions.values()):
+            subscription.close(timeout)
+        self.subscriptions.clear()
 
-        return future
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the counters of each subscription.
+
+        Returns:
+            Mapping of subscription name to its counters.
+        """
+        return {
+            name: subscription.stats()
+            for name, subscription in self.subscriptions.items()
+        }
 
 
 # Create a singleton instance
@@ -2,12 +2,14 @@
 Schemas initialization.
 """
 
+from app.schemas.bulk import BulkCreated
 from app.schemas.item import Item, ItemCreate, ItemInDB, ItemUpdate
 from app.schemas.note import Note, NoteCreate, NoteInDB, NoteUpdate
 from app.schemas.token import Token, TokenPayload
 from app.schemas.user import User, UserCreate, UserInDB, UserUpdate, UserWithItems
 
 __all__ = [
+    "BulkCreated",
     "Item",
     "ItemCreate",
     "ItemInDB",
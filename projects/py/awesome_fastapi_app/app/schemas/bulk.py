@@ -0,0 +1,16 @@
+"""
+Bulk operation schemas.
+"""
+
+from pydantic import BaseModel
+
+
+class BulkCreated(BaseModel):
+    """
+    Schema for the result of a bulk create.
+
+    Attributes:
+        ids: IDs of the created records, in request order.
+    """
+
+    ids: list[int]
@@ -0,0 +1,276 @@
+"""
+Relay of outbox events to Pub/Sub.
+
+CRUD writes add ``OutboxEvent`` rows in their own transaction, so an event
+exists if and only if its change was committed. ``OutboxRelay`` drains the
+table from a background thread: it claims the oldest due events with
+``SELECT ... FOR UPDATE``, publishes them as one batch, deletes the ones
+Pub/Sub accepted and schedules the others for a retry with exponential
+backoff. Events are delivered at least once.
+
+Events with the same ordering key are published in ID order. While an event
+waits for its retry, later events with its key are held back, and the key is
+resumed on the publisher so the retry is accepted. The lock is a plain
+blocking ``FOR UPDATE`` rather than ``SKIP LOCKED``, so concurrent relays
+take turns instead of publishing events of one key out of order.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, exists, func, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.outbox import OutboxEvent
+from app.pubsub.publisher import PubSubPublisher, pubsub_publisher
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Background worker publishing outbox events in batches."""
+
+    def __init__(
+        self,
+        publisher: PubSubPublisher | None = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int | None = None,
+        poll_interval: float | None = None,
+    ):
+        """
+        Initialize the relay.
+
+        Args:
+            publisher: Publisher to use; defaults to the global publisher.
+            session_factory: Callable returning a new database session.
+            batch_size: Events claimed per batch; defaults to
+                ``settings.OUTBOX_RELAY_BATCH_SIZE``.
+            poll_interval: Seconds to wait when the outbox is drained;
+                defaults to ``settings.OUTBOX_RELAY_POLL_SECONDS``.
+        """
+        self.publisher = publisher or pubsub_publisher
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else settings.OUTBOX_RELAY_POLL_SECONDS
+        )
+
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.published = 0
+        self.failed = 0
+        self.last_error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def retry_delay(self, attempts: int) -> float:
+        """
+        Get the backoff before the next attempt of an event.
+
+        Args:
+            attempts: Failed attempts so far, including the last one.
+
+        Returns:
+            Seconds to wait.
+        """
+        return min(
+            settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+            settings.OUTBOX_RETRY_MAX_SECONDS,
+        )
+
+    def _due_events(self, db: Session, now: datetime) -> list[OutboxEvent]:
+        """Claim the oldest events that are due and not held back by their key."""
+        earlier = aliased(OutboxEvent)
+        waiting = exists().where(
+            earlier.ordering_key == OutboxEvent.ordering_key,
+            earlier.ordering_key != "",
+            earlier.id < OutboxEvent.id,
+            earlier.next_attempt_at > now,
+        )
+        statement = (
+            select(OutboxEvent)
+            .where(
+                or_(
+                    OutboxEvent.next_attempt_at.is_(None),
+                    OutboxEvent.next_attempt_at <= now,
+                ),
+                ~waiting,
+            )
+            .order_by(OutboxEvent.id)
+            .limit(self.batch_size)
+            .with_for_update()
+        )
+        return list(db.scalars(statement))
+
+    def relay_once(self) -> int:
+        """
+        Publish one batch of due events.
+
+        Returns:
+            Number of events claimed, published or not.
+        """
+        db = self.session_factory()
+        try:
+            now = datetime.now(timezone.utc)
+            events = self._due_events(db, now)
+            if not events:
+                db.commit()
+                return 0
+
+            # Submit the whole batch before waiting, so the client can send
+            # it in as few requests as possible
+            submitted: list[tuple[OutboxEvent, Future]] = []
+            for event in events:
+                future = self.publisher.publish(
+                    event.topic,
+                    event.payload,
+                    event.attributes,
+                    ordering_key=event.ordering_key,
+                )
+                if future is None:
+                    # Publisher unavailable or full; the rest stays queued
+                    break
+                submitted.append((event, future))
+
+            published: list[int] = []
+            failed_keys: set[tuple[str, str]] = set()
+            for event, future in submitted:
+                try:
+                    future.result(timeout=settings.PUBSUB_PUBLISH_TIMEOUT_SECONDS)
+                except Exception as e:
+                    self._schedule_retry(event, e, now)
+                    failed_keys.add((event.topic, event.ordering_key))
+                else:
+                    published.append(event.id)
+
+            if published:
+                db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(published)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        for topic, ordering_key in failed_keys:
+            self.publisher.resume(topic, ordering_key)
+
+        with self._lock:
+            self.batches += 1
+            self.published += len(published)
+            self.failed += len(submitted) - len(published)
+        if len(submitted) > len(published):
+            logger.warning(
+                f"Published {len(published)} of {len(submitted)} outbox events"
+            )
+        return len(events)
+
+    def _schedule_retry(
+        self, event: OutboxEvent, error: Exception, now: datetime
+    ) -> None:
+        """Record a failed attempt and back off before the next one."""
+        event.attempts = (event.attempts or 0) + 1
+        event.last_error = str(error) or type(error).__name__
+        event.next_attempt_at = now + timedelta(
+            seconds=self.retry_delay(event.attempts)
+        )
+        with self._lock:
+            self.last_error = event.last_error
+
+    def backlog(self, db: Session) -> int:
+        """
+        Count the events waiting to be published.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            Number of events in the outbox.
+        """
+        return db.scalar(select(func.count()).select_from(OutboxEvent)) or 0
+
+    def oldest_age(self, db: Session) -> float:
+        """
+        Get the age of the oldest event waiting to be published.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            Age in seconds, or 0 if the outbox is empty.
+        """
+        created_at = db.scalar(select(func.min(OutboxEvent.created_at)))
+        if created_at is None:
+            return 0.0
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return max((datetime.now(timezone.utc) - created_at).total_seconds(), 0.0)
+
+    def start(self) -> None:
+        """Start the background thread that drains the outbox."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="outbox-relay", daemon=True
+        )
+        self._thread.start()
+        logger.info("Started outbox relay")
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """
+        Stop the background thread.
+
+        Args:
+            timeout: Maximum time to wait for the thread to exit.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Stopped outbox relay")
+
+    def _run(self) -> None:
+        """Relay loop: drain full batches back to back, then poll."""
+        while not self._stop.is_set():
+            claimed = 0
+            try:
+                claimed = self.relay_once()
+            except Exception as e:
+                logger.error(f"Error relaying outbox events: {e}")
+            if claimed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get relay counters.
+
+        Returns:
+            Dictionary with the batches run and events published and failed.
+        """
+        with self._lock:
+            return {
+                "running": self.running,
+                "batches": self.batches,
+                "published": self.published,
+                "failed": self.failed,
+                "last_error": self.last_error,
+            }
+
+
+# Create a singleton instance for global use
+outbox_relay = OutboxRelay()
@@ -0,0 +1,199 @@
+"""
+Background ingestion of large seed files.
+
+Uploads above ``settings.SEED_UPLOAD_BACKGROUND_BYTES`` are spooled to a
+temporary file and ingested on a small dedicated executor instead of inside
+the request. Jobs are tracked in process memory, so their status is only
+visible on the instance that accepted the upload, and the most recent
+``settings.SEED_JOB_HISTORY`` finished jobs are kept.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.utils.seed_data import SeedIngestion
+
+logger = logging.getLogger(__name__)
+
+
+class SeedJob:
+    """State and progress of one background seed ingestion."""
+
+    def __init__(self, filename: str, total_bytes: int, user_id: int):
+        """
+        Initialize the job.
+
+        Args:
+            filename: Name of the uploaded file.
+            total_bytes: Size of the uploaded file.
+            user_id: ID of the user who will own the seed data.
+        """
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.total_bytes = total_bytes
+        self.user_id = user_id
+        self.status = "queued"
+        self.ingestion: SeedIngestion | None = None
+        self.result: dict[str, Any] | None = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has succeeded or failed."""
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Describe the job for the status endpoint.
+
+        Returns:
+            Dict with the job's ``id``, ``status``, ``filename``,
+            ``total_bytes``, ``progress`` (the ingestion summary so far),
+            ``error``, ``created_at`` and ``finished_at``.
+        """
+        progress = self.result
+        if progress is None and self.ingestion is not None:
+            progress = self.ingestion.summary()
+        return {
+            "id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "total_bytes": self.total_bytes,
+            "progress": progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class SeedJobManager:
+    """Executor and registry of background seed ingestions."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_history: int | None = None,
+        session_factory: Callable[[], Session] | None = None,
+    ):
+        """
+        Initialize the manager. The worker thread is only started on first use.
+
+        Args:
+            max_workers: Number of jobs run at the same time.
+            max_history: Number of finished jobs kept for status queries.
+            session_factory: Function opening a database session for a job.
+        """
+        self.max_workers = (
+            max_workers if max_workers is not None else settings.SEED_JOB_WORKERS
+        )
+        self.max_history = (
+            max_history if max_history is not None else settings.SEED_JOB_HISTORY
+        )
+        self.session_factory = session_factory or SessionLocal
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: OrderedDict[str, SeedJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        path: str,
+        filename: str,
+        user_id: int,
+        chunk_size: int | None = None,
+    ) -> SeedJob:
+        """
+        Queue the ingestion of a spooled seed file.
+
+        The job deletes the file once it is done with it.
+
+        Args:
+            path: Path of the spooled file.
+            filename: Name of the uploaded file.
+            user_id: ID of the user who will own the seed data.
+            chunk_size: Entries inserted per transaction.
+
+        Returns:
+            The queued job.
+        """
+        job = SeedJob(filename, os.path.getsize(path), user_id)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="seed-job"
+                )
+            self._executor.submit(self._run, job, path, chunk_size)
+        logger.info(f"Queued seed job {job.id} for {filename} ({job.total_bytes} B)")
+        return job
+
+    def get(self, job_id: str) -> SeedJob | None:
+        """
+        Look up a job.
+
+        Args:
+            job_id: ID of the job.
+
+        Returns:
+            The job, or None if it is unknown or has been pruned.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the history limit."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.max_history, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: SeedJob, path: str, chunk_size: int | None) -> None:
+        """Ingest a spooled file and record the outcome on the job."""
+        job.status = "running"
+        db = None
+        try:
+            db = self.session_factory()
+            job.ingestion = SeedIngestion(
+                db, job.user_id, chunk_size=chunk_size, keep_rows=False
+            )
+            with open(path, "rb") as f:
+                job.result = job.ingestion.run(f)
+            job.status = "succeeded"
+        except Exception as e:
+            logger.error(f"Seed job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            if db is not None:
+                db.close()
+            os.unlink(path)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker thread. Queued jobs that have not started are dropped.
+
+        Args:
+            wait: Whether to wait for the running job to finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Create a singleton instance for global use
+seed_jobs = SeedJobManager()
@@ -0,0 +1,104 @@
+"""
+Benchmark password verification latency for each hashing scheme.
+
+Reports p50/p99 verify latency for argon2id, scrypt and bcrypt using the cost
+parameters the password policy would use in a given environment, to help pick
+parameters that meet the login latency SLO.
+
+Usage example:
+    python -m app.utils.hash_benchmark --environment production --iterations 50
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any
+
+from app.core.password_policy import (
+    SUPPORTED_SCHEMES,
+    build_password_context,
+    get_scheme_parameters,
+    scheme_available,
+)
+
+BENCHMARK_PASSWORD = "correct horse battery staple"
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    """Get a percentile of samples using nearest-rank."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(percentile / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def benchmark_scheme(
+    scheme: str, environment: str | None = None, iterations: int = 20
+) -> dict[str, Any]:
+    """
+    Measure verify latency for one scheme.
+
+    Args:
+        scheme: passlib scheme name.
+        environment: Environment whose cost profile to use.
+        iterations: Number of verifications to time.
+
+    Returns:
+        Dictionary with the scheme, its parameters and latency percentiles
+        in milliseconds.
+    """
+    context = build_password_context(scheme=scheme, environment=environment)
+    hashed = context.hash(BENCHMARK_PASSWORD)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        context.verify(BENCHMARK_PASSWORD, hashed)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "scheme": scheme,
+        "parameters": get_scheme_parameters(scheme, environment),
+        "iterations": iterations,
+        "p50_ms": statistics.median(samples),
+        "p99_ms": _percentile(samples, 99),
+        "max_ms": max(samples),
+    }
+
+
+def benchmark_all(
+    environment: str | None = None, iterations: int = 20
+) -> list[dict[str, Any]]:
+    """
+    Measure verify latency for every scheme with an installed backend.
+
+    Args:
+        environment: Environment whose cost profile to use.
+        iterations: Number of verifications to time per scheme.
+
+    Returns:
+        One result per scheme, as returned by ``benchmark_scheme``.
+    """
+    return [
+        benchmark_scheme(scheme, environment=environment, iterations=iterations)
+        for scheme in SUPPORTED_SCHEMES
+        if scheme_available(scheme)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark from the command line and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--environment", default=None)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'scheme':<8} {'p50 ms':>9} {'p99 ms':>9}  parameters")
+    for result in benchmark_all(args.environment, args.iterations):
+        print(
+            f"{result['scheme']:<8} {result['p50_ms']:>9.1f} "
+            f"{result['p99_ms']:>9.1f}  {result['parameters']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Incremental parsing of large JSON documents.
+
+``iter_object_arrays`` reads a document of the form
+``{"key": [value, ...], ...}`` from a binary file a chunk at a time and
+yields the members of its top-level arrays one by one, so memory use depends
+on the size of the largest member rather than on the size of the document.
+Each member is decoded with the standard library's ``JSONDecoder.raw_decode``,
+which keeps the C scanner doing the actual parsing.
+
+Usage example:
+    with open("seed.json", "rb") as f:
+        for key, value in iter_object_arrays(JSONStreamReader(f)):
+            print(key, value)
+"""
+
+import codecs
+import json
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+WHITESPACE = " \t\n\r"
+
+# Characters that may continue a number the decoder has stopped at
+NUMBER_CHARS = "0123456789.eE+-"
+
+_decoder = json.JSONDecoder()
+
+
+class JSONStreamReader:
+    """Text buffer over a binary file that is refilled on demand."""
+
+    def __init__(self, file: BinaryIO, chunk_size: int = 65536):
+        """
+        Initialize the reader.
+
+        Args:
+            file: Binary file holding UTF-8 encoded JSON.
+            chunk_size: Bytes read from the file at a time.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """
+        Read the next chunk into the buffer.
+
+        Returns:
+            Whether more data was available.
+        """
+        if self._eof:
+            return False
+        data = self.file.read(self.chunk_size)
+        self.bytes_read += len(data)
+        if not data:
+            self._eof = True
+            self._buffer += self._decoder.decode(b"", final=True)
+            return False
+        # Drop what has been consumed so the buffer does not grow with the file
+        self._buffer = self._buffer[self._pos :] + self._decoder.decode(data)
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            The next character, or an empty string at the end of the file.
+        """
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """
+        Consume the next non-whitespace character.
+
+        Args:
+            char: Character that must come next.
+
+        Raises:
+            json.JSONDecodeError: If a different character comes next.
+        """
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next complete JSON value.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            json.JSONDecodeError: If the value is invalid or truncated.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut off by the end of the buffer continues in the next chunk
+            if (
+                isinstance(value, (int, float))
+                and (end == len(self._buffer) or self._buffer[end] in NUMBER_CHARS)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+
+def iter_object_arrays(
+    reader: JSONStreamReader, seen_keys: set[str] | None = None
+) -> Iterator[tuple[str, Any]]:
+    """
+    Stream the members of the arrays in a top-level JSON object.
+
+    Values of keys that are not arrays are parsed and skipped.
+
+    Args:
+        reader: Reader over the document.
+        seen_keys: Set that every top-level key is added to, including keys
+            of empty arrays and of other values.
+
+    Yields:
+        Tuples of the array's key and one of its members.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a valid JSON object.
+    """
+    reader.expect("{")
+    while reader.peek() != "}":
+        key = reader.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", "", 0)
+        if seen_keys is not None:
+            seen_keys.add(key)
+        reader.expect(":")
+        if reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.peek() == "]":
+                        reader.expect("]")
+                        break
+                    reader.expect(",")
+        else:
+            reader.value()
+        if reader.peek() == "}":
+            break
+        reader.expect(",")
+        if reader.peek() == "}":
+            raise json.JSONDecodeError("Expecting property name", "", 0)
+    reader.expect("}")
+    if reader.peek():
+        raise json.JSONDecodeError("Extra data", "", 0)
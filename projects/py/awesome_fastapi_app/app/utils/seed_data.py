@@ -3,7 +3,8 @@ Utilities for generating seed data for testing and development.
 
 This module provides functions to generate realistic random test data for the application.
 It can create items and notes with varied content and is useful for development,
-testing, and demonstration purposes.
+testing, and demonstration purposes. Seed files are parsed incrementally and
+inserted in chunks by ``SeedIngestion``.
 
 Usage example:
     from app.utils.seed_data import create_seed_data
@@ -14,11 +15,15 @@ Usage example:
 
 import logging
 import random
-from typing import Any
+import time
+from collections.abc import Callable
+from typing import Any, BinaryIO
 
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
+from app.core.config import settings
+from app.utils.json_stream import JSONStreamReader, iter_object_arrays
 
 logger = logging.getLogger(__name__)
 
@@ -156,7 +161,7 @@ def create_seed_data(
         try:
             item = crud.item.create_with_owner(db, obj_in=item_in, owner_id=user_id)
             created_items.append({"id": item.id, "title": item.title})
-            logger.info(f"Created seed item: {item.title}")
+            logger.debug(f"Created seed item: {item.title}")
         except Exception as e:
             logger.error(f"Error creating seed item: {e}")
 
@@ -170,10 +175,14 @@ def create_seed_data(
         try:
             note = crud.note.create_with_owner(db, obj_in=note_in, owner_id=user_id)
             created_notes.append({"id": note.id, "title": note.title})
-            logger.info(f"Created seed note: {note.title}")
+            logger.debug(f"Created seed note: {note.title}")
         except Exception as e:
             logger.error(f"Error creating seed note: {e}")
 
+    logger.info(
+        f"Created {len(created_items)} seed items and {len(created_notes)} seed "
+        f"notes for user {user_id}"
+    )
     return {
         "items_created": len(created_items),
         "notes_created": len(created_notes),
@@ -199,6 +208,8 @@ def process_seed_file(
         - notes_created: number of notes created
         - items: list of created items with id and title
         - notes: list of created notes with id and title
+        plus the skipped and failed counts described in
+        ``SeedIngestion.summary``. Entries are inserted in chunks.
 
     Raises:
         KeyError: If the seed data is missing required keys
@@ -222,62 +233,197 @@ def process_seed_file(
     if "items" not in seed_data and "notes" not in seed_data:
         raise KeyError("Seed data must contain 'items' or 'notes' array")
 
-    created_items = []
-    created_notes = []
+    ingestion = SeedIngestion(db, user_id)
+    for kind in SEED_KINDS:
+        if isinstance(seed_data.get(kind), list):
+            for data in seed_data[kind]:
+                ingestion.add(kind, data)
+    ingestion.flush()
+    return ingestion.summary()
 
-    # Process items
-    if "items" in seed_data and isinstance(seed_data["items"], list):
-        for item_data in seed_data["items"]:
-            if not isinstance(item_data, dict):
-                logger.warning(f"Skipping invalid item data: {item_data}")
-                continue
-
-            # Ensure required fields exist
-            if "title" not in item_data:
-                logger.warning(f"Skipping item without title: {item_data}")
-                continue
-
-            # Set default values for optional fields
-            if "description" not in item_data:
-                item_data["description"] = f"Description for {item_data['title']}"
-            if "is_active" not in item_data:
-                item_data["is_active"] = True
-
-            try:
-                item_in = schemas.ItemCreate(**item_data)
-                item = crud.item.create_with_owner(db, obj_in=item_in, owner_id=user_id)
-                created_items.append({"id": item.id, "title": item.title})
-                logger.info(f"Created seed item from file: {item.title}")
-            except Exception as e:
-                logger.error(f"Error creating seed item from file: {e}")
-
-    # Process notes
-    if "notes" in seed_data and isinstance(seed_data["notes"], list):
-        for note_data in seed_data["notes"]:
-            if not isinstance(note_data, dict):
-                logger.warning(f"Skipping invalid note data: {note_data}")
-                continue
-
-            # Ensure required fields exist
-            if "title" not in note_data:
-                logger.warning(f"Skipping note without title: {note_data}")
-                continue
-
-            # Set default values for optional fields
-            if "content" not in note_data:
-                note_data["content"] = f"Content for {note_data['title']}"
-
-            try:
-                note_in = schemas.NoteCreate(**note_data)
-                note = crud.note.create_with_owner(db, obj_in=note_in, owner_id=user_id)
-                created_notes.append({"id": note.id, "title": note.title})
-                logger.info(f"Created seed note from file: {note.title}")
-            except Exception as e:
-                logger.error(f"Error creating seed note from file: {e}")
 
-    return {
-        "items_created": len(created_items),
-        "notes_created": len(created_notes),
-        "items": created_items,
-        "notes": created_notes,
-    }
+def _item_from_file(data: dict[str, Any]) -> schemas.ItemCreate:
+    """Build an item from a seed file entry, filling in the optional fields."""
+    return schemas.ItemCreate(
+        **{"description": f"Description for {data['title']}", **data}
+    )
+
+
+def _note_from_file(data: dict[str, Any]) -> schemas.NoteCreate:
+    """Build a note from a seed file entry, filling in the optional fields."""
+    return schemas.NoteCreate(**{"content": f"Content for {data['title']}", **data})
+
+
+# Top-level keys of a seed file, with the CRUD object and schema factory of each
+SEED_KINDS: dict[str, tuple[Any, Callable[[dict[str, Any]], Any]]] = {
+    "items": (crud.item, _item_from_file),
+    "notes": (crud.note, _note_from_file),
+}
+
+# Number of error messages kept in an ingestion summary
+MAX_REPORTED_ERRORS = 10
+
+
+class SeedIngestion:
+    """
+    Batched insertion of seed file entries.
+
+    Entries are validated as they arrive and inserted with
+    ``create_many_with_owner`` once ``chunk_size`` of a kind are pending, so
+    each chunk is one transaction. A chunk that fails is rolled back and
+    counted as failed; the chunks before and after it are kept.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: int,
+        chunk_size: int | None = None,
+        keep_rows: bool = True,
+    ):
+        """
+        Initialize the ingestion.
+
+        Args:
+            db: Database session.
+            user_id: ID of the user who will own the seed data.
+            chunk_size: Entries inserted per transaction; defaults to
+                ``settings.SEED_UPLOAD_CHUNK_SIZE``.
+            keep_rows: Whether the summary lists the ID and title of every
+                created row. Turn off for large files.
+        """
+        self.db = db
+        self.user_id = user_id
+        self.chunk_size = chunk_size or settings.SEED_UPLOAD_CHUNK_SIZE
+        self.keep_rows = keep_rows
+
+        self.reader: JSONStreamReader | None = None
+        self.pending: dict[str, list[Any]] = {kind: [] for kind in SEED_KINDS}
+        self.created = dict.fromkeys(SEED_KINDS, 0)
+        self.skipped = dict.fromkeys(SEED_KINDS, 0)
+        self.failed = dict.fromkeys(SEED_KINDS, 0)
+        self.rows: dict[str, list[dict[str, Any]]] = {kind: [] for kind in SEED_KINDS}
+        self.chunks = 0
+        self.errors: list[str] = []
+        self._started = time.perf_counter()
+
+    def add(self, kind: str, data: Any) -> None:
+        """
+        Validate an entry and insert the pending chunk once it is full.
+
+        Invalid entries are counted as skipped.
+
+        Args:
+            kind: ``items`` or ``notes``.
+            data: Entry from the seed file.
+        """
+        _, build = SEED_KINDS[kind]
+        if not isinstance(data, dict) or "title" not in data:
+            logger.warning(f"Skipping invalid {kind[:-1]} data: {data!r:.200}")
+            self.skipped[kind] += 1
+            return
+        try:
+            self.pending[kind].append(build(data))
+        except ValueError as e:
+            self._error(f"Invalid {kind[:-1]} {data['title']!r}: {e}")
+            self.skipped[kind] += 1
+            return
+        if len(self.pending[kind]) >= self.chunk_size:
+            self._insert(kind)
+
+    def flush(self) -> None:
+        """Insert the entries still pending."""
+        for kind in SEED_KINDS:
+            if self.pending[kind]:
+                self._insert(kind)
+
+    def _insert(self, kind: str) -> None:
+        """Insert the pending entries of a kind in one transaction."""
+        crud_obj, _ = SEED_KINDS[kind]
+        objs_in, self.pending[kind] = self.pending[kind], []
+        try:
+            ids = crud_obj.create_many_with_owner(
+                self.db,
+                objs_in=objs_in,
+                owner_id=self.user_id,
+                chunk_size=self.chunk_size,
+            )
+        except Exception as e:
+            self._error(f"Error creating {len(objs_in)} seed {kind}: {e}")
+            self.failed[kind] += len(objs_in)
+            return
+        self.chunks += 1
+        self.created[kind] += len(ids)
+        if self.keep_rows:
+            self.rows[kind].extend(
+                {"id": id, "title": obj_in.title} for id, obj_in in zip(ids, objs_in)
+            )
+        logger.debug(f"Inserted chunk of {len(ids)} seed {kind}")
+
+    def _error(self, message: str) -> None:
+        """Log an error and keep the first few for the summary."""
+        logger.error(message)
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def run(self, file: BinaryIO) -> dict[str, Any]:
+        """
+        Parse a seed file incrementally and insert its entries.
+
+        Args:
+            file: Binary file holding the seed JSON document.
+
+        Returns:
+            Summary of the ingestion, see ``summary``.
+
+        Raises:
+            KeyError: If the document has neither an ``items`` nor a ``notes``
+                key.
+            ValueError: If the document is not valid JSON. Chunks inserted
+                before the error are kept.
+        """
+        self.reader = JSONStreamReader(file)
+        seen_keys: set[str] = set()
+        for kind, data in iter_object_arrays(self.reader, seen_keys):
+            if kind in SEED_KINDS:
+                self.add(kind, data)
+        self.flush()
+        if not seen_keys & SEED_KINDS.keys():
+            raise KeyError("Seed data must contain 'items' or 'notes' array")
+        summary = self.summary()
+        logger.info(
+            f"Seeded {summary['items_created']} items and "
+            f"{summary['notes_created']} notes in {summary['chunks']} chunks "
+            f"({summary['rows_per_second']} rows/s)"
+        )
+        return summary
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Summarize the ingestion so far.
+
+        Returns:
+            Dict with ``items_created``, ``notes_created``, ``items_skipped``,
+            ``notes_skipped``, ``items_failed``, ``notes_failed``, ``chunks``,
+            ``errors``, ``bytes_read``, ``duration_seconds`` and
+            ``rows_per_second``, plus ``items`` and ``notes`` with the ID and
+            title of each created row if ``keep_rows`` is set.
+        """
+        duration = time.perf_counter() - self._started
+        created = sum(self.created.values())
+        summary: dict[str, Any] = {}
+        for kind in SEED_KINDS:
+            summary[f"{kind}_created"] = self.created[kind]
+        if self.keep_rows:
+            summary.update(self.rows)
+        for kind in SEED_KINDS:
+            summary[f"{kind}_skipped"] = self.skipped[kind]
+            summary[f"{kind}_failed"] = self.failed[kind]
+        summary.update(
+            chunks=self.chunks,
+            errors=list(self.errors),
+            bytes_read=self.reader.bytes_read if self.reader else 0,
+            duration_seconds=round(duration, 3),
+            rows_per_second=round(created / duration) if duration > 0 else 0,
+        )
+        return summary
@@ -0,0 +1,367 @@
+"""
+Deterministic generation of large synthetic datasets.
+
+``SyntheticDataGenerator`` produces users, items and notes from a seed: the
+same seed and counts always give the same rows, so load tests and benchmarks
+can start from a known dataset. Text is picked from pools that are built once
+per run rather than assembled per row, and rows are written in batches, with
+``COPY`` on PostgreSQL and multi-row ``INSERT`` elsewhere, committing after
+each batch.
+
+Generated users are ``synthetic-<seed>-<n>@example.com`` and all share the
+password ``SYNTHETIC_PASSWORD``. Users must be unique, so generating the same
+seed twice into one database fails; use a fresh database or another seed.
+
+Usage example:
+    from app.utils.synthetic_data import SyntheticDataGenerator
+
+    generator = SyntheticDataGenerator(seed=42, users=1000, items=1_000_000)
+    report = generator.run(db_session)
+"""
+
+import csv
+import io
+import itertools
+import logging
+import random
+import time
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.response_cache import response_cache
+from app.core.security import get_password_hash
+from app.models.item import Item
+from app.models.note import Note
+from app.models.user import User
+from app.utils.seed_data import ADJECTIVES, ITEM_TITLES, NOTE_TITLES
+
+logger = logging.getLogger(__name__)
+
+# Password of every generated user, so load tests can log in as them
+SYNTHETIC_PASSWORD = "synthetic-password"
+
+METHODS = ("auto", "copy", "insert")
+
+# Columns written for each table, in the order of the generated tuples
+USER_COLUMNS = ["email", "hashed_password", "full_name", "is_active", "is_superuser"]
+ITEM_COLUMNS = ["title", "description", "is_active", "owner_id"]
+NOTE_COLUMNS = ["title", "content", "user_id"]
+
+# Nine in ten generated items are active
+ACTIVE_WEIGHTS = (True,) * 9 + (False,)
+
+# Number of distinct note contents generated per note title
+CONTENTS_PER_TITLE = 20
+
+NOTE_SENTENCES = [
+    "Important information about {}.",
+    "We need to review the {} implementation.",
+    "Key considerations for {} development include scalability and security.",
+    "Future improvements for {} might include enhanced performance metrics.",
+    "Team feedback on {} has been largely positive.",
+]
+
+
+def synthetic_email(seed: int, n: int) -> str:
+    """
+    Get the email address of a generated user.
+
+    Args:
+        seed: Seed of the dataset.
+        n: Index of the user, starting at 0.
+
+    Returns:
+        Email address.
+    """
+    return f"synthetic-{seed}-{n}@example.com"
+
+
+def _batches(total: int, batch_size: int) -> Iterator[range]:
+    """Split ``range(total)`` into ranges of at most ``batch_size``."""
+    for start in range(0, total, batch_size):
+        yield range(start, min(start + batch_size, total))
+
+
+class SyntheticDataGenerator:
+    """Generator of a reproducible dataset of users, items and notes."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        users: int = 100,
+        items: int = 1000,
+        notes: int = 1000,
+        batch_size: int = 10000,
+        method: str = "auto",
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Seed of the dataset.
+            users: Number of users to generate.
+            items: Number of items, spread over the generated users.
+            notes: Number of notes, spread over the generated users.
+            batch_size: Rows written and committed at a time.
+            method: ``copy``, ``insert``, or ``auto`` to use ``COPY`` on
+                PostgreSQL and ``INSERT`` elsewhere.
+
+        Raises:
+            ValueError: If the method is unknown, or items or notes are
+                requested without users to own them.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+        if users < 1 and (items or notes):
+            raise ValueError("Items and notes need at least one user")
+        self.seed = seed
+        self.users = users
+        self.items = items
+        self.notes = notes
+        self.batch_size = batch_size
+        self.method = method
+
+        # Text pools, grouped by title: every adjective pair for item
+        # descriptions and a fixed number of sentence combinations for notes
+        pool_rng = random.Random(f"{seed}:pools")
+        self.descriptions = [
+            f"This {title} is an {adj1} and {adj2} solution designed for "
+            "modern applications."
+            for title in ITEM_TITLES
+            for adj1, adj2 in itertools.permutations(ADJECTIVES, 2)
+        ]
+        self.descriptions_per_title = len(self.descriptions) // len(ITEM_TITLES)
+        self.contents = [
+            " ".join(
+                sentence.format(title)
+                for sentence in pool_rng.sample(NOTE_SENTENCES, pool_rng.randint(2, 5))
+            )
+            for title in NOTE_TITLES
+            for _ in range(CONTENTS_PER_TITLE)
+        ]
+
+    def _rng(self, stream: str) -> random.Random:
+        """
+        Get the random generator of one column.
+
+        Each column draws from its own generator, so the rows do not depend
+        on the batch size or on the counts of the other tables.
+        """
+        return random.Random(f"{self.seed}:{stream}")
+
+    def user_rows(self, hashed_password: str) -> Iterator[list[tuple[Any, ...]]]:
+        """
+        Generate user rows in batches.
+
+        Args:
+            hashed_password: Hash of ``SYNTHETIC_PASSWORD``, shared by all users.
+
+        Yields:
+            Batches of ``(email, hashed_password, full_name, is_active,
+            is_superuser)`` tuples.
+        """
+        for batch in _batches(self.users, self.batch_size):
+            yield [
+                (
+                    synthetic_email(self.seed, n),
+                    hashed_password,
+                    f"Synthetic User {n}",
+                    True,
+                    False,
+                )
+                for n in batch
+            ]
+
+    def item_rows(self, owner_ids: Sequence[int]) -> Iterator[list[tuple[Any, ...]]]:
+        """
+        Generate item rows in batches.
+
+        Args:
+            owner_ids: IDs of the generated users, in generation order.
+
+        Yields:
+            Batches of ``(title, description, is_active, owner_id)`` tuples.
+        """
+        text_rng, active_rng, owner_rng = (
+            self._rng(f"items:{column}") for column in ("text", "active", "owner")
+        )
+        for batch in _batches(self.items, self.batch_size):
+            size = len(batch)
+            picks = text_rng.choices(range(len(self.descriptions)), k=size)
+            actives = active_rng.choices(ACTIVE_WEIGHTS, k=size)
+            owners = owner_rng.choices(owner_ids, k=size)
+            yield [
+                (
+                    f"{ITEM_TITLES[pick // self.descriptions_per_title]} {n}",
+                    self.descriptions[pick],
+                    active,
+                    owner,
+                )
+                for n, pick, active, owner in zip(batch, picks, actives, owners)
+            ]
+
+    def note_rows(self, owner_ids: Sequence[int]) -> Iterator[list[tuple[Any, ...]]]:
+        """
+        Generate note rows in batches.
+
+        Args:
+            owner_ids: IDs of the generated users, in generation order.
+
+        Yields:
+            Batches of ``(title, content, user_id)`` tuples.
+        """
+        text_rng, owner_rng = (
+            self._rng(f"notes:{column}") for column in ("text", "owner")
+        )
+        for batch in _batches(self.notes, self.batch_size):
+            size = len(batch)
+            picks = text_rng.choices(range(len(self.contents)), k=size)
+            owners = owner_rng.choices(owner_ids, k=size)
+            yield [
+                (
+                    f"{NOTE_TITLES[pick // CONTENTS_PER_TITLE]} {n}",
+                    self.contents[pick],
+                    owner,
+                )
+                for n, pick, owner in zip(batch, picks, owners)
+            ]
+
+    def resolve_method(self, db: Session) -> str:
+        """
+        Get the write method for a database.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            ``copy`` or ``insert``.
+
+        Raises:
+            ValueError: If ``copy`` is requested for a database other than
+                PostgreSQL.
+        """
+        is_postgres = db.get_bind().dialect.name == "postgresql"
+        if self.method == "auto":
+            return "copy" if is_postgres else "insert"
+        if self.method == "copy" and not is_postgres:
+            raise ValueError("COPY is only supported on PostgreSQL")
+        return self.method
+
+    def run(self, db: Session) -> dict[str, Any]:
+        """
+        Generate the dataset and write it to the database.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            Report with the ``seed``, the ``method`` used, the row count,
+            duration and rows per second of each table under ``tables``, and
+            the ``total_rows``, ``duration_seconds`` and ``rows_per_second``
+            of the whole run.
+        """
+        method = self.resolve_method(db)
+        started = time.perf_counter()
+        tables: dict[str, dict[str, Any]] = {}
+
+        hashed_password = get_password_hash(SYNTHETIC_PASSWORD)
+        tables["users"] = self._write(
+            db, method, User.__table__, USER_COLUMNS, self.user_rows(hashed_password)
+        )
+        owner_ids = self._user_ids(db)
+        tables["items"] = self._write(
+            db, method, Item.__table__, ITEM_COLUMNS, self.item_rows(owner_ids)
+        )
+        tables["notes"] = self._write(
+            db, method, Note.__table__, NOTE_COLUMNS, self.note_rows(owner_ids)
+        )
+        # Pages cached by a running application no longer hold every row
+        for namespace in ("items", "notes"):
+            response_cache.invalidate(namespace, owner_ids=None)
+
+        duration = time.perf_counter() - started
+        total = sum(table["rows"] for table in tables.values())
+        report = {
+            "seed": self.seed,
+            "method": method,
+            "tables": tables,
+            "total_rows": total,
+            "duration_seconds": round(duration, 3),
+            "rows_per_second": round(total / duration) if duration > 0 else 0,
+        }
+        logger.info(
+            f"Generated {total} rows with seed {self.seed} via {method} in "
+            f"{report['duration_seconds']}s ({report['rows_per_second']} rows/s)"
+        )
+        return report
+
+    def _user_ids(self, db: Session) -> list[int]:
+        """Get the IDs of the generated users, in generation order."""
+        owner_ids: list[int] = []
+        for batch in _batches(self.users, self.batch_size):
+            emails = [synthetic_email(self.seed, n) for n in batch]
+            ids = dict(
+                db.execute(select(User.email, User.id).where(User.email.in_(emails)))
+                .tuples()
+                .all()
+            )
+            owner_ids.extend(ids[email] for email in emails)
+        return owner_ids
+
+    def _write(
+        self,
+        db: Session,
+        method: str,
+        table: Table,
+        columns: list[str],
+        batches: Iterator[list[tuple[Any, ...]]],
+    ) -> dict[str, Any]:
+        """Write batches of rows to a table, committing after each batch."""
+        write = self._copy if method == "copy" else self._insert
+        started = time.perf_counter()
+        rows = 0
+        for batch in batches:
+            try:
+                write(db, table, columns, batch)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            rows += len(batch)
+            logger.debug(f"Wrote {rows} rows to {table.name}")
+        duration = time.perf_counter() - started
+        rate = round(rows / duration) if duration > 0 else 0
+        logger.info(f"Wrote {rows} rows to {table.name} ({rate} rows/s)")
+        return {
+            "rows": rows,
+            "duration_seconds": round(duration, 3),
+            "rows_per_second": rate,
+        }
+
+    @staticmethod
+    def _insert(
+        db: Session, table: Table, columns: list[str], rows: list[tuple[Any, ...]]
+    ) -> None:
+        """Write rows with a multi-row INSERT."""
+        db.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+    @staticmethod
+    def _copy(
+        db: Session, table: Table, columns: list[str], rows: list[tuple[Any, ...]]
+    ) -> None:
+        """Write rows with ``COPY ... FROM STDIN`` in CSV format."""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        connection = db.connection()
+        preparer = connection.dialect.identifier_preparer
+        statement = (
+            f"COPY {preparer.format_table(table)} "
+            f"({', '.join(preparer.quote(column) for column in columns)}) "
+            "FROM STDIN WITH (FORMAT csv)"
+        )
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(statement, buffer)
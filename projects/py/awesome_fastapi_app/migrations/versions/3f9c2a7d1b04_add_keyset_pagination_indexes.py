@@ -0,0 +1,49 @@
+"""add keyset pagination indexes
+
+Revision ID: 3f9c2a7d1b04
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3f9c2a7d1b04"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_item_owner_id_id", "item", ["owner_id", "id"]),
+    ("ix_note_user_id_id", "note", ["user_id", "id"]),
+)
+
+
+def _create_indexes(**kw):
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True, **kw)
+
+
+def _drop_indexes(**kw):
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True, **kw)
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        # Build the indexes without blocking writes. CREATE INDEX CONCURRENTLY
+        # cannot run inside a transaction.
+        with op.get_context().autocommit_block():
+            _create_indexes(postgresql_concurrently=True)
+    else:
+        _create_indexes()
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            _drop_indexes(postgresql_concurrently=True)
+    else:
+        _drop_indexes()
@@ -29,7 +29,7 @@ print("Running API tests...")
 
 # Initialize the database first (if needed)
 print("Initializing database...")
-from app.db.session import SessionLocal, engine
+from app.db.session import SessionLocal, db_engines
 from app.db.base import Base
 from app.core.config import settings
 import app.crud as crud
@@ -40,7 +40,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('db_init')
 
 print('Creating database tables...')
-Base.metadata.create_all(bind=engine)
+Base.metadata.create_all(bind=db_engines.engine)
 
 print('Initializing database with default superuser...')
 db = SessionLocal()
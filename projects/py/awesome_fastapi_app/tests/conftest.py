@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.api.deps import get_db
+from app.core.response_cache import response_cache
 from app.db.session import Base
 from app.main import app as main_app
 
@@ -119,6 +120,8 @@ def client(db) -> Generator[TestClient, None, None]:
             pass
 
     main_app.dependency_overrides[get_db] = override_get_db
+    # Rows are rolled back after each test, so their cached responses must go
+    response_cache.clear()
     with TestClient(main_app) as test_client:
         yield test_client
     main_app.dependency_overrides.clear()
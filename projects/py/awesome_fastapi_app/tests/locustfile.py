@@ -3,9 +3,15 @@ Load testing script for FastAPI application.
 
 This file defines user behaviors for load testing with Locust.
 Run with: locust -f tests/locustfile.py
+
+To test against a known large dataset, generate one with
+``python -m app.generate_data --seed 42 --users 1000 ...`` and set
+``LOCUST_DATASET_SEED=42`` and ``LOCUST_DATASET_USERS=1000``: simulated users
+then log in as generated users instead of registering new ones.
 """
 
 import logging
+import os
 import random
 import uuid
 
@@ -28,6 +34,10 @@ except ImportError:
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Dataset created by app.generate_data, if any
+DATASET_SEED = os.environ.get("LOCUST_DATASET_SEED")
+DATASET_USERS = int(os.environ.get("LOCUST_DATASET_USERS", "0"))
+
 
 class FastAPIUser(HttpUser):
     """User behavior for load testing the FastAPI application."""
@@ -46,11 +56,39 @@ class FastAPIUser(HttpUser):
             return
 
         try:
-            self.login()
-            self.create_test_data()
+            if DATASET_SEED is not None and DATASET_USERS:
+                self.login_as_dataset_user()
+            else:
+                self.login()
+                self.create_test_data()
         except Exception as e:
             logger.error(f"Error in on_start: {str(e)}")
 
+    def login_as_dataset_user(self):
+        """Log in as a random user of the generated dataset."""
+        from app.utils.synthetic_data import SYNTHETIC_PASSWORD, synthetic_email
+
+        email = synthetic_email(int(DATASET_SEED), random.randrange(DATASET_USERS))
+        with self.client.post(
+            "/api/v1/login/access-token",
+            data={"username": email, "password": SYNTHETIC_PASSWORD},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            name="/api/v1/login/access-token - Login",
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"Failed to login: {response.text}")
+                return
+            self.access_token = response.json().get("access_token")
+        self.client.headers.update({"Authorization": f"Bearer {self.access_token}"})
+
+        # Read existing items instead of creating new ones
+        response = self.client.get(
+            "/api/v1/items/?limit=100", name="/api/v1/items/ - Get Items"
+        )
+        if response.status_code == 200:
+            self.item_ids = [item["id"] for item in response.json()]
+
     def login(self):
         """Log in and obtain access token."""
         try:
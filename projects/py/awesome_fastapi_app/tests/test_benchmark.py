@@ -5,17 +5,39 @@ These tests measure the performance of various components and endpoints
 to detect performance regressions and identify bottlenecks.
 """
 
+import json
+import logging
 import os
+import time
 
 import pytest
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
 from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.core.password_policy import (
+    SUPPORTED_SCHEMES,
+    build_password_context,
+    scheme_available,
+)
+from app.core.request_logging import AccessLogMiddleware
 from app.crud.crud_item import item as crud_item
 from app.crud.crud_user import user as crud_user
+from app.models.item import Item
+from app.pubsub.codecs import (
+    ITEM_EVENT_CONTENT_TYPE,
+    JSON_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    get_codec,
+)
 from app.schemas.item import ItemCreate
 from app.schemas.user import UserCreate
 
+logger = logging.getLogger(__name__)
+
 # Skip benchmark tests in CI environments unless explicitly enabled
 skip_benchmarks = os.environ.get("SKIP_BENCHMARKS", "false").lower() == "true"
 skip_reason = (
@@ -144,3 +166,205 @@ def test_api_list_performance(client: TestClient, db: Session, benchmark):
         assert len(result.json()) >= 3  # Adjusted from 10 to 3
     except Exception as e:
         pytest.skip(f"Benchmark error: {str(e)}")
+
+
+@pytest.mark.skipif(skip_benchmarks, reason=skip_reason)
+@pytest.mark.parametrize("scheme", SUPPORTED_SCHEMES)
+def test_password_verify_performance(benchmark, scheme: str):
+    """Benchmark password verification for each supported hashing scheme."""
+    if not scheme_available(scheme):
+        pytest.skip(f"No backend installed for {scheme}")
+
+    context = build_password_context(scheme=scheme)
+    hashed = context.hash("password123")
+
+    result = benchmark(context.verify, "password123", hashed)
+
+    assert result is True
+
+
+def _legacy_item_write(db: Session, owner_id: int) -> Item:
+    """Create and update an item the way CRUDBase did before the lean write path."""
+    item = Item(**jsonable_encoder(ItemCreate(title="Legacy")), owner_id=owner_id)
+    db.add(item)
+    db.commit()
+    db.refresh(item)
+
+    update_data = {"description": "Updated description"}
+    for field in jsonable_encoder(item):
+        if field in update_data:
+            setattr(item, field, update_data[field])
+    db.add(item)
+    db.commit()
+    db.refresh(item)
+    return item
+
+
+def _lean_item_write(db: Session, owner_id: int) -> Item:
+    """Create and update an item through the CRUD layer."""
+    item = crud_item.create_with_owner(
+        db=db, obj_in=ItemCreate(title="Lean"), owner_id=owner_id
+    )
+    return crud_item.update(
+        db=db, db_obj=item, obj_in={"description": "Updated description"}
+    )
+
+
+def _measure_item_write(db: Session, write, rounds: int = 50) -> tuple[float, float]:
+    """Get the statements and CPU seconds per create-and-update cycle."""
+    owner_id = crud_user.create(
+        db, obj_in=UserCreate(email=f"{write.__name__}@example.com", password="pw")
+    ).id
+    # Keep objects loaded after commit, like the application's sessions
+    db.expire_on_commit = False
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", count)
+    try:
+        start = time.process_time()
+        for _ in range(rounds):
+            item = write(db, owner_id)
+            # Serializing the response reads every column
+            jsonable_encoder(item)
+        cpu = time.process_time() - start
+    finally:
+        event.remove(connection, "before_cursor_execute", count)
+    return len(statements) / rounds, cpu / rounds
+
+
+@pytest.mark.skipif(skip_benchmarks, reason=skip_reason)
+def test_item_write_round_trips(db: Session):
+    """Compare round trips and CPU per write for the legacy and lean paths."""
+    legacy_statements, legacy_cpu = _measure_item_write(db, _legacy_item_write)
+    lean_statements, lean_cpu = _measure_item_write(db, _lean_item_write)
+
+    logger.info(
+        f"item create+update: legacy {legacy_statements:.0f} statements "
+        f"{legacy_cpu * 1000:.3f} ms CPU, lean {lean_statements:.0f} statements "
+        f"{lean_cpu * 1000:.3f} ms CPU"
+    )
+    # INSERT and UPDATE only: no SELECT to refresh after either write
+    assert lean_statements == 2
+    assert legacy_statements == 4
+
+
+@pytest.mark.skipif(skip_benchmarks, reason=skip_reason)
+@pytest.mark.parametrize("write", [_legacy_item_write, _lean_item_write])
+def test_item_write_performance(db: Session, benchmark, write):
+    """Benchmark one item create-and-update cycle on each write path."""
+    owner = crud_user.create(
+        db, obj_in=UserCreate(email="write_bench@example.com", password="pw")
+    )
+    db.expire_on_commit = False
+
+    result = benchmark(write, db, owner.id)
+
+    assert result.description == "Updated description"
+
+
+# Item events as published by the outbox relay
+ITEM_EVENTS = [
+    {"action": "item_created", "item_id": 100000 + n, "owner_id": n % 1000 + 1}
+    for n in range(1000)
+]
+PAYLOAD_CONTENT_TYPES = [
+    JSON_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    ITEM_EVENT_CONTENT_TYPE,
+]
+
+
+class _LegacyJSONCodec:
+    """The ``json.dumps``/``json.loads`` encoding used before codecs."""
+
+    content_type = "legacy json"
+
+    def encode(self, message):
+        return json.dumps(message).encode("utf-8")
+
+    def decode(self, data):
+        return json.loads(data.decode("utf-8"))
+
+
+def _payload_codec(content_type: str):
+    """Get a codec, or None if its package is not installed."""
+    if content_type == _LegacyJSONCodec.content_type:
+        return _LegacyJSONCodec()
+    try:
+        return get_codec(content_type)
+    except RuntimeError:
+        return None
+
+
+def _bytes_per_event(codec) -> float:
+    return sum(len(codec.encode(event)) for event in ITEM_EVENTS) / len(ITEM_EVENTS)
+
+
+@pytest.mark.skipif(skip_benchmarks, reason=skip_reason)
+def test_pubsub_payload_sizes(benchmark):
+    """Compare the encoded size of item events for each codec."""
+    sizes = {
+        content_type: _bytes_per_event(codec)
+        for content_type in [_LegacyJSONCodec.content_type, *PAYLOAD_CONTENT_TYPES]
+        if (codec := _payload_codec(content_type)) is not None
+    }
+
+    # Time encoding with the item event codec; the report keeps every size
+    benchmark(_bytes_per_event, get_codec(ITEM_EVENT_CONTENT_TYPE))
+
+    benchmark.extra_info["bytes_per_event"] = sizes
+    assert sizes[ITEM_EVENT_CONTENT_TYPE] < sizes[JSON_CONTENT_TYPE]
+
+
+@pytest.mark.skipif(skip_benchmarks, reason=skip_reason)
+@pytest.mark.parametrize(
+    "content_type", [_LegacyJSONCodec.content_type, *PAYLOAD_CONTENT_TYPES]
+)
+def test_pubsub_codec_performance(benchmark, content_type: str):
+    """Benchmark encoding and decoding 1000 item events with each codec."""
+    codec = _payload_codec(content_type)
+    if codec is None:
+        pytest.skip(f"No package installed for {content_type}")
+
+    def round_trip():
+        return [codec.decode(codec.encode(event)) for event in ITEM_EVENTS]
+
+    result = benchmark(round_trip)
+
+    benchmark.extra_info["bytes_per_event"] = _bytes_per_event(codec)
+    assert result == ITEM_EVENTS
+
+
+class _LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The request logging middleware used before ``AccessLogMiddleware``."""
+
+    async def dispatch(self, request, call_next):
+        logger = logging.getLogger("app.main")
+        logger.info(f"Request: {request.method} {request.url.path}")
+        response = await call_next(request)
+        logger.info(f"Response status: {response.status_code}")
+        return response
+
+
+@pytest.mark.skipif(skip_benchmarks, reason=skip_reason)
+@pytest.mark.parametrize(
+    "middleware", [_LegacyRequestLoggingMiddleware, AccessLogMiddleware]
+)
+def test_request_logging_performance(benchmark, middleware):
+    """Benchmark the root endpoint behind each request logging middleware."""
+    app = FastAPI()
+
+    @app.get("/")
+    def root():
+        return {"message": "Welcome"}
+
+    app.add_middleware(middleware)
+    client = TestClient(app)
+    result = benchmark(client.get, "/")
+
+    assert result.status_code == 200
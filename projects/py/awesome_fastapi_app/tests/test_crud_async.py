@@ -0,0 +1,157 @@
+"""
+Tests for the async CRUD variants.
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import crud, schemas
+from app.api import deps
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.v1.endpoints.items import read_items_async
+from app.core.security import create_access_token
+from app.core.token_cache import TokenCache
+from app.db.base import Base
+from app.db.session import get_async_url
+from app.models.user import User
+
+
+@pytest_asyncio.fixture
+async def async_session(tmp_path):
+    """Get an async session on a fresh SQLite database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def owner(async_session):
+    """Create a user to own items and notes."""
+    user = User(email="async@example.com", hashed_password="x", is_active=True)
+    async_session.add(user)
+    await async_session.commit()
+    return user
+
+
+def test_get_async_url():
+    """Test that sync URLs are mapped to their async drivers."""
+    postgres = get_async_url(make_url("postgresql://u:p@db:5432/app"))
+    sqlite = get_async_url(make_url("sqlite:///./test.db"))
+
+    assert postgres.drivername == "postgresql+asyncpg"
+    assert postgres.password == "p"
+    assert sqlite.drivername == "sqlite+aiosqlite"
+
+
+@pytest.mark.asyncio
+async def test_item_crud_async(async_session, owner):
+    """Test creating, reading, updating and removing an item."""
+    item = await crud.item.create_with_owner_async(
+        async_session, obj_in=schemas.ItemCreate(title="async"), owner_id=owner.id
+    )
+    assert item.id is not None
+    assert item.created_at is not None
+
+    assert (await crud.item.get_async(async_session, item.id)).title == "async"
+
+    item = await crud.item.update_async(
+        async_session,
+        db_obj=item,
+        obj_in=schemas.ItemUpdate(description="changed"),
+    )
+    assert item.description == "changed"
+
+    await crud.item.remove_async(async_session, id=item.id)
+    assert await crud.item.get_async(async_session, item.id) is None
+
+
+@pytest.mark.asyncio
+async def test_note_pages_async(async_session, owner):
+    """Test keyset paging of a user's notes."""
+    for i in range(5):
+        await crud.note.create_with_owner_async(
+            async_session,
+            obj_in=schemas.NoteCreate(title=f"note {i}"),
+            owner_id=owner.id,
+        )
+
+    first = await crud.note.get_page_by_owner_async(
+        async_session, owner_id=owner.id, limit=3
+    )
+    second = await crud.note.get_page_by_owner_async(
+        async_session, owner_id=owner.id, cursor=first.next_cursor, limit=3
+    )
+
+    titles = [note.title for note in first.items + second.items]
+    assert titles == [f"note {i}" for i in range(5)]
+    assert second.next_cursor is None
+    offset = await crud.note.get_multi_by_owner_async(
+        async_session, owner_id=owner.id, skip=3
+    )
+    assert [note.title for note in offset] == ["note 3", "note 4"]
+
+
+@pytest.mark.asyncio
+async def test_user_crud_async(async_session):
+    """Test that async user creation hashes the password and lookups work."""
+    user = await crud.user.create_async(
+        async_session,
+        obj_in=schemas.UserCreate(email="async-user@example.com", password="pw"),
+    )
+
+    found = await crud.user.get_by_email_async(async_session, email=user.email)
+    assert found.id == user.id
+    assert found.hashed_password != "pw"
+
+    await crud.user.update_async(async_session, db_obj=found, obj_in={"full_name": "A"})
+    assert (await crud.user.get_async(async_session, user.id)).full_name == "A"
+
+
+@pytest.mark.asyncio
+async def test_read_items_async_sets_next_cursor(async_session, owner):
+    """Test the async list endpoint pages like the sync one."""
+    for i in range(3):
+        await crud.item.create_with_owner_async(
+            async_session,
+            obj_in=schemas.ItemCreate(title=f"item {i}"),
+            owner_id=owner.id,
+        )
+    request = Request({"type": "http", "method": "GET", "headers": []})
+
+    response = await read_items_async(
+        request,
+        db=async_session,
+        skip=0,
+        limit=2,
+        cursor=None,
+        current_user=owner,
+    )
+
+    assert [item["title"] for item in json.loads(response.body)] == [
+        "item 0",
+        "item 1",
+    ]
+    assert NEXT_CURSOR_HEADER in response.headers
+
+
+@pytest.mark.asyncio
+async def test_current_user_async_uses_token_cache(async_session, owner, monkeypatch):
+    """Test that the async auth dependency looks the user up once per token."""
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    monkeypatch.setattr(deps, "token_cache", cache)
+    token = create_access_token(owner.id)
+
+    for _ in range(2):
+        user = await deps.get_current_user_async(db=async_session, token=token)
+        assert user.id == owner.id
+        assert await deps.get_current_active_user_async(current_user=user) is user
+    assert cache.stats()["hits"] == 1
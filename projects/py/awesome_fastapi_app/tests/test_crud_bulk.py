@@ -0,0 +1,135 @@
+"""
+Tests for bulk CRUD operations.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app import crud, schemas
+from app.models.item import Item
+from app.models.user import User
+
+
+@pytest.fixture
+def owner(db):
+    """Create a user to own bulk-created rows."""
+    user = User(email="bulk@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.flush()
+    return user
+
+
+@pytest.fixture
+def statements(db):
+    """Record the SQL statements sent on the test connection."""
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    yield recorded
+    event.remove(connection, "before_cursor_execute", record)
+
+
+def test_create_many_with_owner_returns_ids_in_order(db, owner):
+    """Test that created IDs line up with the input rows."""
+    items_in = [schemas.ItemCreate(title=f"bulk {i}") for i in range(5)]
+
+    ids = crud.item.create_many_with_owner(
+        db, objs_in=items_in, owner_id=owner.id, chunk_size=2
+    )
+
+    assert len(ids) == 5
+    stored = {item.id: item for item in db.query(Item).filter(Item.id.in_(ids))}
+    assert [stored[id].title for id in ids] == [f"bulk {i}" for i in range(5)]
+    assert all(stored[id].owner_id == owner.id for id in ids)
+
+
+def test_create_many_does_not_refresh_rows(db, owner, statements):
+    """Test that bulk create sends no per-row SELECT."""
+    items_in = [schemas.ItemCreate(title=f"fast {i}") for i in range(10)]
+
+    crud.item.create_many_with_owner(db, objs_in=items_in, owner_id=owner.id)
+
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in statements)
+
+
+def test_create_many_empty(db):
+    """Test that creating no rows is a no-op."""
+    assert crud.item.create_many(db, objs_in=[]) == []
+
+
+def test_update_many(db, owner):
+    """Test updating rows by ID with different column sets."""
+    ids = crud.item.create_many_with_owner(
+        db,
+        objs_in=[schemas.ItemCreate(title=f"old {i}") for i in range(3)],
+        owner_id=owner.id,
+    )
+
+    updated = crud.item.update_many(
+        db,
+        objs_in=[
+            {"id": ids[0], "title": "new 0"},
+            {"id": ids[1], "title": "new 1"},
+            {"id": ids[2], "is_active": False},
+        ],
+    )
+
+    db.expire_all()
+    stored = {item.id: item for item in db.query(Item).filter(Item.id.in_(ids))}
+    assert updated == 3
+    assert [stored[id].title for id in ids] == ["new 0", "new 1", "old 2"]
+    assert stored[ids[2]].is_active is False
+
+
+def test_update_many_requires_ids(db):
+    """Test that rows without an ID are rejected."""
+    with pytest.raises(ValueError):
+        crud.item.update_many(db, objs_in=[{"title": "no id"}])
+
+
+def test_remove_many(db, owner):
+    """Test removing rows by ID across several chunks."""
+    ids = crud.item.create_many_with_owner(
+        db,
+        objs_in=[schemas.ItemCreate(title=f"gone {i}") for i in range(5)],
+        owner_id=owner.id,
+    )
+
+    removed = crud.item.remove_many(db, ids=ids[:4], chunk_size=3)
+
+    assert removed == 4
+    assert [item.id for item in db.query(Item).filter(Item.id.in_(ids))] == ids[4:]
+
+
+def test_create_many_is_atomic(db, owner):
+    """Test that a failing row rolls back the whole batch."""
+    rows = [{"title": "ok", "owner_id": owner.id}, {"title": None}]
+
+    with pytest.raises(IntegrityError):
+        crud.item.create_many(db, objs_in=rows, chunk_size=1)
+
+    assert db.query(Item).filter(Item.title == "ok").count() == 0
+
+
+def test_user_create_many_hashes_passwords(db):
+    """Test that bulk-created users get hashed passwords."""
+    ids = crud.user.create_many(
+        db,
+        objs_in=[
+            schemas.UserCreate(email="bulk-a@example.com", password="secret-a"),
+            schemas.UserCreate(email="bulk-b@example.com", password="secret-b"),
+        ],
+    )
+
+    users = db.query(User).filter(User.id.in_(ids)).order_by(User.id).all()
+    assert [user.email for user in users] == [
+        "bulk-a@example.com",
+        "bulk-b@example.com",
+    ]
+    assert all(user.hashed_password.startswith("$") for user in users)
+    assert crud.user.authenticate(db, email="bulk-a@example.com", password="secret-a")
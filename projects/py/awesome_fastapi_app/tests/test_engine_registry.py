@@ -0,0 +1,73 @@
+"""
+Tests for lazy engine creation, connection warm-up and the startup profile.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.startup import StartupProfile
+from app.db.pool_metrics import pool_stats
+from app.db.session import EngineRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Create a registry for a file SQLite database."""
+    registry = EngineRegistry(f"sqlite:///{tmp_path / 'registry.db'}")
+    yield registry
+    registry.dispose()
+
+
+def test_engine_is_created_on_first_use(registry):
+    """Test that no engine exists until a session needs one."""
+    created = []
+    registry.on_engine_created(created.append)
+    assert not registry.engine_created
+
+    with registry.get_sessionmaker()() as db:
+        assert db.get_bind() is registry.engine
+
+    assert registry.engine_created
+    assert created == [registry.engine]
+
+
+def test_warm_up_fills_the_pool(registry, monkeypatch):
+    """Test that warm-up leaves the opened connections idle in the pool."""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+
+    assert registry.warm_up(10) == 3
+    # SQLite file databases use a non-instrumented pool
+    assert pool_stats(registry.engine.pool) is None
+    assert registry.engine.pool.checkedin() == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_up_async_and_dispose(registry, monkeypatch):
+    """Test warming up and disposing the async engine."""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 2)
+
+    assert await registry.warm_up_async(5) == 2
+    assert registry.async_engine is not None
+
+    await registry.dispose_async()
+    assert registry.async_engine is None
+
+
+def test_startup_profile_report():
+    """Test that phases are timed, including ones that fail."""
+    profile = StartupProfile()
+    profile.start()
+    with profile.phase("fast"):
+        pass
+    with pytest.raises(RuntimeError), profile.phase("broken"):
+        raise RuntimeError("boom")
+
+    assert profile.report()["ready"] is False
+    profile.finish()
+    report = profile.report()
+
+    assert report["ready"] is True
+    assert list(report["phases_ms"]) == ["fast", "broken"]
+    assert report["startup_ms"] >= sum(report["phases_ms"].values())
+    if report["time_to_ready_ms"] is not None:
+        assert report["time_to_ready_ms"] >= report["startup_ms"]
@@ -0,0 +1,83 @@
+"""
+Tests for the streaming export endpoints.
+"""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.api import deps
+from app.api.export import export_rows, gzip_chunks
+from app.main import app as main_app
+from app.models.item import Item
+from app.models.note import Note
+from app.models.user import User
+
+
+@pytest.fixture
+def owner(db):
+    """Create a user with items and notes, and serve requests as that user."""
+    user = User(email="exporter@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.flush()
+    db.add_all(
+        Item(title=f"item {i}", description="a, b", owner_id=user.id) for i in range(5)
+    )
+    db.add(Item(title="someone else's", owner_id=None))
+    db.add_all(Note(title=f"note {i}", user_id=user.id) for i in range(3))
+    db.commit()
+    main_app.dependency_overrides[deps.get_current_active_user] = lambda: user
+    return user
+
+
+def test_export_rows_streams_in_batches(db, owner):
+    """Test that each batch of rows becomes one chunk."""
+    statement = select(Item.id, Item.title).where(Item.owner_id == owner.id)
+
+    chunks = list(export_rows(db, statement, ["id", "title"], "ndjson", batch_size=2))
+
+    assert len(chunks) == 3
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["title"] for row in rows] == [f"item {i}" for i in range(5)]
+
+
+def test_gzip_chunks_round_trip():
+    """Test that the compressed chunks form one valid gzip stream."""
+    chunks = [b"first\n", b"", b"second\n"]
+
+    assert gzip.decompress(b"".join(gzip_chunks(chunks))) == b"first\nsecond\n"
+
+
+def test_export_items_as_ndjson(client, owner):
+    """Test the NDJSON export holds only the user's items."""
+    response = client.get(
+        "/api/v1/items/export", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["title"] for item in items] == [f"item {i}" for i in range(5)]
+    assert items[0]["owner_id"] == owner.id
+
+
+def test_export_notes_as_gzipped_csv(client, owner):
+    """Test the CSV export with on-the-fly compression."""
+    response = client.get(
+        "/api/v1/notes/export?format=csv", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert 'filename="notes.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == [f"note {i}" for i in range(3)]
+
+
+def test_export_rejects_unknown_format(client, owner):
+    """Test that only NDJSON and CSV are offered."""
+    assert client.get("/api/v1/items/export?format=xml").status_code == 422
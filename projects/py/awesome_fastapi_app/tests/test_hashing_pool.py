@@ -0,0 +1,44 @@
+"""
+Tests for the bounded password hashing pool.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hashing_pool import PasswordHashingOverloaded, PasswordHashPool
+
+
+def test_run_and_run_async_return_results():
+    """Work runs on the pool, from sync and async callers alike."""
+    pool = PasswordHashPool(max_workers=2, max_queue=2)
+    try:
+        assert pool.run(lambda a, b: a + b, 1, 2) == 3
+        assert asyncio.run(pool.run_async(str.upper, "bcrypt")) == "BCRYPT"
+        assert pool.stats()["completed"] == 2
+    finally:
+        pool.shutdown()
+
+
+def test_saturated_pool_rejects_new_work():
+    """Once workers and queue are full, submissions fail fast."""
+    pool = PasswordHashPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = pool.submit(release.wait)
+        queued = pool.submit(release.wait)
+
+        with pytest.raises(PasswordHashingOverloaded):
+            pool.submit(release.wait)
+
+        stats = pool.stats()
+        assert stats["rejected"] == 1
+        assert stats["running"] + stats["queued"] == 2
+    finally:
+        release.set()
+        running.result()
+        queued.result()
+        pool.shutdown()
+
+    assert pool.stats()["queued"] == 0
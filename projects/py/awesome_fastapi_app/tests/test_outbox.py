@@ -0,0 +1,183 @@
+"""
+Tests for the transactional outbox and its relay to Pub/Sub.
+"""
+
+from concurrent.futures import Future
+
+import pytest
+from sqlalchemy import select
+
+from app import crud
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+from app.models.user import User
+from app.pubsub.publisher import PubSubPublisher
+from app.schemas.item import ItemCreate, ItemUpdate
+from app.services.outbox_relay import OutboxRelay
+
+
+class FakeClient:
+    """Publisher client that accepts every message unless told to fail."""
+
+    def __init__(self):
+        self.messages: list[tuple[str, bytes, str, dict]] = []
+        self.fail_keys: set[str] = set()
+        self.resumed: list[tuple[str, str]] = []
+
+    def topic_path(self, project_id: str, topic_name: str) -> str:
+        return f"projects/{project_id}/topics/{topic_name}"
+
+    def publish(
+        self, topic_path: str, data: bytes, ordering_key: str = "", **attributes: str
+    ) -> Future:
+        future: Future = Future()
+        if ordering_key in self.fail_keys:
+            future.set_exception(RuntimeError("publish failed"))
+        else:
+            self.messages.append((topic_path, data, ordering_key, attributes))
+            future.set_result(f"message-{len(self.messages)}")
+        return future
+
+    def resume_publish(self, topic_path: str, ordering_key: str) -> None:
+        self.resumed.append((topic_path, ordering_key))
+
+    def stop(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def outbox_enabled(monkeypatch):
+    """Enable the outbox."""
+    monkeypatch.setattr(settings, "OUTBOX_ENABLED", True)
+
+
+@pytest.fixture
+def client():
+    """Create a fake client."""
+    return FakeClient()
+
+
+@pytest.fixture
+def relay(db, client):
+    """Create a relay that uses the test session."""
+    return OutboxRelay(
+        publisher=PubSubPublisher(client=client),
+        session_factory=lambda: db,
+        batch_size=10,
+    )
+
+
+def _user_id(db, name: str) -> int:
+    # The relay closes its session, so tests keep IDs rather than instances
+    user = User(email=f"{name}@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _events(db) -> list[OutboxEvent]:
+    return list(db.scalars(select(OutboxEvent).order_by(OutboxEvent.id)))
+
+
+def test_item_writes_add_events(db):
+    """Test that creating, updating and deleting an item adds events."""
+    user_id = _user_id(db, "outbox-writer")
+    item = crud.item.create_with_owner(
+        db, obj_in=ItemCreate(title="Outbox"), owner_id=user_id
+    )
+    crud.item.update(db, db_obj=item, obj_in=ItemUpdate(title="Renamed"))
+    crud.item.remove(db, id=item.id)
+
+    events = _events(db)
+    assert [event.payload["action"] for event in events] == [
+        "item_created",
+        "item_updated",
+        "item_deleted",
+    ]
+    assert {event.ordering_key for event in events} == {str(user_id)}
+    assert events[0].payload == {
+        "action": "item_created",
+        "item_id": item.id,
+        "owner_id": user_id,
+    }
+    assert events[0].topic == settings.PUBSUB_TOPIC_ITEM_EVENTS
+
+
+def test_bulk_writes_add_events(db):
+    """Test that bulk creates and deletes add one event per item."""
+    user_id = _user_id(db, "outbox-bulk")
+    ids = crud.item.create_many_with_owner(
+        db, objs_in=[ItemCreate(title=f"Bulk {n}") for n in range(3)], owner_id=user_id
+    )
+    crud.item.remove_many(db, ids=ids)
+
+    events = _events(db)
+    assert [event.payload["item_id"] for event in events] == ids + ids
+    assert all(event.payload["owner_id"] == user_id for event in events)
+
+
+def test_no_events_when_disabled(db, monkeypatch):
+    """Test that writes add no events while the outbox is disabled."""
+    monkeypatch.setattr(settings, "OUTBOX_ENABLED", False)
+    user_id = _user_id(db, "outbox-quiet")
+    crud.item.create_with_owner(db, obj_in=ItemCreate(title="Quiet"), owner_id=user_id)
+
+    assert _events(db) == []
+
+
+def test_relay_publishes_and_deletes_events(db, relay, client):
+    """Test that published events leave the outbox in order."""
+    user_id = _user_id(db, "outbox-relay")
+    for n in range(3):
+        crud.item.create_with_owner(
+            db, obj_in=ItemCreate(title=f"Relay {n}"), owner_id=user_id
+        )
+
+    assert relay.relay_once() == 3
+
+    assert _events(db) == []
+    assert [message[2] for message in client.messages] == [str(user_id)] * 3
+    assert client.messages[0][3]["user_id"] == str(user_id)
+    assert relay.stats()["published"] == 3
+
+
+def test_failed_events_back_off_and_hold_their_key(db, relay, client):
+    """Test that a failed event is retried later and blocks its key only."""
+    blocked_id = _user_id(db, "outbox-blocked")
+    other_id = _user_id(db, "outbox-other")
+    first_id = crud.item.create_with_owner(
+        db, obj_in=ItemCreate(title="First"), owner_id=blocked_id
+    ).id
+    client.fail_keys.add(str(blocked_id))
+
+    relay.relay_once()
+
+    (event,) = _events(db)
+    assert event.attempts == 1
+    assert event.last_error == "publish failed"
+    assert event.next_attempt_at is not None
+    assert client.resumed == [
+        (
+            f"projects/{relay.publisher.project_id}/topics/{event.topic}",
+            event.ordering_key,
+        )
+    ]
+
+    # Later events of the blocked owner wait, other owners are not affected
+    client.fail_keys.clear()
+    crud.item.create_with_owner(
+        db, obj_in=ItemCreate(title="Second"), owner_id=blocked_id
+    )
+    crud.item.create_with_owner(db, obj_in=ItemCreate(title="Other"), owner_id=other_id)
+
+    assert relay.relay_once() == 1
+    assert [event.payload["owner_id"] for event in _events(db)] == [blocked_id] * 2
+    assert _events(db)[0].payload["item_id"] == first_id
+
+
+def test_retry_delay_is_capped(relay, monkeypatch):
+    """Test the exponential backoff."""
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 1)
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_MAX_SECONDS", 10)
+
+    assert [relay.retry_delay(n) for n in (1, 2, 3, 5)] == [1, 2, 4, 10]
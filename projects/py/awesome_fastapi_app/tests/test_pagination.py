@@ -0,0 +1,156 @@
+"""
+Tests for keyset pagination.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app import crud
+from app.api import deps
+from app.api.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, use_keyset
+from app.crud.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.main import app as main_app
+from app.models.item import Item
+from app.models.user import User
+
+
+@pytest.fixture
+def owner(db):
+    """Create a user owning a handful of items."""
+    user = User(email="pager@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.flush()
+    db.add_all(Item(title=f"item {i}", owner_id=user.id) for i in range(7))
+    db.add(Item(title="someone else's", owner_id=None))
+    db.flush()
+    return user
+
+
+@pytest.fixture
+def as_owner(owner):
+    """Serve requests as the owner of the items."""
+    main_app.dependency_overrides[deps.get_current_active_user] = lambda: owner
+    return owner
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the values it was made from."""
+    created = datetime(2024, 1, 2, 3, 4, 5)
+    cursor = encode_cursor(["created_at", "id"], [created, 42])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, ["created_at", "id"]) == [created.isoformat(), 42]
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", encode_cursor(["id"], [1])])
+def test_decode_cursor_rejects_bad_cursors(cursor):
+    """Test that malformed cursors and cursors for another sort key are rejected."""
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, ["created_at", "id"])
+
+
+def test_get_page_by_owner_walks_all_pages(db, owner):
+    """Test that following cursors returns every row exactly once, in ID order."""
+    seen = []
+    cursor = None
+    while True:
+        page = crud.item.get_page_by_owner(
+            db, owner_id=owner.id, cursor=cursor, limit=3
+        )
+        seen.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    expected = [
+        item.id
+        for item in db.query(Item).filter(Item.owner_id == owner.id).order_by(Item.id)
+    ]
+    assert seen == expected
+    assert len(seen) == 7
+
+
+def test_get_page_without_more_rows_has_no_cursor(db, owner):
+    """Test that a page holding the last row has no next cursor."""
+    page = crud.item.get_page_by_owner(db, owner_id=owner.id, limit=7)
+
+    assert len(page.items) == 7
+    assert page.next_cursor is None
+
+
+def test_get_page_with_composite_sort_key(db, owner):
+    """Test paging on a non-unique column with ID as the tiebreaker."""
+    base = datetime(2024, 1, 1)
+    items = db.query(Item).filter(Item.owner_id == owner.id).order_by(Item.id).all()
+    for index, item in enumerate(items):
+        # Pairs of items share a timestamp; later IDs get earlier timestamps
+        item.created_at = base - timedelta(days=index // 2)
+    db.flush()
+
+    filters = [Item.owner_id == owner.id]
+    first = crud.item.get_page(db, limit=4, order_by=["created_at"], filters=filters)
+    second = crud.item.get_page(
+        db,
+        cursor=first.next_cursor,
+        limit=4,
+        order_by=["created_at"],
+        filters=filters,
+    )
+
+    expected = sorted(items, key=lambda item: (item.created_at, item.id))
+    assert first.items + second.items == expected
+    assert second.next_cursor is None
+
+
+def test_get_page_rejects_cursor_for_other_sort_key(db, owner):
+    """Test that a cursor cannot be reused with a different sort order."""
+    page = crud.item.get_page_by_owner(db, owner_id=owner.id, limit=2)
+
+    with pytest.raises(InvalidCursor):
+        crud.item.get_page(db, cursor=page.next_cursor, order_by=["created_at"])
+
+
+def test_use_keyset():
+    """Test choosing between offset and keyset pagination."""
+    assert use_keyset(0, None)
+    assert use_keyset(0, "cursor")
+    assert not use_keyset(10, None)
+    with pytest.raises(HTTPException):
+        use_keyset(10, "cursor")
+
+
+def test_get_page_rejects_empty_limit(db, owner):
+    """Test that a page must hold at least one row."""
+    with pytest.raises(ValueError):
+        crud.item.get_page_by_owner(db, owner_id=owner.id, limit=0)
+
+
+def test_list_endpoint_follows_cursors(client, as_owner):
+    """Test walking the item list through the next cursor header."""
+    titles = []
+    url = "/api/v1/items/?limit=3"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        titles.extend(item["title"] for item in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        url = cursor and f"/api/v1/items/?limit=3&cursor={cursor}"
+
+    assert titles == [f"item {i}" for i in range(7)]
+
+
+def test_list_endpoint_rejects_skip_with_cursor(client, as_owner):
+    """Test that a cursor cannot be combined with an offset."""
+    cursor = client.get("/api/v1/items/?limit=3").headers[NEXT_CURSOR_HEADER]
+
+    assert client.get(f"/api/v1/items/?skip=1&cursor={cursor}").status_code == 400
+    assert client.get("/api/v1/items/?cursor=not-a-cursor").status_code == 400
+
+
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_SIZE + 1])
+@pytest.mark.parametrize("path", ["/api/v1/items/", "/api/v1/notes/"])
+def test_list_endpoints_reject_out_of_range_limits(client, as_owner, path, limit):
+    """Test that limits outside 1 to MAX_PAGE_SIZE are rejected."""
+    assert client.get(f"{path}?limit={limit}").status_code == 422
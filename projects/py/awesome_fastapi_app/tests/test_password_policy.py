@@ -0,0 +1,114 @@
+"""
+Tests for the password hashing policy and hash upgrades on login.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core import password_policy, security
+from app.crud.crud_user import user as crud_user
+from app.models.user import User
+
+
+def test_policy_hashes_with_default_and_deprecates_other_schemes():
+    """Hashes of non-default schemes verify but need an update."""
+    context = password_policy.build_password_context(
+        scheme="scrypt", environment="test"
+    )
+    legacy = password_policy.build_password_context(
+        scheme="bcrypt", environment="test"
+    ).hash("secret")
+
+    assert context.identify(context.hash("secret")) == "scrypt"
+    assert context.verify("secret", legacy)
+    assert context.needs_update(legacy)
+
+
+def test_profile_parameters_can_be_overridden(monkeypatch):
+    """Settings override individual profile parameters."""
+    monkeypatch.setattr(password_policy.settings, "PASSWORD_HASH_BCRYPT_ROUNDS", 5)
+
+    assert password_policy.get_scheme_parameters("bcrypt", "production") == {
+        "rounds": 5
+    }
+    assert password_policy.get_scheme_parameters("scrypt", "unknown")["rounds"] == 16
+
+
+def test_unsupported_scheme_is_rejected():
+    """Only the supported schemes can be configured."""
+    with pytest.raises(ValueError):
+        password_policy.build_password_context(scheme="md5_crypt")
+
+
+def test_login_upgrades_legacy_hash(db: Session, monkeypatch):
+    """A successful login rehashes a password stored under an old policy."""
+    legacy_hash = password_policy.build_password_context(
+        scheme="bcrypt", environment="test"
+    ).hash("secret")
+    user = User(email="rehash@example.com", hashed_password=legacy_hash)
+    db.add(user)
+    db.commit()
+
+    monkeypatch.setattr(
+        security,
+        "pwd_context",
+        password_policy.build_password_context(scheme="scrypt", environment="test"),
+    )
+
+    assert crud_user.authenticate(db, email=user.email, password="wrong") is None
+    assert user.hashed_password == legacy_hash
+
+    assert crud_user.authenticate(db, email=user.email, password="secret") == user
+    assert security.pwd_context.identify(user.hashed_password) == "scrypt"
+    assert crud_user.authenticate(db, email=user.email, password="secret") == user
+
+
+@pytest.mark.parametrize("scheme", ["argon2", "scrypt", "bcrypt"])
+def test_weaker_policy_never_rehashes(scheme):
+    """Hashes with higher costs or a preferred scheme are kept as they are."""
+    if not password_policy.scheme_available(scheme):
+        pytest.skip(f"No backend for {scheme}")
+    strong = password_policy.build_password_context(
+        scheme=scheme, environment="production"
+    ).hash("secret")
+    weak = password_policy.build_password_context(scheme="bcrypt", environment="test")
+
+    assert weak.needs_update(strong)
+    assert password_policy.verify_and_upgrade(weak, "secret", strong) == (True, None)
+    assert password_policy.verify_and_upgrade(weak, "wrong", strong) == (False, None)
+
+
+def test_stronger_policy_rehashes():
+    """Hashes with lower costs are rehashed under a stronger policy."""
+    weak = password_policy.build_password_context(
+        scheme="bcrypt", environment="test"
+    ).hash("secret")
+    strong = password_policy.build_password_context(
+        scheme="bcrypt", environment="development"
+    )
+
+    verified, new_hash = password_policy.verify_and_upgrade(strong, "secret", weak)
+    assert verified
+    assert new_hash.startswith("$2b$10$")
+
+
+def test_login_keeps_baseline_bcrypt_hash(db: Session, monkeypatch):
+    """A development deployment does not lower the baseline 12 bcrypt rounds."""
+    baseline_hash = password_policy.build_password_context(
+        scheme="bcrypt", environment="production"
+    ).hash("secret")
+    assert baseline_hash.startswith("$2b$12$")
+    user = User(email="baseline@example.com", hashed_password=baseline_hash)
+    db.add(user)
+    db.commit()
+
+    monkeypatch.setattr(
+        security,
+        "pwd_context",
+        password_policy.build_password_context(
+            scheme="bcrypt", environment="development"
+        ),
+    )
+
+    assert crud_user.authenticate(db, email=user.email, password="secret") == user
+    assert user.hashed_password == baseline_hash
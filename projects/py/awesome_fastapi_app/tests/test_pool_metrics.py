@@ -0,0 +1,102 @@
+"""
+Tests for connection pool configuration and metrics.
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, pool_stats
+from app.db.session import get_engine_options
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create a file SQLite engine with a one-connection instrumented pool."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_track_checkouts(engine):
+    """Test in-use gauge and checkout counters."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = pool_stats(engine.pool)
+        assert stats["in_use"] == 1
+        assert stats["waiting"] == 0
+
+    stats = pool_stats(engine.pool)
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["checkout_max_ms"] >= stats["checkout_p50_ms"] >= 0
+
+
+def test_pool_stats_track_waiters_and_timeouts(engine):
+    """Test that callers waiting for a connection are counted."""
+    holder = engine.connect()
+    waiting_seen = []
+
+    def checkout():
+        try:
+            with engine.connect():
+                pass
+        except exc.TimeoutError:
+            pass
+
+    thread = threading.Thread(target=checkout)
+    thread.start()
+    time.sleep(0.05)
+    waiting_seen.append(pool_stats(engine.pool)["waiting"])
+    thread.join()
+    holder.close()
+
+    stats = pool_stats(engine.pool)
+    assert waiting_seen == [1]
+    assert stats["waiting"] == 0
+    assert stats["timeouts"] == 1
+
+
+def test_metrics_survive_dispose(engine):
+    """Test that recreating the pool keeps its counters."""
+    with engine.connect():
+        pass
+    engine.dispose()
+
+    assert pool_stats(engine.pool)["checkouts"] == 1
+
+
+def test_engine_options_statement_timeout(monkeypatch):
+    """Test that the statement timeout is sent as a startup option."""
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    sync_options = get_engine_options()
+    async_options = get_engine_options(async_driver=True)
+
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert async_options["connect_args"] == {
+        "server_settings": {"statement_timeout": "5000"}
+    }
+    assert sync_options["echo"] is settings.DB_ECHO
+
+
+def test_engine_options_pgbouncer(monkeypatch):
+    """Test that PgBouncer mode disables prepared statement caches."""
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    assert "connect_args" not in get_engine_options()
+    assert get_engine_options(async_driver=True)["connect_args"] == {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+    }
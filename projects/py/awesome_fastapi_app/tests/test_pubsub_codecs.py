@@ -0,0 +1,81 @@
+"""
+Tests for the Pub/Sub payload codecs.
+"""
+
+import pytest
+
+from app.pubsub.codecs import (
+    ITEM_EVENT_CONTENT_TYPE,
+    JSON_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    decode_message,
+    get_codec,
+)
+from app.pubsub.fake import FakeBroker, FakePublisherClient
+from app.pubsub.publisher import PubSubPublisher
+
+EVENT = {"action": "item_created", "item_id": 12345, "owner_id": 42}
+
+
+def test_json_round_trip():
+    """Test the default codec."""
+    codec = get_codec()
+
+    assert codec.content_type == JSON_CONTENT_TYPE
+    assert codec.decode(codec.encode(EVENT)) == EVENT
+
+
+def test_msgpack_round_trip():
+    """Test the MessagePack codec."""
+    pytest.importorskip("msgpack")
+    codec = get_codec(MSGPACK_CONTENT_TYPE)
+
+    assert codec.decode(codec.encode(EVENT)) == EVENT
+
+
+def test_item_event_protobuf_round_trip():
+    """Test the item event schema, which is smaller than JSON."""
+    codec = get_codec(ITEM_EVENT_CONTENT_TYPE)
+    data = codec.encode(EVENT)
+
+    assert codec.decode(data) == EVENT
+    assert len(data) < len(get_codec().encode(EVENT))
+    assert codec.decode(codec.encode({**EVENT, "owner_id": None}))["owner_id"] == 0
+    with pytest.raises(ValueError):
+        codec.encode({**EVENT, "title": "not in the schema"})
+
+
+def test_decoding_follows_the_content_type_attribute():
+    """Test that messages are decoded by their content type."""
+    protobuf = get_codec(ITEM_EVENT_CONTENT_TYPE)
+
+    assert decode_message(b'{"id": 1}', {}) == {"id": 1}
+    assert (
+        decode_message(
+            protobuf.encode(EVENT), {"content-type": ITEM_EVENT_CONTENT_TYPE}
+        )
+        == EVENT
+    )
+    with pytest.raises(ValueError):
+        decode_message(b"data", {"content-type": "text/unknown"})
+
+
+def test_publisher_encodes_by_topic():
+    """Test that each topic's payloads use the topic's codec."""
+
+    class RecordingClient(FakePublisherClient):
+        def publish(self, topic, data, ordering_key="", **attributes):
+            messages.append((data, attributes))
+            return super().publish(topic, data, ordering_key, **attributes)
+
+    messages: list[tuple[bytes, dict]] = []
+    publisher = PubSubPublisher(client=RecordingClient(FakeBroker()))
+    publisher.topic_content_types = {"item-events": ITEM_EVENT_CONTENT_TYPE}
+
+    publisher.publish("item-events", EVENT, {"user_id": "42"})
+    publisher.publish("other", {"id": 1})
+
+    (item_data, item_attributes), (other_data, other_attributes) = messages
+    assert decode_message(item_data, item_attributes) == EVENT
+    assert item_attributes["user_id"] == "42"
+    assert other_attributes == {"content-type": JSON_CONTENT_TYPE}
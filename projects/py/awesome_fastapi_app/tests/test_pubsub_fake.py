@@ -0,0 +1,122 @@
+"""
+Tests for lazy Pub/Sub clients, provisioning and the in-process transport.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.pubsub import publisher as publisher_module
+from app.pubsub.fake import (
+    FakeBroker,
+    FakePublisherClient,
+    FakeSubscriberClient,
+    fake_broker,
+)
+from app.pubsub.provisioning import provision_pubsub, required_topics
+from app.pubsub.publisher import PubSubPublisher
+from app.pubsub.subscriber import PubSubSubscriber
+
+
+@pytest.fixture
+def fake_transport(monkeypatch):
+    """Use the in-process transport on an empty broker."""
+    monkeypatch.setattr(settings, "PUBSUB_TRANSPORT", "fake")
+    fake_broker.reset()
+    yield fake_broker
+    fake_broker.reset()
+
+
+def test_client_is_created_on_first_use(monkeypatch):
+    """Test that constructing the publisher does not create a client."""
+    created = []
+    monkeypatch.setattr(settings, "GCP_PROJECT_ID", "test-project")
+    monkeypatch.setattr(
+        publisher_module,
+        "create_publisher_client",
+        lambda: created.append(1) or FakePublisherClient(FakeBroker()),
+    )
+
+    publisher = PubSubPublisher()
+    assert publisher.enabled
+    assert created == []
+    assert publisher.flush(timeout=0)
+    assert created == []
+
+    assert publisher.publish_nowait("example", {"id": 1})
+    assert publisher.publish_nowait("example", {"id": 2})
+    assert created == [1]
+
+
+def test_not_configured_without_project():
+    """Test that nothing is published without a project or fake transport."""
+    publisher = PubSubPublisher()
+
+    assert not publisher.enabled
+    assert publisher.publisher is None
+    assert not publisher.publish_nowait("example", {"id": 1})
+
+
+def test_provisioning_is_idempotent():
+    """Test that provisioning twice keeps the same topics and subscriptions."""
+    broker = FakeBroker()
+    publisher = PubSubPublisher(client=FakePublisherClient(broker))
+    subscriber = PubSubSubscriber(client=FakeSubscriberClient(broker))
+
+    provision_pubsub(timeout=5, publisher=publisher, subscriber=subscriber)
+    provision_pubsub(timeout=5, publisher=publisher, subscriber=subscriber)
+
+    assert len(broker.topics) == len(required_topics())
+    assert list(broker.subscriptions) == [
+        f"projects/{subscriber.project_id}/subscriptions/"
+        f"{settings.PUBSUB_SUBSCRIPTION_EXAMPLE}"
+    ]
+
+
+def test_provisioning_times_out():
+    """Test that slow provisioning gives up once the timeout is spent."""
+
+    class SlowClient(FakePublisherClient):
+        def create_topic(self, request, timeout=None):
+            time.sleep(0.05)
+            super().create_topic(request)
+
+    broker = FakeBroker()
+    publisher = PubSubPublisher(client=SlowClient(broker))
+    subscriber = PubSubSubscriber(client=FakeSubscriberClient(broker))
+
+    with pytest.raises(TimeoutError):
+        provision_pubsub(timeout=0.01, publisher=publisher, subscriber=subscriber)
+
+
+def test_fake_transport_round_trip(fake_transport):
+    """Test publishing and batch subscribing through the in-process broker."""
+    publisher = PubSubPublisher()
+    subscriber = PubSubSubscriber()
+    provision_pubsub(timeout=5, publisher=publisher, subscriber=subscriber)
+    received = []
+    done = threading.Event()
+
+    def handle(messages):
+        received.extend(message.data["id"] for message in messages)
+        if len(received) == 5:
+            done.set()
+
+    subscriber.subscribe_batch(
+        settings.PUBSUB_SUBSCRIPTION_EXAMPLE, handle, batch_size=5, max_wait=0.01
+    )
+    for n in range(5):
+        assert publisher.publish_nowait(settings.PUBSUB_TOPIC_EXAMPLE, {"id": n})
+
+    try:
+        assert done.wait(5)
+        assert received == list(range(5))
+        subscription = next(iter(fake_transport.subscriptions.values()))
+        deadline = time.monotonic() + 5
+        while subscription.acked < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert subscription.acked == 5
+    finally:
+        subscriber.close(timeout=5)
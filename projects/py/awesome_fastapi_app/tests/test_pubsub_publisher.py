@@ -0,0 +1,108 @@
+"""
+Tests for non-blocking, batched Pub/Sub publishing.
+"""
+
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from app.pubsub.publisher import PubSubPublisher
+
+
+class FakeClient:
+    """Publisher client whose publishes complete only when told to."""
+
+    def __init__(self):
+        self.futures: list[Future] = []
+        self.messages: list[tuple[str, bytes, dict]] = []
+        self.stopped = False
+
+    def topic_path(self, project_id: str, topic_name: str) -> str:
+        return f"projects/{project_id}/topics/{topic_name}"
+
+    def publish(self, topic_path: str, data: bytes, **attributes: str) -> Future:
+        if self.stopped:
+            raise RuntimeError("Cannot publish on a stopped publisher.")
+        future: Future = Future()
+        self.futures.append(future)
+        self.messages.append((topic_path, data, attributes))
+        return future
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture
+def client():
+    """Create a fake client."""
+    return FakeClient()
+
+
+@pytest.fixture
+def publisher(client):
+    """Create a publisher with a small outbox."""
+    publisher = PubSubPublisher(client=client)
+    publisher.max_pending = 2
+    return publisher
+
+
+def test_publish_nowait_does_not_wait_for_the_result(publisher, client):
+    """Test that messages are queued and accounted for when they complete."""
+    assert publisher.publish_nowait("example", {"id": 1}, {"user_id": "7"})
+    assert publisher.stats()["pending"] == 1
+
+    client.futures[0].set_result("message-1")
+
+    stats = publisher.stats()
+    assert (stats["pending"], stats["published"]) == (0, 1)
+    assert client.messages[0][2] == {
+        "user_id": "7",
+        "content-type": "application/json",
+    }
+
+
+def test_failed_publishes_are_counted(publisher, client):
+    """Test that a publish error is recorded by the completion callback."""
+    publisher.publish_nowait("example", {"id": 1})
+
+    client.futures[0].set_exception(TimeoutError("deadline exceeded"))
+
+    assert publisher.stats()["failed"] == 1
+    assert publisher.stats()["pending"] == 0
+
+
+def test_full_outbox_drops_messages(publisher, client):
+    """Test that a full outbox rejects messages instead of blocking."""
+    assert publisher.publish_nowait("example", {"id": 1})
+    assert publisher.publish_nowait("example", {"id": 2})
+
+    assert not publisher.publish_nowait("example", {"id": 3})
+    assert publisher.stats()["dropped"] == 1
+    with pytest.raises(RuntimeError):
+        publisher.publish_message("example", {"id": 4})
+
+
+def test_flush_waits_for_outstanding_messages(publisher, client):
+    """Test that flush stops the client and waits for pending results."""
+    publisher.publish_nowait("example", {"id": 1})
+    threading.Timer(0.05, client.futures[0].set_result, ["message-1"]).start()
+
+    assert publisher.flush(timeout=5)
+    assert client.stopped
+    assert not publisher.publish_nowait("example", {"id": 2})
+
+
+def test_flush_times_out(publisher, client):
+    """Test that flush gives up on messages that never complete."""
+    publisher.publish_nowait("example", {"id": 1})
+
+    assert not publisher.flush(timeout=0.01)
+
+
+def test_publish_message_returns_the_id(publisher, client):
+    """Test the blocking publish."""
+    threading.Timer(0.01, lambda: client.futures[0].set_result("message-1")).start()
+
+    assert publisher.publish_message("example", {"id": 1}) == "message-1"
+    assert publisher.stats()["latency_max_ms"] > 0
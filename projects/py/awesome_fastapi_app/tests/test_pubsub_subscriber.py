@@ -0,0 +1,246 @@
+"""
+Tests for the batching, flow-controlled Pub/Sub subscriber.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.pubsub import subscriber as subscriber_module
+from app.pubsub.subscriber import PubSubSubscriber
+
+
+class FakeMessage:
+    """Received message recording whether it was acked or nacked."""
+
+    def __init__(self, message_id: str, data: bytes, delivery_attempt: int = 0):
+        self.message_id = message_id
+        self.data = data
+        self.attributes = {"user_id": "7"}
+        self.publish_time = datetime.now(timezone.utc) - timedelta(seconds=1)
+        self.delivery_attempt = delivery_attempt
+        self.outcome: str | None = None
+        self.settled = threading.Event()
+
+    def ack(self) -> None:
+        self.outcome = "ack"
+        self.settled.set()
+
+    def nack(self) -> None:
+        self.outcome = "nack"
+        self.settled.set()
+
+
+class FakeClient:
+    """Subscriber client that delivers messages when told to."""
+
+    def __init__(self):
+        self.callback = None
+        self.flow_control = None
+
+    def subscription_path(self, project_id: str, name: str) -> str:
+        return f"projects/{project_id}/subscriptions/{name}"
+
+    def subscribe(self, subscription_path, callback, flow_control=None):
+        self.callback = callback
+        self.flow_control = flow_control
+        return Future()
+
+    def deliver(self, *messages: FakeMessage) -> None:
+        for message in messages:
+            self.callback(message)
+
+
+class FakePublisher:
+    """Publisher accepting every dead letter."""
+
+    def __init__(self):
+        self.messages: list[tuple[str, bytes, dict]] = []
+
+    def publish(self, topic_name, message, attributes=None, ordering_key=""):
+        self.messages.append((topic_name, message, attributes))
+        future: Future = Future()
+        future.set_result("dead-letter-1")
+        return future
+
+
+def _message(n: int, delivery_attempt: int = 0) -> FakeMessage:
+    return FakeMessage(str(n), json.dumps({"n": n}).encode(), delivery_attempt)
+
+
+def _settle(*messages: FakeMessage) -> list[str | None]:
+    for message in messages:
+        assert message.settled.wait(5)
+    return [message.outcome for message in messages]
+
+
+@pytest.fixture
+def client():
+    """Create a fake client."""
+    return FakeClient()
+
+
+@pytest.fixture
+def subscriber(client):
+    """Create a subscriber on the fake client."""
+    subscriber = PubSubSubscriber(client=client)
+    yield subscriber
+    subscriber.close(timeout=5)
+
+
+@pytest.fixture
+def dead_letters(monkeypatch):
+    """Capture dead-lettered messages."""
+    publisher = FakePublisher()
+    monkeypatch.setattr(subscriber_module, "pubsub_publisher", publisher)
+    return publisher.messages
+
+
+def test_full_batches_are_processed_together(subscriber, client):
+    """Test that the callback receives decoded batches and messages are acked."""
+    batches = []
+    subscription = subscriber.subscribe_batch(
+        "items", lambda messages: batches.append(messages), batch_size=2, max_wait=60
+    )
+
+    messages = [_message(n) for n in range(4)]
+    client.deliver(*messages)
+
+    assert _settle(*messages) == ["ack"] * 4
+    assert [[m.data["n"] for m in batch] for batch in batches] == [[0, 1], [2, 3]]
+    assert batches[0][0].attributes == {"user_id": "7"}
+    stats = subscription.stats()
+    assert (stats["acked"], stats["batches"], stats["in_flight"]) == (4, 2, 0)
+    assert stats["lag_p50_ms"] >= 1000
+    assert client.flow_control.max_messages > 0
+
+
+def test_partial_batch_is_flushed_after_max_wait(subscriber, client):
+    """Test that a batch that does not fill is processed after max_wait."""
+    batches = []
+    subscriber.subscribe_batch(
+        "items", lambda messages: batches.append(messages), batch_size=10, max_wait=0
+    )
+
+    message = _message(1)
+    client.deliver(message)
+
+    assert _settle(message) == ["ack"]
+    assert len(batches) == 1
+
+
+def test_failed_messages_are_retried_then_dead_lettered(
+    subscriber, client, dead_letters
+):
+    """Test partial failures and the dead-letter path."""
+    subscriber.subscribe_batch(
+        "items",
+        lambda messages: [m for m in messages if m.data["n"] % 2],
+        batch_size=3,
+        max_delivery_attempts=3,
+    )
+
+    messages = [_message(0), _message(1), _message(3, delivery_attempt=3)]
+    client.deliver(*messages)
+
+    assert _settle(*messages) == ["ack", "nack", "ack"]
+    ((topic, data, attributes),) = dead_letters
+    assert topic == "items-dead-letter"
+    assert data == messages[2].data
+    assert attributes["source_message_id"] == "3"
+
+
+def test_undecodable_messages_are_dead_lettered(subscriber, client, dead_letters):
+    """Test that poison messages skip the callback."""
+    batches = []
+    subscriber.subscribe_batch(
+        "items", lambda messages: batches.append(messages), batch_size=2
+    )
+
+    messages = [FakeMessage("1", b"not json"), _message(2)]
+    client.deliver(*messages)
+
+    assert _settle(*messages) == ["ack", "ack"]
+    assert [m.message_id for m in batches[0]] == ["2"]
+    assert dead_letters[0][2]["dead_letter_reason"].startswith("undecodable")
+
+
+def test_attempts_are_counted_without_a_dead_letter_policy(
+    subscriber, client, dead_letters
+):
+    """Test the in-process attempt count when Pub/Sub does not count them."""
+
+    def fail(messages):
+        raise RuntimeError("boom")
+
+    subscriber.subscribe_batch("items", fail, batch_size=1, max_delivery_attempts=2)
+
+    first, second = _message(1), _message(1)
+    client.deliver(first)
+    assert _settle(first) == ["nack"]
+    client.deliver(second)
+    assert _settle(second) == ["ack"]
+    assert len(dead_letters) == 1
+
+
+def test_asyncio_executor():
+    """Test that coroutine callbacks run on the given event loop."""
+    client = FakeClient()
+    subscriber = PubSubSubscriber(client=client)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    seen = []
+
+    async def handle(messages):
+        seen.append(asyncio.get_running_loop())
+        return None
+
+    try:
+        subscriber.subscribe_batch("items", handle, executor=loop, batch_size=1)
+        message = _message(1)
+        client.deliver(message)
+
+        assert _settle(message) == ["ack"]
+        assert seen == [loop]
+    finally:
+        subscriber.close(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_per_message_subscribe_isolates_failures(subscriber, client):
+    """Test the single-message callback on top of batches."""
+    received = []
+
+    def handle(data, attributes):
+        if data["n"] == 2:
+            raise ValueError("bad item")
+        received.append(data["n"])
+
+    assert subscriber.subscribe("items", handle) is not None
+    subscription = subscriber.subscriptions["items"]
+    subscription.batch_size = 3
+
+    messages = [_message(n) for n in range(1, 4)]
+    client.deliver(*messages)
+
+    assert _settle(*messages) == ["ack", "nack", "ack"]
+    assert received == [1, 3]
+
+
+def test_shared_executor_is_not_shut_down(client):
+    """Test that a given thread pool stays usable after closing."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    subscriber = PubSubSubscriber(client=client)
+    subscriber.subscribe_batch("items", lambda messages: None, executor=executor)
+
+    subscriber.close(timeout=5)
+
+    assert executor.submit(lambda: 1).result() == 1
+    executor.shutdown()
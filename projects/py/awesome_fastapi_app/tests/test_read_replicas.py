@@ -0,0 +1,125 @@
+"""
+Tests for routing reads to replicas.
+"""
+
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine, exc, select
+
+from app.api import deps
+from app.db.base import Base
+from app.db.session import EngineRegistry, use_primary
+from app.models.user import User
+
+
+def _create_database(path, email):
+    """Create a SQLite database holding a single user."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            User.__table__.insert().values(
+                email=email, hashed_password="x", is_active=True
+            )
+        )
+    engine.dispose()
+    return f"sqlite:///{path}"
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Create a registry whose primary and replicas hold different users."""
+    registry = EngineRegistry(
+        _create_database(tmp_path / "primary.db", "primary@example.com"),
+        replica_urls=[
+            _create_database(tmp_path / "replica-a.db", "replica-a@example.com"),
+            _create_database(tmp_path / "replica-b.db", "replica-b@example.com"),
+        ],
+    )
+    yield registry
+    registry.dispose()
+
+
+def _email(db):
+    """Read the email of the only user in the database the session routes to."""
+    return db.scalars(select(User.email)).one()
+
+
+def test_reads_go_to_replicas_round_robin(registry):
+    """Test that SELECTs alternate between the replicas."""
+    sessions = registry.get_sessionmaker()
+
+    with sessions() as db:
+        emails = [_email(db) for _ in range(3)]
+
+    assert emails == [
+        "replica-a@example.com",
+        "replica-b@example.com",
+        "replica-a@example.com",
+    ]
+
+
+def test_reads_after_a_write_use_the_primary(registry):
+    """Test that a session reads its own writes."""
+    with registry.get_sessionmaker()() as db:
+        assert _email(db) != "primary@example.com"
+        db.add(User(email="new@example.com", hashed_password="x"))
+        db.commit()
+
+        emails = db.scalars(select(User.email).order_by(User.id)).all()
+
+    assert emails == ["primary@example.com", "new@example.com"]
+
+
+def test_use_primary(registry):
+    """Test the per-session override."""
+    with registry.get_sessionmaker()() as db:
+        use_primary(db)
+        assert _email(db) == "primary@example.com"
+
+
+def test_replica_that_is_down_is_skipped(tmp_path):
+    """Test that a replica that fails to connect is marked down."""
+    registry = EngineRegistry(
+        _create_database(tmp_path / "primary.db", "primary@example.com"),
+        replica_urls=[f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"],
+    )
+    sessions = registry.get_sessionmaker()
+
+    with sessions() as db, pytest.raises(exc.OperationalError):
+        _email(db)
+    with sessions() as db:
+        assert _email(db) == "primary@example.com"
+
+    assert [replica["healthy"] for replica in registry.replicas.status()] == [False]
+    registry.dispose()
+
+
+@pytest.mark.parametrize(
+    "method, expected",
+    [("GET", "replica-a@example.com"), ("POST", "primary@example.com")],
+)
+def test_get_db_routes_by_request_method(registry, monkeypatch, method, expected):
+    """Test that only read-only requests may use a replica."""
+    monkeypatch.setattr(deps, "SessionLocal", registry.get_sessionmaker())
+    request = Request({"type": "http", "method": method, "headers": []})
+
+    dependency = deps.get_db(request)
+    db = next(dependency)
+    try:
+        assert _email(db) == expected
+    finally:
+        dependency.close()
+
+
+@pytest.mark.asyncio
+async def test_async_sessions_route_like_sync_sessions(registry):
+    """Test replica routing for async sessions."""
+    async with registry.get_async_sessionmaker()() as db:
+        replica = (await db.scalars(select(User.email))).one()
+        use_primary(db)
+        primary = (await db.scalars(select(User.email))).one()
+
+    assert replica == "replica-a@example.com"
+    assert primary == "primary@example.com"
+    await registry.dispose_async()
@@ -0,0 +1,104 @@
+"""
+Tests for the access log middleware.
+"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.request_logging import (
+    ACCESS_LOGGER_NAME,
+    UNMATCHED_ROUTE,
+    AccessLogMiddleware,
+)
+
+
+class ListHandler(logging.Handler):
+    """Keeps the records it handles."""
+
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_records():
+    """Collect the records of the access logger."""
+    logger = logging.getLogger(ACCESS_LOGGER_NAME)
+    handler = ListHandler()
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield handler.records
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+# Built at import time, before test_telemetry replaces the fastapi module
+app = FastAPI()
+
+
+@app.get("/items/{item_id}")
+def read_item(item_id: int):
+    return {"id": item_id}
+
+
+@app.get("/boom")
+def boom():
+    raise RuntimeError("boom")
+
+
+def _client(**options) -> TestClient:
+    """Create a client of the app behind the middleware."""
+    return TestClient(
+        AccessLogMiddleware(app, **options), raise_server_exceptions=False
+    )
+
+
+def test_one_record_per_request(access_records):
+    """Test that a request is logged once with its route template."""
+    client = _client(sample_rate=1.0, max_per_second=0)
+
+    assert client.get("/items/42").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    found, missing = access_records
+    assert found.http_method == "GET"
+    assert found.http_route == "/items/{item_id}"
+    assert found.http_status == 200
+    assert found.duration_ms >= 0
+    assert found.getMessage().startswith("GET /items/{item_id} 200 ")
+    assert missing.http_route == UNMATCHED_ROUTE
+    assert missing.http_status == 404
+
+
+def test_server_errors_bypass_sampling(access_records):
+    """Test that unsampled requests are dropped unless they fail."""
+    client = _client(sample_rate=0.0, max_per_second=0)
+
+    client.get("/items/1")
+    assert client.get("/boom").status_code == 500
+
+    (record,) = access_records
+    assert record.http_route == "/boom"
+    assert record.http_status == 500
+    assert record.levelno == logging.ERROR
+
+
+def test_rate_cap_reports_suppressed_records(access_records, monkeypatch):
+    """Test that records over the cap are counted on the next record."""
+    now = [100.0]
+    monkeypatch.setattr("app.core.request_logging.time.monotonic", lambda: now[0])
+    client = _client(sample_rate=1.0, max_per_second=2)
+
+    for n in range(5):
+        client.get(f"/items/{n}")
+    now[0] += 1
+    client.get("/items/5")
+
+    assert [record.suppressed for record in access_records] == [0, 0, 3]
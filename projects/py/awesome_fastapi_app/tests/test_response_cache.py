@@ -0,0 +1,185 @@
+"""
+Tests for the item and note response cache.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from app import crud, schemas
+from app.api import caching, deps
+from app.api.caching import etag_matches
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.response_cache import (
+    CachedResponse,
+    LRUBackend,
+    ResponseCache,
+    response_cache,
+)
+from app.db.session import USE_PRIMARY
+from app.main import app as main_app
+from app.models.user import User
+
+
+class TitleSchema(BaseModel):
+    """Response schema of the rows cached in the unit tests."""
+
+    id: int
+    title: str
+
+
+@pytest.fixture
+def cache():
+    """Create a small in-process cache."""
+    return ResponseCache(backend=LRUBackend(max_size=2), ttl_seconds=60)
+
+
+@pytest.fixture
+def owner(db, monkeypatch):
+    """Create a user and serve requests as that user, with the cache enabled."""
+    monkeypatch.setattr(response_cache, "enabled", True)
+    user = User(email="cached@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    main_app.dependency_overrides[deps.get_current_active_user] = lambda: user
+    return user
+
+
+def test_entry_round_trip():
+    """Test encoding an entry for Redis and reading it back."""
+    entry = CachedResponse(b'{"id":1}', owner_id=3, next_cursor="abc")
+
+    decoded = CachedResponse.decode(entry.encode())
+
+    assert decoded.body == entry.body
+    assert (decoded.etag, decoded.owner_id, decoded.next_cursor) == (
+        entry.etag,
+        3,
+        "abc",
+    )
+
+
+def test_lru_evicts_least_recently_used(cache):
+    """Test that the backend keeps only the most recently used entries."""
+    for key in ("a", "b"):
+        cache.put(key, CachedResponse(key.encode()))
+    cache.get("a")
+    cache.put("c", CachedResponse(b"c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"a"
+    assert cache.get("c").body == b"c"
+
+
+def test_invalidation_is_scoped_to_the_owner(cache):
+    """Test that a write only retires the pages of the row's owner."""
+    page = cache.page_key("items", owner_id=1, cursor=None, limit=10)
+    other = cache.page_key("items", owner_id=2, cursor=None, limit=10)
+    everything = cache.page_key("items", owner_id=None, cursor=None, limit=10)
+
+    cache.invalidate("items", ids=[5], owner_ids=[1])
+
+    assert cache.page_key("items", owner_id=1, cursor=None, limit=10) != page
+    assert cache.page_key("items", owner_id=2, cursor=None, limit=10) == other
+    assert cache.page_key("items", owner_id=None, cursor=None, limit=10) != everything
+
+
+def test_invalidation_without_owners_retires_every_page(cache):
+    """Test that writes by ID alone invalidate all pages of the namespace."""
+    page = cache.page_key("items", owner_id=2, cursor=None, limit=10)
+    cache.put(cache.object_key("items", 5), CachedResponse(b"{}"))
+
+    cache.invalidate("items", ids=[5], owner_ids=None)
+
+    assert cache.page_key("items", owner_id=2, cursor=None, limit=10) != page
+    assert cache.get(cache.object_key("items", 5)) is None
+
+
+def test_row_written_during_a_miss_is_not_cached_stale(cache, monkeypatch):
+    """Test that a row loaded before a concurrent write is not served later."""
+    monkeypatch.setattr(caching, "response_cache", cache)
+    items = SimpleNamespace(cache_namespace="items", _owner_of=lambda obj: 1)
+
+    def load_during_update():
+        row = {"id": 5, "title": "old"}
+        cache.invalidate("items", ids=[5], owner_ids=[1])
+        return row
+
+    entry = caching.cached_object(items, TitleSchema, 5, load_during_update)
+
+    assert b'"old"' in entry.body
+    assert cache.get(cache.object_key("items", 5)) is None
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [(None, False), ('"abc"', True), ('W/"abc"', True), ('"x", "abc"', True)],
+)
+def test_etag_matches(header, expected):
+    """Test If-None-Match parsing."""
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_read_item_is_cached_and_revalidated(client, db, owner):
+    """Test ETags, 304s and invalidation on update for a single item."""
+    item = crud.item.create_with_owner(
+        db, obj_in=schemas.ItemCreate(title="first"), owner_id=owner.id
+    )
+    url = f"/api/v1/items/{item.id}"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert response.json()["title"] == "first"
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    hits = response_cache.hits
+    assert client.get(url).json()["title"] == "first"
+    assert response_cache.hits == hits + 1
+
+    crud.item.update(db, db_obj=item, obj_in={"title": "second"})
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "second"
+
+
+def test_cached_item_still_checks_the_owner(client, db, owner):
+    """Test that a cached item is not served to another user."""
+    item = crud.item.create_with_owner(
+        db, obj_in=schemas.ItemCreate(title="private"), owner_id=owner.id
+    )
+    client.get(f"/api/v1/items/{item.id}")
+    stranger = User(id=owner.id + 1000, email="x@example.com", is_superuser=False)
+    main_app.dependency_overrides[deps.get_current_active_user] = lambda: stranger
+
+    assert client.get(f"/api/v1/items/{item.id}").status_code == 400
+
+
+def test_note_pages_are_invalidated_on_create(client, db, owner):
+    """Test that creating a note retires its owner's cached pages."""
+    for i in range(3):
+        crud.note.create_with_owner(
+            db, obj_in=schemas.NoteCreate(title=f"note {i}"), owner_id=owner.id
+        )
+
+    first = client.get("/api/v1/notes/?limit=2")
+    assert [note["title"] for note in first.json()] == ["note 0", "note 1"]
+    assert NEXT_CURSOR_HEADER in first.headers
+
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    assert len(client.get(f"/api/v1/notes/?limit=2&cursor={cursor}").json()) == 1
+    crud.note.create_with_owner(
+        db, obj_in=schemas.NoteCreate(title="note 3"), owner_id=owner.id
+    )
+
+    second = client.get(f"/api/v1/notes/?limit=2&cursor={cursor}")
+    assert [note["title"] for note in second.json()] == ["note 2", "note 3"]
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_cache_fills_read_from_the_primary(db, monkeypatch, enabled):
+    """Test that replicas are only bypassed while responses are cached."""
+    monkeypatch.setattr(response_cache, "enabled", enabled)
+
+    assert deps.get_cache_fill_db(db) is db
+    assert db.info.get(USE_PRIMARY, False) is enabled
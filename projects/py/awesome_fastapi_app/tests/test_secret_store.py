@@ -0,0 +1,99 @@
+"""
+Tests for the shared secret store used by all worker processes.
+"""
+
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from app.core import security
+from app.core.config import settings
+from app.core.secret_rotation import JWT_KEY_TYPE, SecretRotationManager
+from app.core.secret_store import GENERATION_KEY, FileSecretStore, SecretStoreError
+
+
+def test_update_bumps_generation_and_writes_atomically(tmp_path):
+    """Each write bumps the generation and leaves only the final file."""
+    path = tmp_path / "secret_keys.json"
+    store = FileSecretStore(str(path))
+
+    data, generation = store.update(lambda d: d.setdefault("jwt", []) == [])
+    assert generation == 1
+
+    data, generation = store.update(lambda d: False)
+    assert generation == 1
+
+    with open(path) as f:
+        assert json.load(f)[GENERATION_KEY] == 1
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_has_changed_detects_writes_by_another_store(tmp_path):
+    """A store notices when a peer rewrote the file."""
+    path = str(tmp_path / "secret_keys.json")
+    ours = FileSecretStore(path)
+    theirs = FileSecretStore(path)
+    ours.load()
+
+    assert not ours.has_changed()
+    theirs.update(lambda d: d.setdefault("jwt", []) == [])
+    assert ours.has_changed()
+
+
+def test_unreadable_file_is_never_overwritten(tmp_path):
+    """A file that cannot be parsed is reported and kept as it is."""
+    path = tmp_path / "secret_keys.json"
+    path.write_text('{"jwt": [{"key": "old"')
+    store = FileSecretStore(str(path))
+
+    with pytest.raises(SecretStoreError):
+        store.load()
+    with pytest.raises(SecretStoreError):
+        store.update(lambda d: d.setdefault("jwt", []) == [])
+
+    manager = SecretRotationManager(secret_file_path=str(path), enabled=True)
+    assert manager.get_current_jwt_key() == settings.SECRET_KEY
+    assert path.read_text() == '{"jwt": [{"key": "old"'
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    """Locked read-modify-write keeps every concurrent change."""
+    path = str(tmp_path / "secret_keys.json")
+
+    def append(value):
+        def mutator(data):
+            data.setdefault("values", []).append(value)
+            return True
+
+        FileSecretStore(path).update(mutator)
+
+    threads = [threading.Thread(target=append, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    data, generation = FileSecretStore(path).load()
+    assert sorted(data["values"]) == list(range(20))
+    assert generation == 20
+
+
+def test_workers_share_the_initial_key_and_see_peer_rotations(tmp_path, monkeypatch):
+    """A key rotated by one worker verifies on another worker."""
+    path = str(tmp_path / "secret_keys.json")
+    worker_a = SecretRotationManager(secret_file_path=path, enabled=True)
+    worker_b = SecretRotationManager(secret_file_path=path, enabled=True)
+    assert worker_a.secrets[JWT_KEY_TYPE] == worker_b.secrets[JWT_KEY_TYPE]
+
+    new_key = worker_a.force_rotate_jwt_key()
+    monkeypatch.setattr(security, "secret_manager", worker_a)
+    token = security.create_access_token(5)
+
+    monkeypatch.setattr(security, "secret_manager", worker_b)
+    assert security.verify_token(token) == "5"
+    assert worker_b.get_current_jwt_key() == new_key
+    assert worker_b.generation == worker_a.generation
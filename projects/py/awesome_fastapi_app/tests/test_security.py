@@ -0,0 +1,126 @@
+"""
+Tests for JWT signing and rotation-aware verification.
+"""
+
+import threading
+import time
+
+from jose import jwt
+
+from app.core import security
+from app.core.config import settings
+from app.core.secret_rotation import JWTKeyring, SecretRotationManager, jwt_key_id
+
+
+def _manager(tmp_path) -> SecretRotationManager:
+    return SecretRotationManager(
+        secret_file_path=str(tmp_path / "secret_keys.json"), enabled=True
+    )
+
+
+def test_tokens_carry_kid_of_signing_key(tmp_path, monkeypatch):
+    """New tokens name the key they were signed with."""
+    manager = _manager(tmp_path)
+    monkeypatch.setattr(security, "secret_manager", manager)
+
+    token = security.create_access_token(42)
+
+    header = jwt.get_unverified_header(token)
+    assert header["kid"] == jwt_key_id(manager.get_current_jwt_key())
+    assert security.verify_token(token) == "42"
+
+
+def test_token_signed_with_previous_key_verifies_after_rotation(tmp_path, monkeypatch):
+    """Keys in their transition period still verify their tokens."""
+    manager = _manager(tmp_path)
+    monkeypatch.setattr(security, "secret_manager", manager)
+    token = security.create_access_token(7)
+
+    manager.force_rotate_jwt_key()
+
+    assert len(manager.get_jwt_keyring()) == 2
+    assert security.verify_token(token) == "7"
+
+
+def test_unknown_kid_is_rejected_without_trying_other_keys(tmp_path, monkeypatch):
+    """A kid that is not in the keyring fails immediately."""
+    manager = _manager(tmp_path)
+    monkeypatch.setattr(security, "secret_manager", manager)
+    token = jwt.encode(
+        {"sub": "1"},
+        manager.get_current_jwt_key(),
+        algorithm=settings.ALGORITHM,
+        headers={"kid": "unknown"},
+    )
+
+    assert security.verify_token(token) is None
+
+
+def test_legacy_token_without_kid_still_verifies(tmp_path, monkeypatch):
+    """Tokens issued before key IDs fall back to trying every key."""
+    manager = _manager(tmp_path)
+    monkeypatch.setattr(security, "secret_manager", manager)
+    token = jwt.encode(
+        {"sub": "3"}, manager.get_current_jwt_key(), algorithm=settings.ALGORITHM
+    )
+
+    assert security.verify_token(token) == "3"
+
+
+def test_keyring_rejects_keys_past_their_transition_period():
+    """Lookups honour the precomputed validity deadline."""
+    past = time.time() - 60
+    keyring = JWTKeyring([("current", None), ("retired", past)])
+
+    assert keyring.get(jwt_key_id("current")) == "current"
+    assert keyring.get(jwt_key_id("retired")) is None
+    assert keyring.keys() == ["current"]
+
+
+def test_hot_path_does_not_rotate_before_deadline(tmp_path, monkeypatch):
+    """Before the deadline, getting the key never re-evaluates expiry."""
+    manager = _manager(tmp_path)
+    calls = []
+    monkeypatch.setattr(
+        manager, "_rotate_jwt_keys_if_needed", lambda: calls.append(True)
+    )
+
+    for _ in range(10):
+        manager.get_current_jwt_key()
+
+    assert calls == []
+    assert manager.get_jwt_keyring().rotate_at > time.time()
+
+
+def test_subscribers_are_notified_on_rotation(tmp_path):
+    """Keyring changes are pushed to subscribers."""
+    manager = _manager(tmp_path)
+    received = []
+    manager.subscribe(received.append)
+
+    manager.force_rotate_jwt_key()
+
+    assert len(received) == 1
+    assert received[0] is manager.get_jwt_keyring()
+    assert received[0].current_key == manager.get_current_jwt_key()
+
+
+def test_scheduler_rotates_expired_key_in_background(tmp_path):
+    """An expired current key is replaced by the scheduler thread."""
+    manager = SecretRotationManager(
+        secret_file_path=str(tmp_path / "secret_keys.json"),
+        key_lifetime_days=0,
+        enabled=True,
+    )
+    rotated = threading.Event()
+    manager.subscribe(lambda keyring: rotated.set())
+    old_key = manager.get_jwt_keyring().current_key
+
+    manager.start_scheduler(check_interval_seconds=0.05)
+    try:
+        assert rotated.wait(timeout=2)
+    finally:
+        manager.stop_scheduler()
+
+    assert manager.get_jwt_keyring().current_key != old_key
+    assert not manager.scheduler_running
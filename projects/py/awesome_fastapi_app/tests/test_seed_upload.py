@@ -0,0 +1,138 @@
+"""
+Tests for streaming, batched seed file ingestion.
+"""
+
+import io
+import json
+import time
+
+import pytest
+
+from app import crud
+from app.api import deps
+from app.main import app as main_app
+from app.models.user import User
+from app.services.seed_jobs import seed_jobs
+from app.utils.json_stream import JSONStreamReader, iter_object_arrays
+from app.utils.seed_data import SeedIngestion
+
+SEED = {
+    "version": 1.25,
+    "items": [{"title": f"item {i}", "price": 10**i} for i in range(5)],
+    "meta": {"source": "tests", "tags": ["a", "b"]},
+    "notes": [{"title": "café ☕", "content": "ünïcode"}, {"title": "plain"}],
+    "empty": [],
+}
+
+
+@pytest.fixture
+def superuser(db):
+    """Create a superuser and serve requests as that user."""
+    user = User(
+        email="seeder@example.com",
+        hashed_password="x",
+        is_active=True,
+        is_superuser=True,
+    )
+    db.add(user)
+    db.commit()
+    main_app.dependency_overrides[deps.get_current_active_superuser] = lambda: user
+    return user
+
+
+def _stream(document: bytes, chunk_size: int) -> list[tuple[str, object]]:
+    """Parse a document with the given read size."""
+    return list(iter_object_arrays(JSONStreamReader(io.BytesIO(document), chunk_size)))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 65536])
+def test_iter_object_arrays_matches_json_loads(chunk_size):
+    """Test that members split across reads, including numbers, are intact."""
+    document = json.dumps(SEED, ensure_ascii=False, indent=2).encode()
+
+    members = _stream(document, chunk_size)
+
+    assert members == [("items", item) for item in SEED["items"]] + [
+        ("notes", note) for note in SEED["notes"]
+    ]
+
+
+@pytest.mark.parametrize(
+    "document", [b'{"items": [{"title": "a"}', b'{"items": [1 2]}', b"[]", b"{} x"]
+)
+def test_iter_object_arrays_rejects_invalid_documents(document):
+    """Test that truncated and malformed documents raise a decode error."""
+    with pytest.raises(json.JSONDecodeError):
+        _stream(document, 4)
+
+
+def test_ingestion_inserts_in_chunks(db, superuser):
+    """Test that entries are inserted one chunk per transaction."""
+    document = {
+        "items": [{"title": f"item {i}"} for i in range(5)] + [{"name": "no title"}],
+        "notes": [{"title": "note", "content": None}, "not an object"],
+    }
+    ingestion = SeedIngestion(db, superuser.id, chunk_size=2)
+
+    summary = ingestion.run(io.BytesIO(json.dumps(document).encode()))
+
+    assert summary["items_created"] == 5
+    assert summary["notes_created"] == 1
+    assert summary["chunks"] == 4
+    assert (summary["items_skipped"], summary["notes_skipped"]) == (1, 1)
+    assert [item["title"] for item in summary["items"]] == [
+        f"item {i}" for i in range(5)
+    ]
+    items = crud.item.get_multi_by_owner(db, owner_id=superuser.id)
+    assert items[0].description == "Description for item 0"
+
+
+def test_ingestion_requires_items_or_notes(db, superuser):
+    """Test that a document without either key is rejected."""
+    with pytest.raises(KeyError):
+        SeedIngestion(db, superuser.id).run(io.BytesIO(b'{"other": []}'))
+
+
+def test_upload_returns_summary(client, superuser):
+    """Test a small upload ingested within the request."""
+    response = client.post(
+        "/api/v1/seed/upload?chunk_size=2",
+        files={"file": ("seed.json", json.dumps(SEED).encode(), "application/json")},
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["items_created"], body["notes_created"]) == (5, 2)
+    assert body["notes"][0]["title"] == "café ☕"
+    assert body["chunks"] == 4
+
+
+def test_upload_rejects_invalid_json(client, superuser):
+    """Test that a malformed file is a client error."""
+    response = client.post(
+        "/api/v1/seed/upload",
+        files={"file": ("seed.json", b'{"items": [', "application/json")},
+    )
+
+    assert response.status_code == 400
+
+
+def test_background_upload_reports_progress(client, db, superuser, monkeypatch):
+    """Test that a background job ingests the file and reports its result."""
+    monkeypatch.setattr(seed_jobs, "session_factory", lambda: db)
+
+    response = client.post(
+        "/api/v1/seed/upload?background=true",
+        files={"file": ("seed.json", json.dumps(SEED).encode(), "application/json")},
+    )
+
+    assert response.status_code == 202
+    status_url = response.json()["status_url"]
+    deadline = time.monotonic() + 10
+    while (job := client.get(status_url).json())["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert job["status"] == "succeeded"
+    assert job["progress"]["items_created"] == 5
+    assert "items" not in job["progress"]
+    assert client.get("/api/v1/seed/jobs/unknown").status_code == 404
@@ -0,0 +1,82 @@
+"""
+Tests for the deterministic synthetic data generator.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app import generate_data
+from app.core.security import verify_password
+from app.models.item import Item
+from app.models.note import Note
+from app.models.user import User
+from app.utils.synthetic_data import (
+    SYNTHETIC_PASSWORD,
+    SyntheticDataGenerator,
+    synthetic_email,
+)
+
+
+def _rows(generator: SyntheticDataGenerator) -> tuple[list, list]:
+    """Collect all item and note rows for owners 1 to 3."""
+    items = [row for batch in generator.item_rows([1, 2, 3]) for row in batch]
+    notes = [row for batch in generator.note_rows([1, 2, 3]) for row in batch]
+    return items, notes
+
+
+def test_same_seed_gives_same_rows():
+    """Test that rows depend only on the seed, not on the batch size."""
+    first = _rows(SyntheticDataGenerator(seed=7, items=50, notes=50, batch_size=8))
+    second = _rows(SyntheticDataGenerator(seed=7, items=50, notes=50, batch_size=50))
+    other = _rows(SyntheticDataGenerator(seed=8, items=50, notes=50))
+
+    assert first == second
+    assert first != other
+    assert len(first[0]) == len(first[1]) == 50
+
+
+def test_item_titles_match_descriptions():
+    """Test that an item's description is about the item's title."""
+    items, _ = _rows(SyntheticDataGenerator(seed=1, items=20, notes=0))
+
+    for title, description, _, owner in items:
+        assert description.startswith(f"This {title.rsplit(' ', 1)[0]} is")
+        assert owner in (1, 2, 3)
+
+
+def test_run_writes_rows_in_batches(db):
+    """Test a run against SQLite, which uses INSERT."""
+    generator = SyntheticDataGenerator(
+        seed=3, users=3, items=25, notes=10, batch_size=10
+    )
+
+    report = generator.run(db)
+
+    assert report["method"] == "insert"
+    assert report["tables"]["items"]["rows"] == 25
+    assert report["total_rows"] == 38
+    user = db.scalars(select(User).where(User.email == synthetic_email(3, 0))).one()
+    assert verify_password(SYNTHETIC_PASSWORD, user.hashed_password)
+    assert db.scalar(select(func.count()).select_from(Item)) >= 25
+    assert db.scalar(select(func.count()).select_from(Note)) >= 10
+
+
+def test_copy_requires_postgres(db):
+    """Test that COPY is refused on other databases."""
+    with pytest.raises(ValueError):
+        SyntheticDataGenerator(method="copy").resolve_method(db)
+
+
+def test_cli_writes_report(db, tmp_path, monkeypatch):
+    """Test the command line entry point."""
+    monkeypatch.setattr(generate_data, "SessionLocal", lambda: db)
+    report_path = tmp_path / "report.json"
+
+    generate_data.main(
+        ["--seed", "5", "--users", "2", "--items", "4", "--notes", "0"]
+        + ["--report", str(report_path)]
+    )
+
+    assert json.loads(report_path.read_text())["tables"]["items"]["rows"] == 4
@@ -0,0 +1,143 @@
+"""
+Tests for tail sampling and span batching.
+"""
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import Status, StatusCode
+
+from app.core.config import settings
+from app.core.telemetry import TailSamplingProcessor, create_span_processor
+
+
+@pytest.fixture
+def traced():
+    """Provide a tracer whose spans go through tail sampling."""
+    exporter = InMemorySpanExporter()
+    sampling = TailSamplingProcessor(
+        SimpleSpanProcessor(exporter), latency_threshold=60, keep_rate=0.0
+    )
+    provider = TracerProvider()
+    provider.add_span_processor(sampling)
+    yield provider.get_tracer(__name__), sampling, exporter
+    provider.shutdown()
+
+
+def test_fast_traces_are_dropped(traced):
+    """Test that a fast, successful trace is not exported."""
+    tracer, sampling, exporter = traced
+
+    with tracer.start_as_current_span("request"):
+        with tracer.start_as_current_span("query"):
+            pass
+
+    assert exporter.get_finished_spans() == ()
+    assert (sampling.kept, sampling.dropped) == (0, 1)
+    assert not sampling._traces
+
+
+def test_failed_traces_are_exported_whole(traced):
+    """Test that an error in a child span keeps the entire trace."""
+    tracer, sampling, exporter = traced
+
+    with tracer.start_as_current_span("request"):
+        with tracer.start_as_current_span("query") as query:
+            query.set_status(Status(StatusCode.ERROR))
+
+    assert [span.name for span in exporter.get_finished_spans()] == [
+        "query",
+        "request",
+    ]
+    assert sampling.kept == 1
+
+
+def test_slow_traces_are_exported(traced):
+    """Test that a root span over the latency threshold keeps the trace."""
+    tracer, sampling, exporter = traced
+    sampling.latency_threshold = 0
+
+    with tracer.start_as_current_span("request"):
+        pass
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["request"]
+
+
+def test_unfinished_traces_are_bounded(traced):
+    """Test that the oldest unfinished trace is evicted from a full buffer."""
+    tracer, sampling, exporter = traced
+    sampling.max_traces = 2
+    sampling.latency_threshold = 0
+
+    roots = [tracer.start_span(f"request {n}") for n in range(3)]
+    for root in roots:
+        child = tracer.start_span("query", context=trace.set_span_in_context(root))
+        child.end()
+
+    assert len(sampling._traces) == 2
+    assert sampling.dropped == 1
+    for root in roots:
+        root.end()
+
+    # The evicted trace's root is dropped too instead of being exported alone
+    assert [span.name for span in exporter.get_finished_spans()] == [
+        "query",
+        "request 1",
+        "query",
+        "request 2",
+    ]
+    assert (sampling.kept, sampling.dropped) == (2, 1)
+    assert not sampling._evicted
+
+
+def test_keep_rate_is_decided_by_trace_id():
+    """Test that processors with the same keep rate keep the same traces."""
+    exporters = [InMemorySpanExporter(), InMemorySpanExporter()]
+    provider = TracerProvider()
+    for exporter in exporters:
+        provider.add_span_processor(
+            TailSamplingProcessor(
+                SimpleSpanProcessor(exporter), latency_threshold=60, keep_rate=0.5
+            )
+        )
+    tracer = provider.get_tracer(__name__)
+
+    for n in range(50):
+        with tracer.start_as_current_span(f"request {n}"):
+            pass
+    provider.shutdown()
+
+    first, second = ([span.name for span in e.get_finished_spans()] for e in exporters)
+    assert first == second
+    assert 0 < len(first) < 50
+
+
+def test_span_processor_uses_batch_settings(monkeypatch):
+    """Test the configured batching, with and without tail sampling."""
+    monkeypatch.setattr(settings, "OTEL_BSP_MAX_QUEUE_SIZE", 64)
+    monkeypatch.setattr(settings, "OTEL_BSP_MAX_EXPORT_BATCH_SIZE", 16)
+    monkeypatch.setattr(settings, "OTEL_BSP_SCHEDULE_DELAY_MS", 250)
+    monkeypatch.setattr(settings, "OTEL_TAIL_SAMPLING_ENABLED", False)
+
+    processor = create_span_processor(InMemorySpanExporter())
+    try:
+        assert isinstance(processor, BatchSpanProcessor)
+        assert processor.max_queue_size == 64
+        assert processor.max_export_batch_size == 16
+        assert processor.schedule_delay_millis == 250
+    finally:
+        processor.shutdown()
+
+    monkeypatch.setattr(settings, "OTEL_TAIL_SAMPLING_ENABLED", True)
+    monkeypatch.setattr(settings, "OTEL_TAIL_SAMPLING_LATENCY_MS", 250)
+    processor = create_span_processor(InMemorySpanExporter())
+    try:
+        assert isinstance(processor, TailSamplingProcessor)
+        assert processor.latency_threshold == 0.25
+        assert processor.max_traces == 64
+    finally:
+        processor.shutdown()
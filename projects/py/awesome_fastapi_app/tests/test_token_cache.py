@@ -0,0 +1,107 @@
+"""
+Tests for the verified-token cache.
+"""
+
+import time
+
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.security import create_access_token
+from app.core.token_cache import TokenCache
+from app.crud.crud_user import user as crud_user
+from app.schemas.user import UserCreate
+
+
+class FakeUser:
+    """Minimal stand-in for a User row."""
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.email = f"user{user_id}@example.com"
+        self.full_name = None
+        self.is_active = True
+        self.is_superuser = False
+        self.created_at = None
+        self.updated_at = None
+
+
+TOKEN = "header.payload.signature"
+
+
+def test_put_and_get_counts_hits_and_misses():
+    """A cached token is served as a hit; unknown tokens are misses."""
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+
+    assert cache.get(TOKEN) is None
+    cache.put(TOKEN, FakeUser(1))
+    snapshot = cache.get(TOKEN)
+
+    assert snapshot is not None
+    assert snapshot.user_id == 1
+    assert snapshot.values["email"] == "user1@example.com"
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_tampered_payload_with_same_signature_misses():
+    """Only the exact token that was verified can hit."""
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.put(TOKEN, FakeUser(1))
+
+    assert cache.get("header.forged.signature") is None
+
+
+def test_entry_never_outlives_token_expiry():
+    """Entries expire with the token even if the TTL is longer."""
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.put(TOKEN, FakeUser(1), token_expires_at=time.time() - 1)
+
+    assert cache.get(TOKEN) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction_is_bounded():
+    """The cache never grows past max_size."""
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    for i in range(3):
+        cache.put(f"h.p.sig{i}", FakeUser(i))
+
+    assert cache.get("h.p.sig0") is None
+    assert cache.get("h.p.sig2") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_user_drops_all_of_their_tokens():
+    """Invalidation removes every token of a user and no one else's."""
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.put("h.p.a", FakeUser(1))
+    cache.put("h.p.b", FakeUser(1))
+    cache.put("h.p.c", FakeUser(2))
+
+    cache.invalidate_user(1)
+
+    assert cache.get("h.p.a") is None
+    assert cache.get("h.p.b") is None
+    assert cache.get("h.p.c") is not None
+
+
+def test_get_current_user_uses_cache_and_update_invalidates(db: Session, monkeypatch):
+    """The dependency caches the user and CRUDUser.update drops it."""
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    monkeypatch.setattr(deps, "token_cache", cache)
+    monkeypatch.setattr("app.crud.crud_user.token_cache", cache)
+
+    user = crud_user.create(
+        db, obj_in=UserCreate(email="token_cache@example.com", password="secret")
+    )
+    token = create_access_token(user.id)
+
+    assert deps.get_current_user(db=db, token=token).id == user.id
+    assert deps.get_current_user(db=db, token=token).id == user.id
+    assert cache.stats()["hits"] == 1
+
+    crud_user.update(db, db_obj=user, obj_in={"is_active": False})
+    assert cache.get(token) is None
+    assert deps.get_current_user(db=db, token=token).is_active is False
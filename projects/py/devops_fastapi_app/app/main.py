@@ -12,11 +12,10 @@ from libs.py.devops.models.devops import (
     ReliabilityEngineer,
     WebEngineer,
 )
+from libs.py.logging_config.models.logging_config import configure_logging
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO, format="%(levelname)s: (%(module)s) %(message)s"
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
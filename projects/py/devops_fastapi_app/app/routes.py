@@ -8,8 +8,6 @@ from libs.py.devops.models.devops import (
 
 from .models import DevOpsResponse, HealthResponse, StatusResponse
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -4,12 +4,13 @@ import traceback
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from libs.py.logging_config.models.logging_config import configure_logging
 
 from .models import ErrorResponse
 from .routes import router
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
@@ -10,13 +10,10 @@ import os
 import sys
 
 import uvicorn
+from libs.py.logging_config.models.logging_config import configure_logging
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Add the parent directory to sys.path to allow importing the app module
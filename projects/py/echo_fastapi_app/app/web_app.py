@@ -7,12 +7,13 @@ import logging
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from libs.py.logging_config.models.logging_config import configure_logging
 
 from .models import ErrorResponse
 from .routes import router
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app with metadata
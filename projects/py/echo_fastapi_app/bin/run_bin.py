@@ -8,9 +8,10 @@ import os
 import sys
 
 import uvicorn
+from libs.py.logging_config.models.logging_config import configure_logging
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Add the parent directory to the path to allow importing from app
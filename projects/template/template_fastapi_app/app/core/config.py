@@ -251,6 +251,17 @@ class Settings(BaseSettings):
     # Environment name
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
 
+    # Logging; LOG_FORMAT is "text" or "json". Records are written by a
+    # background thread unless LOG_QUEUE_ENABLED is false
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    LOG_QUEUE_ENABLED: bool = os.getenv("LOG_QUEUE_ENABLED", "True").lower() == "true"
+    # Per-logger levels, e.g. "sqlalchemy.engine=WARNING,app.access=INFO"
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    # Share of each logger's records below WARNING that is kept,
+    # e.g. "app.utils.seed_data=0.01"
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+
     # OpenTelemetry settings
     ENABLE_TELEMETRY: bool = os.getenv("ENABLE_TELEMETRY", "True").lower() == "true"
     OTLP_EXPORTER_ENDPOINT: str | None = os.getenv("OTLP_EXPORTER_ENDPOINT")
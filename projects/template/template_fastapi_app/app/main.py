@@ -8,6 +8,7 @@ from typing import Any
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from libs.py.logging_config.models.logging_config import configure_logging
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
@@ -19,7 +20,7 @@ from app.core.telemetry import setup_telemetry
 from app.db.session import engine
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(settings)
 logger = logging.getLogger(__name__)
 
 
@@ -2,8 +2,11 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
+from libs.py.logging_config.models.logging_config import configure_logging
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+from app.core.config import settings
+
+configure_logging(settings)
 
 app = FastAPI()
 
@@ -5,10 +5,11 @@ Script to run the FastAPI application.
 import logging
 
 import uvicorn
+from libs.py.logging_config.models.logging_config import configure_logging
 
 from app.core.config import settings
 
-logging.basicConfig(level=logging.INFO)
+configure_logging(settings)
 logger = logging.getLogger(__name__)
 
 
@@ -97,7 +97,7 @@ fi
 # Step 6: Check Docker image build
 print_status "Checking Docker image build..."
 cd "$APP_DIR"
-if docker build -t template-fastapi-app:test -f Dockerfile . --no-cache; then
+if docker build -t template-fastapi-app:test -f Dockerfile --build-context libs="$APP_DIR/../../../libs" . --no-cache; then
   print_success "Docker image build completed successfully."
   # Clean up the test image
   docker rmi template-fastapi-app:test || true